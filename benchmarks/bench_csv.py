@@ -0,0 +1,67 @@
+"""
+Throughput benchmark of csv loading: previous loader (`pd.read_csv` with the
+default C parser and type inference) against the pyarrow engine, explicit
+dtypes / usecols and parallel block parsing.
+
+    python benchmarks/bench_csv.py --rows 2000000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import fsspec
+import numpy as np
+import pandas as pd
+
+from easyenvi import file
+
+DTYPE = {'id': 'int64', 'value': 'float64', 'category': 'str', 'amount': 'int64', 'label': 'str'}
+
+def make_csv(path, rows):
+    rng = np.random.default_rng(0)
+    pd.DataFrame({
+        'id': np.arange(rows),
+        'value': rng.random(rows),
+        'category': rng.choice(['alpha', 'beta', 'gamma'], rows),
+        'amount': rng.integers(0, 100000, rows),
+        'label': rng.choice(['lorem ipsum', 'dolor sit amet', 'consectetur'], rows),
+    }).to_csv(path, index=False)
+
+def previous_loader(path):
+    with fsspec.open(path, 'rb') as f:
+        return pd.read_csv(f)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=2000000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'bench.csv')
+        make_csv(path, args.rows)
+        size = os.path.getsize(path) / 1024 ** 2
+        print(f"{args.rows} rows, {size:.0f} MB, {os.cpu_count()} CPU(s)")
+
+        cases = [
+            ("previous loader", lambda: previous_loader(path)),
+            ("engine='pyarrow'", lambda: file.load(path, engine='pyarrow')),
+            ("dtype", lambda: file.load(path, dtype=DTYPE)),
+            ("dtype + usecols (2 columns)", lambda: file.load(path, dtype=DTYPE, usecols=['id', 'value'])),
+            ("engine='pyarrow' + dtype", lambda: file.load(path, engine='pyarrow', dtype=DTYPE)),
+            ("parallel blocks + dtype", lambda: file.load(path, parallel=True, block_size=16 * 1024 ** 2,
+                                                          dtype=DTYPE)),
+        ]
+
+        baseline = None
+        for label, func in cases:
+            start = time.perf_counter()
+            df = func()
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            assert len(df) == args.rows
+            print(f"{label:<30}{elapsed:8.2f}s{size / elapsed:8.0f} MB/s  x{baseline / elapsed:.1f}")
+
+if __name__ == '__main__':
+    main()
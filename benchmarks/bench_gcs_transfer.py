@@ -0,0 +1,51 @@
+"""
+Benchmark of single large object transfers against the offline GCS backend,
+whose bandwidth applies per connection: one stream against parallel slices
+(sliced download, composite upload).
+
+    python benchmarks/bench_gcs_transfer.py --size-mb 256 --bandwidth-mb 100
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from easyenvi.envs.gcloud import GCS
+from easyenvi.testing import FakeGCS
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--size-mb', type=int, default=256)
+    parser.add_argument('--bandwidth-mb', type=float, default=100)
+    parser.add_argument('--latency', type=float, default=0.02)
+    args = parser.parse_args()
+
+    size = args.size_mb * 1024 * 1024
+
+    print(f"{'slices':<10}{'upload':>10}{'download':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        source = os.path.join(directory, "source.bin")
+        with open(source, 'wb') as f:
+            f.write(os.urandom(size))
+
+        with FakeGCS(os.path.join(directory, "gcs"), latency=args.latency,
+                     bandwidth=args.bandwidth_mb * 1024 * 1024) as backend:
+            for slices in (None, 4, 8, 16, 32):
+                gcs = backend.attach(GCS(project_id="bench", GCS_path="gs://bucket/",
+                                         parallel_threshold=None if slices is None else 1,
+                                         parallel_slices=slices or 8))
+
+                start = time.perf_counter()
+                gcs.upload(source, "big.bin")
+                upload_time = time.perf_counter() - start
+
+                start = time.perf_counter()
+                gcs.download("big.bin", os.path.join(directory, "copy.bin"))
+                download_time = time.perf_counter() - start
+
+                label = "stream" if slices is None else str(slices)
+                print(f"{label:<10}{upload_time:9.2f}s{download_time:9.2f}s")
+
+if __name__ == '__main__':
+    main()
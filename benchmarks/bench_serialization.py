@@ -0,0 +1,63 @@
+"""
+Benchmark of Python object serialization formats on a NumPy / pandas-heavy
+artifact: save / load time and peak traced memory.
+
+    python benchmarks/bench_serialization.py --size-mb 256
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from easyenvi import file
+
+def make_artifact(size_mb):
+    rows = size_mb * 1024 * 1024 // 16
+    rng = np.random.default_rng(0)
+    return {
+        'weights': rng.random(rows // 2),
+        'frame': pd.DataFrame({'id': np.arange(rows // 2), 'value': rng.random(rows // 2)}),
+        'config': {'name': 'model', 'layers': [64, 32]},
+    }
+
+def measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--size-mb', type=int, default=256)
+    args = parser.parse_args()
+
+    artifact = make_artifact(args.size_mb)
+    cases = [
+        ("pickle", 'pickle', {}, artifact),
+        ("pickle out_of_band", 'pickle', {'out_of_band': True}, artifact),
+        ("joblib", 'joblib', {}, artifact),
+        ("joblib compress=3", 'joblib', {'compress': 3}, artifact),
+        ("npz", 'npz', {}, {'weights': artifact['weights'], 'value': artifact['frame']['value'].to_numpy()}),
+        ("msgpack", 'msgpack', {}, {'weights': artifact['weights'], 'value': artifact['frame']['value'].to_numpy()}),
+    ]
+
+    print(f"{'format':<22}{'save':>9}{'peak':>10}{'load':>9}{'peak':>10}{'size':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for label, extension, kwargs, obj in cases:
+            path = os.path.join(directory, f"artifact.{extension}")
+            save_time, save_peak, _ = measure(lambda: file.save(obj, path, **kwargs))
+            load_time, load_peak, _ = measure(lambda: file.load(path))
+            size = os.path.getsize(path) / 1024 ** 2
+            print(f"{label:<22}{save_time:8.2f}s{save_peak:8.0f}MB{load_time:8.2f}s{load_peak:8.0f}MB{size:8.0f}MB")
+            os.remove(path)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""
+Benchmark of xlsx loading: previous loader (pandas + openpyxl on the whole
+workbook) against the calamine engine and the streaming reader.
+
+    python benchmarks/bench_xlsx.py --rows 200000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from easyenvi import file
+
+def make_workbook(path, rows):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'id': np.arange(rows),
+        'value': rng.random(rows),
+        'category': rng.choice(['a', 'b', 'c'], rows),
+        'amount': rng.integers(0, 1000, rows),
+    })
+    file.save((df.iloc[i:i + 50000] for i in range(0, rows, 50000)), path)
+
+def timed(label, func, baseline=None):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    speedup = f"  x{baseline / elapsed:.1f}" if baseline else ""
+    print(f"{label:<40} {elapsed:8.2f}s{speedup}")
+    return elapsed, result
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=200000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'bench.xlsx')
+        timed(f"write {args.rows} rows (streaming)", lambda: make_workbook(path, args.rows))
+
+        baseline, _ = timed("read_excel openpyxl (previous loader)", lambda: pd.read_excel(path))
+        timed("file.load engine=calamine", lambda: file.load(path, engine='calamine'), baseline)
+        timed("file.load stream=True (openpyxl read-only)",
+              lambda: sum(len(c) for c in file.load(path, stream=True)), baseline)
+        timed("file.load cell_range='A1:B1000'", lambda: file.load(path, cell_range='A1:B1000'), baseline)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,7 @@
+from .file_lock import FileLock
+from .shared_cache import SharedCache
+
+__all__ = [
+    "FileLock",
+    "SharedCache"
+]
\ No newline at end of file
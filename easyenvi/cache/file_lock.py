@@ -0,0 +1,129 @@
+import os
+import time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+class FileLock:
+    """
+    Advisory lock on a file, shared between processes (and threads) of a host.
+    On POSIX, shared (reader) and exclusive (writer) locks are supported. On
+    Windows every lock is exclusive.
+
+    Parameters
+    ----------
+    path : str
+        path of the lock file. Created if it does not exist.
+    """
+
+    def __init__(self, path: str):
+
+        self.path = path
+        self._fd = None
+        self._held = False
+
+    def acquire(
+            self,
+            shared: bool = False,
+            blocking: bool = True,
+            poll_interval: float = 0.05
+            ):
+        """
+        Acquire (or convert) the lock. Returns True if the lock is held.
+        Converting a held lock is not atomic: it is released then taken again, so
+        what was checked under the previous lock must be checked again.
+
+        Parameters
+        ----------
+        shared : bool
+            whether to take a shared lock instead of an exclusive one. Default is False.
+        blocking : bool
+            whether to wait for the lock to become available. Default is True.
+        poll_interval : float
+            time (seconds) between two attempts when the platform cannot block. Default is 0.05.
+        """
+
+        while True:
+            if self._fd is None:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o666)
+
+            if not self._lock(shared, blocking, poll_interval):
+                return False
+            if self._is_current():
+                return True
+
+            # The lock file was removed (see `remove`) while waiting: lock the new one
+            self.release()
+
+    def remove(self):
+        """
+        Remove the lock file, to be called while holding the lock exclusively.
+        Processes waiting for the lock then lock a new file at the same path.
+        """
+
+        try:
+            os.remove(self.path)
+        except OSError:
+            # Already removed, or still open elsewhere on Windows
+            pass
+
+    def release(self):
+        """
+        Release the lock.
+        """
+
+        if self._fd is None:
+            return
+
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            elif self._held:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+            self._held = False
+
+    def _lock(self, shared, blocking, poll_interval):
+
+        if fcntl is not None:
+            flags = fcntl.LOCK_SH if shared else fcntl.LOCK_EX
+            if not blocking:
+                flags |= fcntl.LOCK_NB
+            try:
+                fcntl.flock(self._fd, flags)
+            except BlockingIOError:
+                return False
+            return True
+
+        while not self._held:
+            try:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_NBLCK, 1)
+                self._held = True
+            except OSError:
+                if not blocking:
+                    return False
+                time.sleep(poll_interval)
+
+        return True
+
+    def _is_current(self):
+        # Whether the locked file is still the one at `path`
+        try:
+            return os.path.samestat(os.fstat(self._fd), os.stat(self.path))
+        except FileNotFoundError:
+            return False
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
@@ -0,0 +1,180 @@
+import hashlib
+import os
+import time
+import uuid
+
+from contextlib import contextmanager
+
+from easyenvi.cache.file_lock import FileLock
+
+class SharedCache:
+    """
+    Local cache of remote files, shared by every process of a host.
+
+    Each entry is protected by a file lock: the first process requesting a
+    missing entry fetches it under an exclusive lock while the others wait, then
+    every process reads the same local copy under a shared lock. Eviction only
+    removes entries it can lock exclusively, so files being read are never
+    deleted, and removes their lock files with them.
+
+    Parameters
+    ----------
+    directory : str
+        Directory where cached files are stored. Can be shared by several processes.
+    max_size : int (optional)
+        Maximum size (bytes) of the cache. Least recently used entries are evicted
+        beyond this size. Default is None (no limit).
+    ttl : float (optional)
+        Time (seconds) after which an entry is fetched again. Default is None (no expiry).
+    """
+
+    def __init__(
+            self,
+            directory: str,
+            max_size: int | None = None,
+            ttl: float | None = None
+            ):
+
+        self.directory = directory
+        self.max_size = max_size
+        self.ttl = ttl
+
+        self.objects_dir = os.path.join(directory, "objects")
+        self.locks_dir = os.path.join(directory, "locks")
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.locks_dir, exist_ok=True)
+
+    @contextmanager
+    def open(
+            self,
+            key: str,
+            fetch,
+            suffix: str = ""
+            ):
+        """
+        Context manager yielding the local path of a cached entry, fetching it
+        first if needed. The entry cannot be evicted until the context is exited.
+
+        Parameters
+        ----------
+        key : str
+            key identifying the entry (should change with the remote version).
+        fetch : callable
+            function fetch(local_path) writing the entry to `local_path`.
+        suffix : str
+            suffix of the cached file (e.g. ".csv"), so that it keeps its extension.
+        """
+
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        object_path = os.path.join(self.objects_dir, digest + suffix)
+        lock = FileLock(os.path.join(self.locks_dir, digest + ".lock"))
+
+        lock.acquire(shared=True)
+        try:
+            # Lock conversions are not atomic: another process may fetch or evict
+            # the entry in between, hence the checks after each one
+            while not self._is_fresh(object_path):
+                lock.acquire(shared=False)
+                if not self._is_fresh(object_path):
+                    self._fetch(fetch, object_path)
+                lock.acquire(shared=True)
+                if os.path.exists(object_path):
+                    break
+
+            mtime = os.stat(object_path).st_mtime
+            os.utime(object_path, (time.time(), mtime))
+
+            yield object_path
+        finally:
+            lock.release()
+
+        if self.max_size is not None:
+            self.evict()
+
+    def evict(self, max_size: int | None = None):
+        """
+        Remove expired entries, then least recently used entries until the cache
+        fits in `max_size`. Entries currently in use are skipped.
+        Returns the number of bytes freed.
+
+        Parameters
+        ----------
+        max_size : int (optional)
+            target size (bytes). Default is the `max_size` of the cache.
+        """
+
+        max_size = self.max_size if max_size is None else max_size
+
+        entries = []
+        for name in os.listdir(self.objects_dir):
+            if name.endswith(".tmp"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.objects_dir, name))
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_atime, stat.st_mtime, stat.st_size, name))
+
+        entries.sort()
+        total_size = sum(entry[2] for entry in entries)
+        now = time.time()
+        freed = 0
+
+        for atime, mtime, size, name in entries:
+            expired = self.ttl is not None and now - mtime >= self.ttl
+            if not expired and (max_size is None or total_size <= max_size):
+                continue
+
+            lock = FileLock(os.path.join(self.locks_dir, name.split('.')[0] + ".lock"))
+            if not lock.acquire(blocking=False):
+                continue
+            try:
+                os.remove(os.path.join(self.objects_dir, name))
+                total_size -= size
+                freed += size
+            except FileNotFoundError:
+                pass
+            finally:
+                lock.remove()
+                lock.release()
+
+        self._remove_orphan_locks()
+        return freed
+
+    def clear(self):
+        """
+        Remove every entry not currently in use.
+        """
+
+        return self.evict(max_size=0)
+
+    def _remove_orphan_locks(self):
+        # Lock files of entries never fetched (failed fetch) or already removed
+
+        digests = {name.split('.')[0] for name in os.listdir(self.objects_dir)}
+        for name in os.listdir(self.locks_dir):
+            if name.split('.')[0] in digests:
+                continue
+            lock = FileLock(os.path.join(self.locks_dir, name))
+            if lock.acquire(blocking=False):
+                lock.remove()
+                lock.release()
+
+    def _is_fresh(self, object_path):
+
+        try:
+            mtime = os.stat(object_path).st_mtime
+        except FileNotFoundError:
+            return False
+
+        return self.ttl is None or time.time() - mtime < self.ttl
+
+    def _fetch(self, fetch, object_path):
+
+        tmp_path = f"{object_path}.{uuid.uuid4().hex}.tmp"
+        try:
+            fetch(tmp_path)
+            os.replace(tmp_path, object_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
@@ -1,4 +1,5 @@
 from easyenvi.envs.disk import disk
+from easyenvi.utils import WriteBehindQueue
 from .error_handler import missing_module_error_handler
 
 class EasyEnvironment:
@@ -29,6 +30,36 @@ class EasyEnvironment:
         Extra configuration for file loaders.
     extra_saver_config : dict (optional)
         Extra configuration for file savers.
+    cache_dir : str (optional)
+        Directory of the host-wide cache of files downloaded from Google Cloud Storage and
+        SharePoint. Processes sharing this directory download each file version only once.
+    cache_max_size : int (optional)
+        Maximum size (bytes) of the cache.
+    GCS_listing_index_path : str (optional)
+        Path of a local SQLite index of Google Cloud Storage listings, so that repeated
+        listings of a same prefix are served locally.
+    GCS_listing_ttl : float (optional)
+        Time (seconds) during which an indexed listing is served. Default is 300.
+    GCS_parallel_threshold : int (optional)
+        Size (bytes) from which Google Cloud Storage objects are downloaded and uploaded
+        as parallel slices, verified with CRC32C checksums. Default is 256 MiB (None disables it).
+    GCS_parallel_slices : int (optional)
+        Number of slices of a parallel transfer, at most 32. Default is 8.
+    BQ_cache_dir : str (optional)
+        Directory where Big Query results are cached (see `BQ.query_to_dataframe`).
+    BQ_cache_ttl : float (optional)
+        Time (seconds) after which a cached Big Query result is computed again. Default is 86400.
+    BQ_cache_max_size : int (optional)
+        Maximum size (bytes) of the Big Query result cache.
+    BQ_max_bytes_scanned : int (optional)
+        Big Query queries estimated (dry run) to scan more bytes are refused before execution.
+    write_behind : bool (optional)
+        Whether `local.save`, `gcloud.GCS.save` and `sharepoint.upload` return immediately,
+        the files being written by background threads (see `flush`). Default is False.
+    write_behind_workers : int (optional)
+        Number of background threads writing files. Default is 4.
+    write_behind_max_pending : int (optional)
+        Maximum number of writes waiting: saving blocks beyond it. Default is 64.
 
     Notes
     -----
@@ -53,13 +84,32 @@ class EasyEnvironment:
             sharepoint_username: str | None = None, 
             sharepoint_user_password: str | None = None, 
             extra_loader_config: dict | None = None, 
-            extra_saver_config: dict | None = None
+            extra_saver_config: dict | None = None,
+            cache_dir: str | None = None,
+            cache_max_size: int | None = None,
+            GCS_listing_index_path: str | None = None,
+            GCS_listing_ttl: float | None = 300,
+            GCS_parallel_threshold: int | None = 256 * 1024 * 1024,
+            GCS_parallel_slices: int = 8,
+            BQ_cache_dir: str | None = None,
+            BQ_cache_ttl: float | None = 86400,
+            BQ_cache_max_size: int | None = None,
+            BQ_max_bytes_scanned: int | None = None,
+            write_behind: bool = False,
+            write_behind_workers: int = 4,
+            write_behind_max_pending: int = 64
             ):
+
+        self.write_queue = WriteBehindQueue(
+            max_workers=write_behind_workers,
+            max_pending=write_behind_max_pending
+            ) if write_behind else None
     
         self.local = disk(
             root_path=local_path, 
             extra_loader_config=extra_loader_config, 
-            extra_saver_config=extra_saver_config
+            extra_saver_config=extra_saver_config,
+            write_queue=self.write_queue
             )
 
         if gcloud_project_id is not None:
@@ -71,7 +121,18 @@ class EasyEnvironment:
                 GCS_path=GCS_path, 
                 credential_path=gcloud_credential_path,
                 extra_loader_config=extra_loader_config, 
-                extra_saver_config=extra_saver_config
+                extra_saver_config=extra_saver_config,
+                cache_dir=cache_dir,
+                cache_max_size=cache_max_size,
+                listing_index_path=GCS_listing_index_path,
+                listing_ttl=GCS_listing_ttl,
+                parallel_threshold=GCS_parallel_threshold,
+                parallel_slices=GCS_parallel_slices,
+                BQ_cache_dir=BQ_cache_dir,
+                BQ_cache_ttl=BQ_cache_ttl,
+                BQ_cache_max_size=BQ_cache_max_size,
+                BQ_max_bytes_scanned=BQ_max_bytes_scanned,
+                write_queue=self.write_queue
                 )
             
         if sharepoint_site_url is not None:
@@ -83,5 +144,23 @@ class EasyEnvironment:
                 client_id=sharepoint_client_id,
                 client_secret=sharepoint_client_secret,
                 username=sharepoint_username, 
-                user_password=sharepoint_user_password
-                )
\ No newline at end of file
+                user_password=sharepoint_user_password,
+                cache_dir=cache_dir,
+                cache_max_size=cache_max_size,
+                write_queue=self.write_queue
+                )
+
+    def flush(self):
+        """
+        Wait until the files saved in the background (write-behind) are written,
+        in every environment. Raises the error of a failed write.
+        """
+
+        if self.write_queue is not None:
+            self.write_queue.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.flush()
\ No newline at end of file
@@ -0,0 +1,362 @@
+import threading
+import time
+
+from collections import deque
+
+WRITE_MODES = ("default", "committed", "pending")
+
+class BQStreamWriter:
+    """
+    Buffered writer appending rows to a Big Query table through the Storage Write
+    API, with Arrow serialization. Rows are buffered and sent as one request when
+    the buffer reaches `max_rows` or `max_bytes`, or when its oldest row is older
+    than `max_latency`. Prefer `BQ.stream_append` to instantiating it directly.
+
+    Modes:
+        - "default": rows are written to the table default stream and visible immediately
+          (at-least-once delivery).
+        - "committed": rows are written to a dedicated stream with offsets and visible
+          immediately (exactly-once delivery).
+        - "pending": rows become visible atomically when the writer is closed. If the
+          `with` block raises, the writer is aborted and nothing is committed.
+
+    Parameters
+    ----------
+    project_id : str
+        The ID of the Google Cloud project.
+    path : str
+        path representing the data set and the name of the table (ex : "mydata.mytable")
+    mode : str
+        write mode ("default", "committed" or "pending"). Default is "default".
+    schema : pyarrow.Schema (optional)
+        Arrow schema of the rows. Default is the schema of the first rows appended.
+    max_rows : int
+        Number of buffered rows triggering a flush. Default is 10000.
+    max_bytes : int
+        Size (bytes) of buffered rows triggering a flush. Default is 4 MB (requests are
+        limited to 10 MB).
+    max_latency : float
+        Maximum time (seconds) a row stays in the buffer. Default is 1.
+    max_inflight : int
+        Maximum number of requests awaiting acknowledgement. Appending blocks beyond
+        this limit (backpressure). Default is 8.
+    write_client : google.cloud.bigquery_storage_v1.BigQueryWriteClient (optional)
+        Storage Write API client. Default is a new client.
+    """
+
+    def __init__(
+            self,
+            project_id: str,
+            path: str,
+            mode: str = "default",
+            schema=None,
+            max_rows: int = 10000,
+            max_bytes: int = 4 * 1024 * 1024,
+            max_latency: float = 1.0,
+            max_inflight: int = 8,
+            write_client=None
+            ):
+
+        if mode not in WRITE_MODES:
+            raise ValueError(f"mode must be one of {WRITE_MODES}, not '{mode}'.")
+
+        self.project_id = project_id
+        self.path = path
+        self.mode = mode
+        self.schema = schema
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.max_latency = max_latency
+        self.max_inflight = max_inflight
+
+        if write_client is None:
+            from google.cloud.bigquery_storage_v1 import BigQueryWriteClient
+
+            write_client = BigQueryWriteClient()
+
+        self._client = write_client
+        self._table_path = self._client.table_path(*_split_table_path(project_id, path))
+        self._stream = None
+        self._stream_name = None
+        self._offset = 0
+
+        self._buffer = []
+        self._buffer_rows = 0
+        self._buffer_bytes = 0
+        self._buffer_since = None
+        self._inflight = deque()
+        self._error = None
+        self._failed = set()
+        self._closed = False
+
+        self._lock = threading.RLock()
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'rows_appended': 0,
+            'rows_written': 0,
+            'bytes_written': 0,
+            'requests': 0,
+            'total_latency': 0.0,
+            'backpressure_wait': 0.0,
+        }
+        self._started_at = time.monotonic()
+
+        self._stop = threading.Event()
+        self._timer = threading.Thread(target=self._flush_periodically, daemon=True)
+        self._timer.start()
+
+    def append(self, obj):
+        """
+        Buffer rows, flushing them if a threshold is reached.
+
+        Parameters
+        ----------
+        obj : pandas.DataFrame, list of dict, pyarrow.Table or pyarrow.RecordBatch
+            rows to append
+        """
+
+        table = self._to_arrow(obj)
+
+        with self._lock:
+            self._raise_error()
+            if self._closed:
+                raise ValueError("Cannot append to a closed writer.")
+
+            if self._buffer_since is None:
+                self._buffer_since = time.monotonic()
+            self._buffer.append(table)
+            self._buffer_rows += table.num_rows
+            self._buffer_bytes += table.nbytes
+
+            with self._stats_lock:
+                self._stats['rows_appended'] += table.num_rows
+
+            if self._buffer_rows >= self.max_rows or self._buffer_bytes >= self.max_bytes:
+                self._send_buffer()
+
+    def flush(self, wait: bool = True):
+        """
+        Send the buffered rows.
+
+        Parameters
+        ----------
+        wait : bool
+            whether to wait for every request to be acknowledged. Default is True.
+        """
+
+        with self._lock:
+            self._send_buffer()
+            if wait:
+                while self._inflight:
+                    self._wait_oldest()
+            self._raise_error()
+
+    def close(self):
+        """
+        Flush the buffered rows, wait for acknowledgements and close the stream. In
+        "pending" mode, the rows are then committed to the table.
+        """
+
+        with self._lock:
+            if self._closed:
+                return
+
+            self._stop.set()
+            try:
+                self.flush()
+            finally:
+                self._closed = True
+                if self._stream is not None:
+                    self._stream.close()
+
+            if self._stream_name is not None and self.mode != "default":
+                self._client.finalize_write_stream(name=self._stream_name)
+
+            if self._stream_name is not None and self.mode == "pending":
+                from google.cloud.bigquery_storage_v1 import types
+
+                response = self._client.batch_commit_write_streams(
+                    types.BatchCommitWriteStreamsRequest(parent=self._table_path, write_streams=[self._stream_name])
+                )
+                if response.stream_errors:
+                    raise RuntimeError(f"Failed to commit rows to '{self.path}': {list(response.stream_errors)}")
+
+    def abort(self):
+        """
+        Discard the buffered rows and close the stream without finalizing it. In
+        "pending" mode, no row is committed to the table. Rows already acknowledged
+        in the other modes stay written.
+        """
+
+        with self._lock:
+            if self._closed:
+                return
+
+            self._stop.set()
+            self._closed = True
+            self._buffer, self._buffer_rows, self._buffer_bytes, self._buffer_since = [], 0, 0, None
+            if self._stream is not None:
+                self._stream.close()
+
+    @property
+    def metrics(self):
+        """
+        Throughput metrics: rows appended / written, bytes written, requests sent,
+        mean request latency (seconds), time spent blocked by backpressure (seconds)
+        and rows written per second.
+        """
+
+        with self._stats_lock:
+            stats = dict(self._stats)
+
+        elapsed = time.monotonic() - self._started_at
+        total_latency = stats.pop('total_latency')
+        stats['mean_latency'] = total_latency / stats['requests'] if stats['requests'] else 0.0
+        stats['rows_per_second'] = stats['rows_written'] / elapsed if elapsed > 0 else 0.0
+        stats['buffered_rows'] = self._buffer_rows
+        stats['inflight_requests'] = sum(not future.done() for future in list(self._inflight))
+
+        return stats
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        # A failed block must not commit part of the rows of a pending stream
+        if exc_type is not None and self.mode == "pending":
+            self.abort()
+        else:
+            self.close()
+
+    def _to_arrow(self, obj):
+        import pyarrow as pa
+
+        if isinstance(obj, pa.RecordBatch):
+            table = pa.Table.from_batches([obj])
+        elif isinstance(obj, pa.Table):
+            table = obj
+        elif isinstance(obj, list):
+            table = pa.Table.from_pylist(obj, schema=self.schema)
+        else:
+            table = pa.Table.from_pandas(obj, schema=self.schema, preserve_index=False)
+
+        if self.schema is None:
+            self.schema = table.schema
+
+        return table.cast(self.schema) if table.schema != self.schema else table
+
+    def _send_buffer(self):
+        import pyarrow as pa
+        from google.cloud.bigquery_storage_v1 import types
+
+        if not self._buffer:
+            return
+
+        table = pa.concat_tables(self._buffer).combine_chunks()
+        self._buffer, self._buffer_rows, self._buffer_bytes, self._buffer_since = [], 0, 0, None
+
+        if self._stream is None:
+            self._open_stream()
+
+        for batch in table.to_batches():
+            request = types.AppendRowsRequest()
+            request.arrow_rows = types.AppendRowsRequest.ArrowData(
+                rows=types.ArrowRecordBatch(serialized_record_batch=batch.serialize().to_pybytes())
+            )
+            if self.mode != "default":
+                request.offset = self._offset
+                self._offset += batch.num_rows
+
+            while self._inflight and self._inflight[0].done():
+                self._wait_oldest()
+
+            waited_since = time.monotonic()
+            while len(self._inflight) >= self.max_inflight:
+                self._wait_oldest()
+            with self._stats_lock:
+                self._stats['backpressure_wait'] += time.monotonic() - waited_since
+
+            sent_at = time.monotonic()
+            future = self._stream.send(request)
+            future.add_done_callback(self._on_done(batch.num_rows, batch.nbytes, sent_at))
+            self._inflight.append(future)
+
+    def _open_stream(self):
+        from google.cloud.bigquery_storage_v1 import types, writer
+
+        if self.mode == "default":
+            self._stream_name = f"{self._table_path}/streams/_default"
+        else:
+            stream_type = types.WriteStream.Type.PENDING if self.mode == "pending" else types.WriteStream.Type.COMMITTED
+            self._stream_name = self._client.create_write_stream(
+                parent=self._table_path, write_stream=types.WriteStream(type_=stream_type)
+            ).name
+
+        template = types.AppendRowsRequest()
+        template.write_stream = self._stream_name
+        template.arrow_rows = types.AppendRowsRequest.ArrowData(
+            writer_schema=types.ArrowSchema(serialized_schema=self.schema.serialize().to_pybytes())
+        )
+
+        self._stream = writer.AppendRowsStream(self._client, template)
+
+    def _on_done(self, num_rows, num_bytes, sent_at):
+
+        def callback(future):
+            error = future.exception()
+            if error is not None:
+                self._record_error(future, error)
+                return
+            with self._stats_lock:
+                self._stats['rows_written'] += num_rows
+                self._stats['bytes_written'] += num_bytes
+                self._stats['requests'] += 1
+                self._stats['total_latency'] += time.monotonic() - sent_at
+
+        return callback
+
+    def _wait_oldest(self):
+
+        future = self._inflight.popleft()
+        error = future.exception()
+        if error is not None:
+            self._record_error(future, error)
+
+    def _record_error(self, future, error):
+        # Reported once, by the done callback or by the wait, whichever comes first
+        with self._stats_lock:
+            if future in self._failed:
+                return
+            self._failed.add(future)
+            if self._error is None:
+                self._error = error
+
+    def _raise_error(self):
+
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _flush_periodically(self):
+
+        while not self._stop.wait(self.max_latency / 4):
+            with self._lock:
+                if self._closed:
+                    return
+                if self._buffer_since is not None and time.monotonic() - self._buffer_since >= self.max_latency:
+                    try:
+                        self._send_buffer()
+                    except Exception as error:
+                        with self._stats_lock:
+                            if self._error is None:
+                                self._error = error
+
+def _split_table_path(project_id, path):
+
+    parts = path.replace(':', '.').split('.')
+    if len(parts) == 2:
+        return project_id, parts[0], parts[1]
+    if len(parts) == 3:
+        return tuple(parts)
+
+    raise ValueError(f"Invalid table path '{path}': expected 'dataset.table' or 'project.dataset.table'.")
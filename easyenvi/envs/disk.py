@@ -1,6 +1,11 @@
+import glob
 import os
 
+from concurrent.futures import ThreadPoolExecutor
+
 from easyenvi import file
+from easyenvi.error_handler import missing_module_error_handler
+from easyenvi.utils import prefetch_map, select_shard
 
 class disk:
     """
@@ -14,17 +19,28 @@ class disk:
         Extra configuration for file loaders. Default is None.
     extra_saver_config :dict
         Extra configuration for file savers. Default is None.
+    write_queue : easyenvi.utils.WriteBehindQueue (optional)
+        Queue running `save` in the background (write-behind). Default is None
+        (files are written before `save` returns).
     """
 
     def __init__(
             self, 
             root_path: str, 
             extra_loader_config: dict | None = None, 
-            extra_saver_config: dict | None = None
+            extra_saver_config: dict | None = None,
+            write_queue=None
             ):
         
         self.root_path = root_path
-        
+        self.write_queue = write_queue
+        self.registry = file.FormatRegistry(
+            loaders=dict(extra_loader_config or {}),
+            savers=dict(extra_saver_config or {}),
+            parent=file.default_registry
+            )
+
+    @missing_module_error_handler
     def load(
             self, 
             path: str, 
@@ -39,11 +55,17 @@ class disk:
         ----------
         path : str
             path to load from.
+        format : str (optional)
+            extension to use instead of the one of the path (files without extension are identified from their content).
         """
 
         load_path = os.path.join(self.root_path, path)
-        return file.load(load_path, **kwargs)
+        if self.write_queue is not None:
+            self.write_queue.wait(os.path.abspath(load_path))
+
+        return self.registry.load(load_path, **kwargs)
 
+    @missing_module_error_handler
     def save(
             self, 
             obj, 
@@ -61,24 +83,226 @@ class disk:
             object to save.
         path : str
             path to save to.
+        format : str (optional)
+            extension to use instead of the one of the path.
+
+        With a write queue, the file is written in the background: `obj` must not be
+        modified until then (see `flush`).
         """
 
         save_path = os.path.join(self.root_path, path)
-        return file.save(obj, save_path, **kwargs)
+        if self.write_queue is not None:
+            self.write_queue.submit(os.path.abspath(save_path), self.registry.save, obj, save_path, **kwargs)
+            return
+
+        return self.registry.save(obj, save_path, **kwargs)
+
+    def flush(self):
+        """
+        Wait until the files saved in the background are written (no-op without a
+        write queue). Raises the error of a failed write.
+        """
+
+        if self.write_queue is not None:
+            self.write_queue.flush()
+
+    @missing_module_error_handler
+    def load_images(
+            self,
+            paths,
+            **kwargs
+            ):
+        """
+        Load images in parallel into a single NumPy array of shape (N, H, W, C).
+
+        Parameters
+        ----------
+        paths : str or list
+            glob pattern (e.g. "images/*.jpg") or list of paths of the images.
+        kwargs
+            options of `file.load_images` (size, mode, draft, normalize, mean, std, max_workers).
+        """
+
+        if isinstance(paths, str):
+            paths = sorted(glob.glob(os.path.join(self.root_path, paths), recursive=True))
+        else:
+            paths = [os.path.join(self.root_path, path) for path in paths]
+
+        return file.load_images(paths, **kwargs)
+
+    @missing_module_error_handler
+    def save_images(
+            self,
+            images,
+            paths: list,
+            **kwargs
+            ):
+        """
+        Encode images in a process pool and save them in parallel.
+
+        Parameters
+        ----------
+        images : numpy.ndarray or list
+            array of shape (N, H, W, C), or list of PIL images / arrays.
+        paths : list
+            paths to save to (jpg, jpeg or png).
+        kwargs
+            options of `file.save_images` (use_processes, max_workers).
+        """
+
+        paths = [os.path.join(self.root_path, path) for path in paths]
+        return file.save_images(images, paths, **kwargs)
+
+    def iter_files(
+            self,
+            path: str,
+            prefetch: int = 4,
+            max_workers: int = 4,
+            max_bytes: int | None = None,
+            shuffle: bool = False,
+            seed: int | None = None,
+            shard_index: int = 0,
+            num_shards: int = 1,
+            with_paths: bool = False,
+            **kwargs
+            ):
+        """
+        Iterate over the files of a folder (recursively) or matching a glob pattern,
+        yielding loaded objects. The next files are read and decoded by background
+        threads while the current one is processed.
+
+        Parameters
+        ----------
+        path : str
+            folder or glob pattern (e.g. "data/*.parquet", "data/**/*.csv").
+        prefetch : int
+            maximum number of files loaded ahead. Default is 4.
+        max_workers : int
+            number of threads loading files. Default is 4.
+        max_bytes : int (optional)
+            no new file is loaded while the objects loaded ahead exceed this size (bytes).
+            Default is None (no limit).
+        shuffle : bool
+            whether to shuffle the files. Default is False (sorted order).
+        seed : int (optional)
+            seed of the shuffle, to set to the same value on every worker when sharding.
+        shard_index : int
+            index of the shard of this worker (every `num_shards`-th file). Default is 0.
+        num_shards : int
+            number of workers sharing the files. Default is 1.
+        with_paths : bool
+            whether to yield (path, object) pairs. Default is False.
+        kwargs
+            options of `load`.
+        """
+
+        # Files saved in the background are listed
+        self.flush()
+
+        full_path = os.path.join(self.root_path, path)
+        if glob.has_magic(full_path):
+            full_paths = [p for p in glob.glob(full_path, recursive=True) if os.path.isfile(p)]
+        elif os.path.isdir(full_path):
+            full_paths = [
+                os.path.join(directory, name)
+                for directory, _, names in os.walk(full_path) for name in names
+            ]
+        else:
+            full_paths = [full_path]
+
+        root = self.root_path or os.curdir
+        paths = select_shard([os.path.relpath(p, root) for p in full_paths], shuffle=shuffle, seed=seed,
+                             shard_index=shard_index, num_shards=num_shards)
+
+        def load(relative_path):
+            obj = self.load(relative_path, **kwargs)
+            return (relative_path, obj) if with_paths else obj
+
+        return prefetch_map(load, paths, depth=prefetch, max_workers=max_workers, max_bytes=max_bytes)
 
     def clear_folder(
             self, 
-            path: str
+            path: str,
+            max_workers: int = 16
             ):
         """
-        Clear a folder
+        Clear a folder (files and sub-folders), keeping the folder itself.
         
         Parameters
         ----------
         path : str
             path at which to delete all files.
+        max_workers : int
+            number of threads deleting files in parallel. Default is 16.
         """
+
         folder_path = os.path.join(self.root_path, path)
-        for filename in os.listdir(folder_path):
-            file_path = os.path.join(folder_path, filename)
-            os.remove(file_path)
\ No newline at end of file
+        if self.write_queue is not None:
+            self.write_queue.wait_matching(os.path.join(os.path.abspath(folder_path), ''))
+
+        targets = [os.path.join(folder_path, filename) for filename in os.listdir(folder_path)]
+        return _remove_paths(targets, recursive=True, max_workers=max_workers)
+
+    def delete(
+            self,
+            path: str,
+            recursive: bool = False,
+            max_workers: int = 16
+            ):
+        """
+        Delete files matching a path or a glob pattern (e.g. "outputs/*.csv",
+        "outputs/**/*.tmp"). An existing path is deleted literally, even if it
+        contains glob characters. Returns the list of deleted paths. Files being
+        saved in the background are written before being deleted.
+
+        Parameters
+        ----------
+        path : str
+            path or glob pattern of the files to delete.
+        recursive : bool
+            whether to delete matching folders with their content. Default is False.
+        max_workers : int
+            number of threads deleting files in parallel. Default is 16.
+        """
+
+        full_path = os.path.join(self.root_path, path)
+        if self.write_queue is not None:
+            self.write_queue.wait_matching(os.path.abspath(full_path))
+
+        if os.path.lexists(full_path):
+            # An existing path is deleted literally, even if it contains "[", "*" or "?"
+            targets = [full_path]
+        else:
+            targets = glob.glob(full_path, recursive=True) if glob.has_magic(full_path) else []
+        if not targets:
+            raise FileNotFoundError(f"No such file or directory: '{full_path}'")
+
+        return _remove_paths(targets, recursive=recursive, max_workers=max_workers)
+
+def _remove_paths(targets, recursive, max_workers):
+
+    files, folders = [], []
+    for target in targets:
+        if os.path.isdir(target) and not os.path.islink(target):
+            if not recursive:
+                raise IsADirectoryError(f"'{target}' is a directory: use recursive=True to delete it.")
+            for root, dirnames, filenames in os.walk(target):
+                files.extend(os.path.join(root, filename) for filename in filenames)
+                for dirname in dirnames:
+                    subfolder = os.path.join(root, dirname)
+                    (files if os.path.islink(subfolder) else folders).append(subfolder)
+            folders.append(target)
+        else:
+            files.append(target)
+
+    files = list(dict.fromkeys(files))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(os.remove, files))
+
+    # Deepest folders first, once they are empty
+    folders = sorted(set(folders), key=len, reverse=True)
+    for folder in folders:
+        os.rmdir(folder)
+
+    return files + folders
@@ -1,8 +1,22 @@
+import glob
+import json
 import os
+import re
+import shutil
+import tempfile
 
 import fsspec
 
 from easyenvi import file
+from easyenvi.cache import SharedCache
+from easyenvi.envs.bq_writer import BQStreamWriter
+from easyenvi.envs.gcs_transfer import MAX_COMPOSE_SOURCES, PARALLEL_SLICES, PARALLEL_THRESHOLD
+from easyenvi.envs.gcs_transfer import check_crc32c, composite_upload, sliced_download
+from easyenvi.envs.listing_index import ListingIndex
+from easyenvi.file.images import IMAGE_FORMATS
+from easyenvi.file.registry import get_extension
+from easyenvi.error_handler import missing_module_error_handler
+from easyenvi.utils import prefetch as prefetch_iterator, prefetch_map, select_shard, sizeof
 from google.cloud import storage, bigquery
 
 class gcloud:
@@ -21,6 +35,29 @@ class gcloud:
         Extra configuration for file loaders.
     extra_saver_config : dict
         Extra configuration for file savers.
+    cache_dir : str (optional)
+        Directory of the host-wide cache of downloaded GCS files. Default is None (no cache).
+    cache_max_size : int (optional)
+        Maximum size (bytes) of the cache. Default is None (no limit).
+    listing_index_path : str (optional)
+        Path of a local SQLite index of GCS listings. Default is None (no index).
+    listing_ttl : float (optional)
+        Time (seconds) during which an indexed listing is served. Default is 300.
+    parallel_threshold : int (optional)
+        Size (bytes) from which GCS objects are transferred as parallel slices.
+        Default is 256 MiB (None disables parallel transfers).
+    parallel_slices : int
+        Number of slices of a parallel transfer, at most 32. Default is 8.
+    BQ_cache_dir : str (optional)
+        Directory where Big Query results are cached. Default is None (no cache).
+    BQ_cache_ttl : float (optional)
+        Time (seconds) after which a cached Big Query result is computed again. Default is 86400.
+    BQ_cache_max_size : int (optional)
+        Maximum size (bytes) of the Big Query result cache. Default is None (no limit).
+    BQ_max_bytes_scanned : int (optional)
+        Big Query queries estimated to scan more bytes are refused. Default is None (no limit).
+    write_queue : easyenvi.utils.WriteBehindQueue (optional)
+        Queue running GCS saves in the background (write-behind). Default is None.
     """
 
     def __init__(self, 
@@ -28,7 +65,18 @@ class gcloud:
                  credential_path: str | None = None, 
                  GCS_path: str | None = None,
                  extra_loader_config: dict | None = None, 
-                 extra_saver_config: dict | None = None
+                 extra_saver_config: dict | None = None,
+                 cache_dir: str | None = None,
+                 cache_max_size: int | None = None,
+                 listing_index_path: str | None = None,
+                 listing_ttl: float | None = 300,
+                 parallel_threshold: int | None = PARALLEL_THRESHOLD,
+                 parallel_slices: int = PARALLEL_SLICES,
+                 BQ_cache_dir: str | None = None,
+                 BQ_cache_ttl: float | None = 86400,
+                 BQ_cache_max_size: int | None = None,
+                 BQ_max_bytes_scanned: int | None = None,
+                 write_queue=None
                  ):
 
         self.GCS = GCS(
@@ -36,12 +84,23 @@ class gcloud:
             GCS_path=GCS_path, 
             credential_path=credential_path,
             extra_loader_config=extra_loader_config, 
-            extra_saver_config=extra_saver_config
+            extra_saver_config=extra_saver_config,
+            cache_dir=cache_dir,
+            cache_max_size=cache_max_size,
+            listing_index_path=listing_index_path,
+            listing_ttl=listing_ttl,
+            parallel_threshold=parallel_threshold,
+            parallel_slices=parallel_slices,
+            write_queue=write_queue
             )
         
         self.BQ = BQ(
             project_id=project_id, 
-            credential_path=credential_path
+            credential_path=credential_path,
+            cache_dir=BQ_cache_dir,
+            cache_ttl=BQ_cache_ttl,
+            cache_max_size=BQ_cache_max_size,
+            max_bytes_scanned=BQ_max_bytes_scanned
             )
 
 class GCS:
@@ -60,6 +119,29 @@ class GCS:
         Extra configuration for file loaders.
     extra_saver_config : dict
         Extra configuration for file savers.
+    cache_dir : str (optional)
+        Directory of the host-wide cache of downloaded files. Processes sharing this
+        directory download each object version only once. Default is None (no cache).
+    cache_max_size : int (optional)
+        Maximum size (bytes) of the cache. Default is None (no limit).
+    listing_index_path : str (optional)
+        Path of a local SQLite index of listings, so that repeated listings of a same
+        prefix are served locally. Default is None (no index).
+    listing_ttl : float (optional)
+        Time (seconds) during which an indexed listing is served. None means listings
+        never expire and are only updated through `replay_notifications`. Default is 300.
+    parallel_threshold : int (optional)
+        Size (bytes) from which an object is downloaded as byte ranges fetched
+        concurrently, and uploaded as parts sent concurrently then composed
+        (`save`, `upload`, `download`, and `load` with a cache). Such transfers are verified with
+        CRC32C checksums, as are downloads of smaller objects whose metadata is
+        fetched anyway. Default is 256 MiB (None disables parallel transfers).
+    parallel_slices : int
+        Number of ranges / parts of a parallel transfer, at most 32 (limit of a
+        compose request). Default is 8.
+    write_queue : easyenvi.utils.WriteBehindQueue (optional)
+        Queue running `save` in the background (write-behind). Default is None
+        (files are uploaded before `save` returns).
     """
 
     def __init__(
@@ -68,16 +150,38 @@ class GCS:
             credential_path: str | None = None, 
             GCS_path: str | None = None, 
             extra_loader_config: dict | None = None, 
-            extra_saver_config: dict | None = None
+            extra_saver_config: dict | None = None,
+            cache_dir: str | None = None,
+            cache_max_size: int | None = None,
+            listing_index_path: str | None = None,
+            listing_ttl: float | None = 300,
+            parallel_threshold: int | None = PARALLEL_THRESHOLD,
+            parallel_slices: int = PARALLEL_SLICES,
+            write_queue=None
             ):
+
+        if not 1 <= parallel_slices <= MAX_COMPOSE_SOURCES:
+            raise ValueError(f"parallel_slices must be between 1 and {MAX_COMPOSE_SOURCES}.")
     
         self.project_id = project_id
         self.GCS_path = GCS_path
         self.credential_path = credential_path
+        self.registry = file.FormatRegistry(
+            loaders=dict(extra_loader_config or {}),
+            savers=dict(extra_saver_config or {}),
+            parent=file.default_registry
+            )
+        self.cache = SharedCache(cache_dir, max_size=cache_max_size) if cache_dir is not None else None
+        self.listing_index = ListingIndex(listing_index_path, ttl=listing_ttl) if listing_index_path is not None else None
+        self.parallel_threshold = parallel_threshold
+        self.parallel_slices = parallel_slices
+        self.write_queue = write_queue
+        self._storage_client = None
 
         if credential_path is not None:
             os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = credential_path
 
+    @missing_module_error_handler
     def load(
             self, 
             path: str, 
@@ -92,11 +196,21 @@ class GCS:
         ----------
         path : str
             path to load from
+        format : str (optional)
+            extension to use instead of the one of the path (files without extension are identified from their content).
         """
 
         full_path = self.GCS_path + path
-        return file.load(full_path, token=self.credential_path, **kwargs)
+        if self.write_queue is not None:
+            self.write_queue.wait(full_path)
+
+        if self.cache is None:
+            return self.registry.load(full_path, token=self.credential_path, **kwargs)
 
+        with self._cached_copy(full_path) as local_path:
+            return self.registry.load(local_path, **kwargs)
+
+    @missing_module_error_handler
     def save(
             self, 
             obj, 
@@ -114,38 +228,390 @@ class GCS:
             object to save
         path : str
             path to save to
+        format : str (optional)
+            extension to use instead of the one of the path.
+
+        With a write queue, the file is serialized and uploaded in the background:
+        `obj` must not be modified until then (see `flush`).
+        Objects larger than `parallel_threshold` in memory are serialized to a
+        temporary local file, then uploaded with `upload`. The size in memory is
+        an estimate (see `easyenvi.utils.sizeof`): measured on DataFrames (walking
+        object columns), but shallow for dicts and lists, which are written directly.
         """
 
-        extension = path.split('.')[-1]
-        if extension in ['png', 'jpg']:
-            error_message = (
-                f"Extension '{extension}' is not currently supported for saving in Google Cloud Storage\n"
-                "through Easy Environment."
-            )
-            raise ValueError(error_message)
+        full_path = self.GCS_path + path
+        if self.write_queue is not None:
+            self.write_queue.submit(full_path, self._save, obj, path, **kwargs)
+            return
+
+        return self._save(obj, path, **kwargs)
+
+    def _save(
+            self,
+            obj,
+            path: str,
+            **kwargs
+            ):
+
+        full_path = self.GCS_path + path
+        if self.parallel_threshold is None or sizeof(obj) < self.parallel_threshold:
+            self.registry.save(obj, full_path, token=self.credential_path, **kwargs)
+            self._index_object(full_path)
+            return
+
+        with tempfile.TemporaryDirectory() as directory:
+            local_path = os.path.join(directory, os.path.basename(path))
+            self.registry.save(obj, local_path, **kwargs)
+            self._upload(local_path, full_path)
+
+    def upload(
+            self,
+            local_path: str,
+            path: str
+            ):
+        """
+        Upload a local file to Google Cloud Storage. Files larger than
+        `parallel_threshold` are uploaded as parallel parts composed into the object.
+
+        Parameters
+        ----------
+        local_path : str
+            path of the file to upload
+        path : str
+            path to upload to
+        """
 
         full_path = self.GCS_path + path
-        return file.save(obj, full_path, token=self.credential_path, **kwargs)
+        if self.write_queue is not None:
+            self.write_queue.wait(full_path)
+
+        self._upload(local_path, full_path)
+
+    def _upload(
+            self,
+            local_path: str,
+            full_path: str
+            ):
+
+        if self._is_parallel(os.path.getsize(local_path)):
+            bucket_name, name = full_path[5:].split('/', 1)
+            composite_upload(self._client().bucket(bucket_name), name, local_path,
+                             num_slices=self.parallel_slices)
+        else:
+            fs = fsspec.filesystem('gcs', token=self.credential_path)
+            fs.put_file(local_path, full_path)
+
+        self._index_object(full_path)
+
+    def _index_object(
+            self,
+            full_path: str
+            ):
+        """
+        Record an object written by the environment in the listing index (if any),
+        as a Cloud Storage notification would.
+        """
+
+        if self.listing_index is None:
+            return
+
+        fs = fsspec.filesystem('gcs', token=self.credential_path)
+        info = fs.info(full_path)
+        bucket_name, name = full_path[5:].split('/', 1)
+        updated = info.get('updated')
+
+        self.listing_index.apply_event('OBJECT_FINALIZE', {
+            **info,
+            'bucket': bucket_name,
+            'name': name,
+            'updated': updated.isoformat() if hasattr(updated, 'isoformat') else updated
+            })
+
+    def _download(
+            self,
+            full_path: str,
+            output_path: str,
+            info: dict | None = None
+            ):
+        """
+        Download an object, as concurrent byte ranges when it is larger than
+        `parallel_threshold` (and not stored gzip-encoded, ranges then being
+        meaningless). `info` is the fsspec description of the object, if known:
+        the downloaded file is then verified against its CRC32C (unless stored
+        gzip-encoded, the file being decompressed).
+        """
+
+        fs = fsspec.filesystem('gcs', token=self.credential_path)
+        if self.parallel_threshold is not None and info is None:
+            info = fs.info(full_path)
+
+        if info is None or not self._is_parallel(info['size']) or info.get('contentEncoding') == 'gzip':
+            fs.get_file(full_path, output_path)
+            if info is not None and info.get('crc32c') and info.get('contentEncoding') != 'gzip':
+                try:
+                    check_crc32c(output_path, info['crc32c'], full_path)
+                except ValueError:
+                    os.remove(output_path)
+                    raise
+            return
+
+        bucket_name, name = full_path[5:].split('/', 1)
+        generation = info.get('generation')
+        blob = self._client().bucket(bucket_name).blob(name, generation=int(generation) if generation else None)
+        sliced_download(blob, output_path, info['size'], num_slices=self.parallel_slices,
+                        crc32c=info.get('crc32c'))
+
+    def _is_parallel(self, size: int):
+        return self.parallel_threshold is not None and size > 0 and size >= self.parallel_threshold
+
+    def flush(self):
+        """
+        Wait until the files saved in the background are uploaded (no-op without a
+        write queue). Raises the error of a failed upload.
+        """
+
+        if self.write_queue is not None:
+            self.write_queue.flush()
+
+    @missing_module_error_handler
+    def load_images(
+            self,
+            paths,
+            **kwargs
+            ):
+        """
+        Load images from GCS in parallel into a single NumPy array of shape (N, H, W, C).
+
+        Parameters
+        ----------
+        paths : str or list
+            prefix (every jpg/jpeg/png image under it), glob pattern (e.g. "images/*.jpg")
+            or list of paths of the images
+        kwargs
+            options of `file.load_images` (size, mode, draft, normalize, mean, std, max_workers)
+        """
+
+        if isinstance(paths, str):
+            full_path = self.GCS_path + paths
+            if any(char in paths for char in '*?['):
+                fs = fsspec.filesystem('gcs', token=self.credential_path)
+                full_paths = [f"gs://{path}" for path in sorted(fs.glob(full_path))]
+            else:
+                bucket_name = full_path[5:].split('/', 1)[0]
+                full_paths = [
+                    f"gs://{bucket_name}/{name}" for name in self.list_files(paths)
+                    if (get_extension(name) or '').lower() in IMAGE_FORMATS
+                ]
+        else:
+            full_paths = [self.GCS_path + path for path in paths]
+
+        return file.load_images(full_paths, token=self.credential_path, **kwargs)
+
+    @missing_module_error_handler
+    def save_images(
+            self,
+            images,
+            paths: list,
+            **kwargs
+            ):
+        """
+        Encode images in a process pool and upload them to GCS in parallel.
+
+        Parameters
+        ----------
+        images : numpy.ndarray or list
+            array of shape (N, H, W, C), or list of PIL images / arrays
+        paths : list
+            paths to save to (jpg, jpeg or png)
+        kwargs
+            options of `file.save_images` (use_processes, max_workers)
+        """
+
+        full_paths = [self.GCS_path + path for path in paths]
+        return file.save_images(images, full_paths, token=self.credential_path, **kwargs)
+
+    def iter_files(
+            self,
+            path: str,
+            prefetch: int = 4,
+            max_workers: int = 4,
+            max_bytes: int | None = None,
+            shuffle: bool = False,
+            seed: int | None = None,
+            shard_index: int = 0,
+            num_shards: int = 1,
+            with_paths: bool = False,
+            **kwargs
+            ):
+        """
+        Iterate over the files under a prefix or matching a glob pattern, yielding
+        loaded objects. The next files are downloaded and decoded by background
+        threads while the current one is processed.
+
+        Parameters
+        ----------
+        path : str
+            prefix (every file under it) or glob pattern (e.g. "data/*.parquet", "data/**.csv")
+        prefetch : int
+            maximum number of files loaded ahead. Default is 4.
+        max_workers : int
+            number of threads loading files. Default is 4.
+        max_bytes : int (optional)
+            no new file is loaded while the objects loaded ahead exceed this size (bytes).
+            Default is None (no limit).
+        shuffle : bool
+            whether to shuffle the files. Default is False (sorted order).
+        seed : int (optional)
+            seed of the shuffle, to set to the same value on every worker when sharding.
+        shard_index : int
+            index of the shard of this worker (every `num_shards`-th file). Default is 0.
+        num_shards : int
+            number of workers sharing the files. Default is 1.
+        with_paths : bool
+            whether to yield (path, object) pairs. Default is False.
+        kwargs
+            options of `load`.
+
+        Examples
+        --------
+        for df in envi.gcloud.GCS.iter_files("data/*.parquet", shuffle=True, seed=0):
+            process(df)
+        """
+
+        paths = select_shard(self._match_paths(path), shuffle=shuffle, seed=seed,
+                             shard_index=shard_index, num_shards=num_shards)
+
+        def load(relative_path):
+            obj = self.load(relative_path, **kwargs)
+            return (relative_path, obj) if with_paths else obj
+
+        return prefetch_map(load, paths, depth=prefetch, max_workers=max_workers, max_bytes=max_bytes)
+
+    def _match_paths(
+            self,
+            path: str
+            ):
+        """
+        Paths (relative to `GCS_path`) of the files under a prefix or matching a glob pattern.
+        """
+
+        magic_index = next((i for i, char in enumerate(path) if char in '*?['), None)
+        if magic_index is None:
+            prefix, pattern = path, None
+        else:
+            prefix = path[:path.rfind('/', 0, magic_index) + 1]
+            pattern = path[len(prefix):]
+
+        base_prefix = (self.GCS_path[5:].split('/', 1) + [''])[1]
+        return [
+            name[len(base_prefix):] for name in self.list_files(prefix, pattern=pattern)
+            if not name.endswith('/')
+        ]
 
     def list_files(
             self, 
-            path: str
+            path: str,
+            detail: bool = False,
+            delimiter: str | None = None,
+            pattern: str | None = None,
+            refresh: bool = False
             ):
         """
         List files into a specific folder.
+        When the environment has a listing index, listings are served from it
+        until they expire. Files saved, uploaded and deleted by the environment
+        are recorded in the index.
         
         Parameters
         ----------
         path : str
             path to list files
+        detail : bool
+            whether to return dictionaries (name, size, md5, generation, updated, type)
+            instead of names. Default is False.
+        delimiter : str (optional)
+            delimiter for a directory-style listing (e.g. "/"): objects deeper than
+            the prefix are returned as a single directory entry.
+        pattern : str (optional)
+            glob pattern, relative to `path`, the files must match (e.g. "*.csv", "**/*.csv").
+        refresh : bool
+            whether to bypass the listing index and list from Cloud Storage. Default is False.
         """
 
+        # Files saved in the background are listed
+        self.flush()
+
         full_path = self.GCS_path + path
-        bucket_name, path = full_path[5:].split('/', 1)
-        client = storage.Client(project=self.project_id).bucket(bucket_name)
-        files = [blob.name for blob in client.list_blobs(prefix=path)]
+        bucket_name, prefix = full_path[5:].split('/', 1)
+        name_pattern = prefix + pattern if pattern is not None else None
+
+        if self.listing_index is not None:
+            if refresh or not self.listing_index.is_fresh(bucket_name, prefix):
+                self.listing_index.replace(bucket_name, prefix, self._list_blobs(bucket_name, prefix))
+            entries = self.listing_index.query(bucket_name, prefix, delimiter=delimiter, pattern=name_pattern)
+        else:
+            entries = self._list_blobs(bucket_name, prefix, delimiter=delimiter, pattern=name_pattern)
+
+        if detail:
+            return entries
+        return [entry['name'] for entry in entries]
+
+    def replay_notifications(
+            self,
+            path: str
+            ):
+        """
+        Update the listing index with the Cloud Storage Pub/Sub notifications
+        appended to a JSON lines file since the last replay.
+        Returns the number of notifications applied.
+
+        Parameters
+        ----------
+        path : str
+            path to the JSON lines file of notifications
+        """
 
-        return files
+        if self.listing_index is None:
+            raise ValueError("No listing index: specify `listing_index_path` to use one.")
+
+        return self.listing_index.replay_notifications(path)
+
+    def _list_blobs(
+            self,
+            bucket_name: str,
+            prefix: str,
+            delimiter: str | None = None,
+            pattern: str | None = None
+            ):
+
+        blobs = self._client().bucket(bucket_name).list_blobs(
+            prefix=prefix,
+            delimiter=delimiter,
+            match_glob=pattern,
+            fields="items(name,size,md5Hash,generation,updated),prefixes,nextPageToken"
+            )
+
+        entries = [
+            {
+                'name': blob.name,
+                'size': blob.size,
+                'md5': blob.md5_hash,
+                'generation': blob.generation,
+                'updated': blob.updated.isoformat() if blob.updated is not None else None,
+                'type': 'file'
+            }
+            for blob in blobs
+        ]
+        entries += [{'name': name, 'type': 'directory'} for name in sorted(blobs.prefixes)]
+
+        return entries
+
+    def _client(self):
+
+        if self._storage_client is None:
+            self._storage_client = storage.Client(project=self.project_id)
+
+        return self._storage_client
     
     def download(
             self, 
@@ -154,6 +620,8 @@ class GCS:
             ):
         """
         Download a file from the specified path on Google Cloud Storage.
+        Files larger than `parallel_threshold` are downloaded as byte ranges
+        fetched concurrently into the output file.
         
         Parameters
         ----------
@@ -164,25 +632,83 @@ class GCS:
         """
 
         full_path = self.GCS_path + path
-        fs = fsspec.filesystem('gcs', token=self.credential_path)
-        fs.download(full_path, output_path)
+        if self.write_queue is not None:
+            self.write_queue.wait(full_path)
+
+        if self.cache is None:
+            self._download(full_path, output_path)
+            return
+
+        with self._cached_copy(full_path) as local_path:
+            shutil.copyfile(local_path, output_path)
 
     def delete(
             self, 
-            path: str
+            path: str,
+            recursive: bool = False,
+            batch_size: int = 100
             ):
         """
-        Delete a file from Google Cloud Storage.
+        Delete files from Google Cloud Storage. Accepts glob patterns
+        (e.g. "outputs/*.csv", "outputs/**/*.tmp"). An existing path is deleted
+        literally, even if it contains glob characters. Objects are deleted
+        through batch requests sent concurrently. Files being saved in the background are
+        uploaded before being deleted.
 
         Parameters
         ----------
         path : str
-            path to delete from
+            path (or glob pattern) to delete from
+        recursive : bool
+            whether to delete every object under a matching prefix. Default is False.
+        batch_size : int
+            number of deletions per batch request, at most 100 (limit of the
+            Cloud Storage batch API). Default is 100.
         """
+
+        if not 0 < batch_size <= 100:
+            raise ValueError("batch_size must be between 1 and 100.")
         
         full_path = self.GCS_path + path
+        if self.write_queue is not None:
+            self.write_queue.wait_matching(full_path)
+
+        fs = fsspec.filesystem('gcs', token=self.credential_path)
+        if glob.has_magic(path) and fs.exists(full_path):
+            # Escaped, so that the existing object (or prefix) is matched literally
+            full_path = glob.escape(full_path)
+
+        if self.listing_index is not None:
+            deleted = fs.expand_path(full_path, recursive=recursive)
+
+        fs.rm(full_path, recursive=recursive, batchsize=batch_size)
+
+        if self.listing_index is not None:
+            for deleted_path in deleted:
+                bucket_name, _, name = deleted_path.partition('/')
+                self.listing_index.apply_event('OBJECT_DELETE', {'bucket': bucket_name, 'name': name})
+
+    def _cached_copy(
+            self,
+            full_path: str
+            ):
+        """
+        Context manager yielding a local copy of a GCS object from the shared cache.
+        The cache key includes the object generation, so new versions are fetched again.
+        """
+
         fs = fsspec.filesystem('gcs', token=self.credential_path)
-        fs.rm(full_path)
+        info = fs.info(full_path)
+        version = info.get('generation') or info.get('md5Hash') or info.get('updated')
+
+        extension = get_extension(full_path)
+        suffix = f".{extension}" if extension else ""
+
+        return self.cache.open(
+            key=f"gcs:{full_path}#{version}",
+            fetch=lambda local_path: self._download(full_path, local_path, info=info),
+            suffix=suffix
+            )
 
 class BQ:
     """
@@ -194,15 +720,34 @@ class BQ:
         The ID of the Google Cloud project.
     credential_path : str
         The path to the Google Cloud credentials file. Default is None.
+    cache_dir : str (optional)
+        Directory where query results are cached (see `query_to_dataframe`).
+        Default is None (no cache).
+    cache_ttl : float (optional)
+        Time (seconds) after which a cached result is computed again, even if the
+        tables it reads were not modified. Default is 86400.
+    cache_max_size : int (optional)
+        Maximum size (bytes) of the cache. Default is None (no limit).
+    max_bytes_scanned : int (optional)
+        Queries estimated (dry run) to scan more bytes are refused before execution.
+        Default is None (no limit).
     """
 
     def __init__(
             self, 
             project_id: str, 
-            credential_path: str | None = None
+            credential_path: str | None = None,
+            cache_dir: str | None = None,
+            cache_ttl: float | None = 86400,
+            cache_max_size: int | None = None,
+            max_bytes_scanned: int | None = None
             ):
 
         self.project_id = project_id
+        self.credential_path = credential_path
+        self.max_bytes_scanned = max_bytes_scanned
+        self.cache = SharedCache(cache_dir, max_size=cache_max_size, ttl=cache_ttl) if cache_dir is not None else None
+        self._bq_client = None
 
         if credential_path is not None:
             os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = credential_path
@@ -220,9 +765,11 @@ class BQ:
             path representing the data set and the name of the table (ex : "mydata.mytable")
         """
 
+        if '`' in path:
+            raise ValueError(f"Invalid table path '{path}'.")
+
         query = f"SELECT * FROM `{path}`"
-        client = bigquery.Client(project=self.project_id)
-        return client.query(query).result().to_dataframe()
+        return self.query(query).result().to_dataframe()
 
     def write(
             self, 
@@ -244,7 +791,7 @@ class BQ:
             Format: list of dictionnaries (see Documentation)
         """
 
-        client = bigquery.Client(project=self.project_id)
+        client = self._client()
 
         job_config = bigquery.LoadJobConfig(
             autodetect=True,
@@ -279,12 +826,48 @@ class BQ:
             write_disposition='WRITE_APPEND'
         )
 
-        client = bigquery.Client(project=self.project_id)
+        client = self._client()
         client.load_table_from_dataframe(obj, path, job_config=job_config)
  
+    @missing_module_error_handler
+    def stream_append(
+            self,
+            path: str,
+            mode: str = "default",
+            **kwargs
+            ):
+        """
+        Open a buffered writer appending rows to an existing Big Query table through
+        the Storage Write API: frequent small appends are grouped into requests,
+        without the latency and quotas of load jobs. Use it as a context manager,
+        or call `close()` when done.
+
+        Parameters
+        ----------
+        path : str
+            path representing the data set and the name of the table (ex : "mydata.mytable")
+        mode : str
+            "default" (rows visible immediately, at-least-once), "committed" (rows
+            visible immediately, exactly-once) or "pending" (rows visible atomically
+            on close, none if the `with` block raises). Default is "default".
+        kwargs
+            buffering options of `BQStreamWriter` (max_rows, max_bytes, max_latency,
+            max_inflight, schema).
+
+        Examples
+        --------
+        with envi.gcloud.BQ.stream_append("mydata.mytable") as writer:
+            for df in batches:
+                writer.append(df)
+        """
+
+        return BQStreamWriter(self.project_id, path, mode=mode, **kwargs)
+
     def query(
             self, 
-            query: str
+            query: str,
+            params: dict | None = None,
+            dry_run: bool = False
             ):
         """
         Execute Big Query query.
@@ -293,7 +876,320 @@ class BQ:
         ----------
         query : str
             query to execute
+        params : dict (optional)
+            named query parameters, referenced as @name in the query
+        dry_run : bool
+            whether to only validate the query: the returned job gives the bytes
+            that would be scanned (`total_bytes_processed`). Default is False.
+        """
+
+        if not dry_run and self.max_bytes_scanned is not None:
+            self._check_bytes_scanned(self.estimate_bytes(query, params=params))
+
+        job_config = bigquery.QueryJobConfig(
+            query_parameters=_query_parameters(params),
+            dry_run=dry_run,
+            use_query_cache=not dry_run
+        )
+        if not dry_run and self.max_bytes_scanned is not None:
+            job_config.maximum_bytes_billed = self.max_bytes_scanned
+
+        return self._client().query(query, job_config=job_config)
+
+    def estimate_bytes(
+            self,
+            query: str,
+            params: dict | None = None
+            ):
+        """
+        Estimate (dry run) the number of bytes a query would scan.
+
+        Parameters
+        ----------
+        query : str
+            query to estimate
+        params : dict (optional)
+            named query parameters, referenced as @name in the query
+        """
+
+        return self.query(query, params=params, dry_run=True).total_bytes_processed
+
+    def query_to_dataframe(
+            self,
+            query: str,
+            params: dict | None = None,
+            use_cache: bool = True
+            ):
+        """
+        Execute Big Query query and return the result as a pandas.DataFrame.
+        If the environment has a cache directory, results are cached locally
+        (parquet): a cached result is reused as long as the query, its parameters
+        and the last modification times of the tables it reads are unchanged.
+
+        Parameters
+        ----------
+        query : str
+            query to execute
+        params : dict (optional)
+            named query parameters, referenced as @name in the query
+        use_cache : bool
+            whether to use the result cache. Default is True.
         """
 
-        client = bigquery.Client(project=self.project_id)
-        return client.query(query)
\ No newline at end of file
+        if self.cache is None or not use_cache or NON_DETERMINISTIC_SQL.search(query):
+            return self.query(query, params=params).to_dataframe()
+
+        dry_run_job = self.query(query, params=params, dry_run=True)
+        self._check_bytes_scanned(dry_run_job.total_bytes_processed)
+
+        tables_versions = []
+        for reference in dry_run_job.referenced_tables:
+            table = self._client().get_table(reference)
+            if table.streaming_buffer is not None or table.modified is None:
+                return self.query(query, params=params).to_dataframe()
+            tables_versions.append(f"{table.full_table_id}@{table.modified.isoformat()}")
+
+        key = json.dumps(
+            [normalize_sql(query), _params_key(params), sorted(tables_versions)],
+            sort_keys=True
+        )
+
+        result = {}
+
+        def fetch(local_path):
+            import pyarrow.parquet as pq
+
+            table = self._run_query(query, params).to_arrow()
+            pq.write_table(table, local_path)
+            result['dataframe'] = table.to_pandas()
+
+        with self.cache.open(key=f"bigquery:{self.project_id}:{key}", fetch=fetch, suffix=".parquet") as local_path:
+            if 'dataframe' in result:
+                return result['dataframe']
+            return file.load(local_path)
+
+    @missing_module_error_handler
+    def iter_query(
+            self,
+            query: str,
+            params: dict | None = None,
+            page_size: int = 10000,
+            as_arrow: bool = False,
+            prefetch: int = 1,
+            use_storage_api: bool = False
+            ):
+        """
+        Execute Big Query query and iterate over the result page by page, without
+        holding the full result in memory. The next pages are fetched in a
+        background thread while the current one is processed.
+
+        Parameters
+        ----------
+        query : str
+            query to execute
+        params : dict (optional)
+            named query parameters, referenced as @name in the query
+        page_size : int
+            number of rows per page. Default is 10000.
+        as_arrow : bool
+            whether to yield pyarrow.RecordBatch instead of pandas.DataFrame. Default is False.
+        prefetch : int
+            number of pages fetched ahead. Default is 1.
+        use_storage_api : bool
+            whether to read the result through the BigQuery Storage Read API (faster
+            for large results, pages are then sized by the API). Default is False.
+
+        Examples
+        --------
+        for df in envi.gcloud.BQ.iter_query("SELECT * FROM mydata.mytable WHERE age > @age", params={'age': 50}):
+            process(df)
+        """
+
+        rows = self.query(query, params=params).result(page_size=page_size)
+        return self._iter_rows(rows, as_arrow=as_arrow, prefetch=prefetch, use_storage_api=use_storage_api)
+
+    @missing_module_error_handler
+    def query_to_parquet(
+            self,
+            query: str,
+            output_path: str,
+            params: dict | None = None,
+            page_size: int = 10000,
+            use_storage_api: bool = False
+            ):
+        """
+        Execute Big Query query and write the result to a parquet file (local or
+        "gs://..."), page by page, without holding the full result in memory.
+        The file is only written once the whole result is read.
+        Returns the number of rows written.
+
+        Parameters
+        ----------
+        query : str
+            query to execute
+        output_path : str
+            path of the parquet file to write
+        params : dict (optional)
+            named query parameters, referenced as @name in the query
+        page_size : int
+            number of rows per page. Default is 10000.
+        use_storage_api : bool
+            whether to read the result through the BigQuery Storage Read API. Default is False.
+        """
+
+        import pyarrow.parquet as pq
+        from fsspec.implementations.local import LocalFileSystem
+
+        storage_options = {'token': self.credential_path} if output_path.startswith(('gs://', 'gcs://')) else {}
+        rows = self.query(query, params=params).result(page_size=page_size)
+
+        # Written to a temporary file, then moved (or uploaded) to `output_path` once
+        # complete: a failure while reading the result leaves no partial file
+        fs, fs_path = fsspec.core.url_to_fs(output_path, **storage_options)
+        local = isinstance(fs, LocalFileSystem)
+        fd, temporary_path = tempfile.mkstemp(suffix=".parquet",
+                                              dir=os.path.dirname(os.path.abspath(fs_path)) if local else None)
+        os.close(fd)
+
+        num_rows = 0
+        try:
+            if not rows.total_rows:
+                # Empty result: the file holds the schema of the result
+                pq.write_table(rows.to_arrow(), temporary_path)
+            else:
+                writer = None
+                try:
+                    for batch in self._iter_rows(rows, as_arrow=True, prefetch=1, use_storage_api=use_storage_api):
+                        if writer is None:
+                            writer = pq.ParquetWriter(temporary_path, batch.schema)
+                        writer.write_batch(batch)
+                        num_rows += batch.num_rows
+                finally:
+                    if writer is not None:
+                        writer.close()
+
+            if local:
+                os.replace(temporary_path, fs_path)
+            else:
+                fs.put_file(temporary_path, fs_path)
+        finally:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+
+        return num_rows
+
+    def _iter_rows(self, rows, as_arrow, prefetch, use_storage_api):
+
+        bqstorage_client = None
+        if use_storage_api:
+            from google.cloud import bigquery_storage
+            bqstorage_client = bigquery_storage.BigQueryReadClient()
+
+        if as_arrow:
+            pages = rows.to_arrow_iterable(bqstorage_client=bqstorage_client)
+        else:
+            pages = rows.to_dataframe_iterable(bqstorage_client=bqstorage_client)
+
+        return prefetch_iterator(pages, depth=prefetch)
+
+    def _run_query(self, query, params):
+
+        job_config = bigquery.QueryJobConfig(query_parameters=_query_parameters(params))
+        if self.max_bytes_scanned is not None:
+            job_config.maximum_bytes_billed = self.max_bytes_scanned
+
+        return self._client().query(query, job_config=job_config)
+
+    def _check_bytes_scanned(self, bytes_scanned):
+
+        if self.max_bytes_scanned is not None and bytes_scanned > self.max_bytes_scanned:
+            raise ValueError(
+                f"Query would scan {bytes_scanned} bytes, more than the limit of "
+                f"{self.max_bytes_scanned} bytes (max_bytes_scanned)."
+            )
+
+    def _client(self):
+
+        if self._bq_client is None:
+            self._bq_client = bigquery.Client(project=self.project_id)
+
+        return self._bq_client
+
+# Functions whose result changes between executions: queries using them are never cached
+NON_DETERMINISTIC_SQL = re.compile(
+    r"\b(CURRENT_(DATE|DATETIME|TIME|TIMESTAMP)|RAND|GENERATE_UUID|SESSION_USER|NOW)\s*\(",
+    re.IGNORECASE
+)
+
+SQL_TOKENS = re.compile(
+    r"(?P<string>'(?:\\.|[^'\\])*'|\"(?:\\.|[^\"\\])*\"|`[^`]*`)"
+    r"|(?P<comment>--[^\n]*|#[^\n]*|/\*.*?\*/)"
+    r"|(?P<space>\s+)",
+    re.DOTALL
+)
+
+def normalize_sql(query: str):
+    """
+    Remove comments and collapse whitespace outside of string literals and quoted
+    identifiers, so that formatting changes do not change a query cache key.
+
+    Parameters
+    ----------
+    query : str
+        query to normalize.
+    """
+
+    def replace(match):
+        if match.group('string') is not None:
+            return match.group('string')
+        return " "
+
+    # Second pass merges the spaces left by consecutive comments and whitespace
+    return SQL_TOKENS.sub(replace, SQL_TOKENS.sub(replace, query)).strip()
+
+def _query_parameters(params):
+
+    if not params:
+        return []
+
+    return [_query_parameter(name, value) for name, value in params.items()]
+
+def _query_parameter(name, value):
+
+    if isinstance(value, (list, tuple)):
+        if not value:
+            raise ValueError(f"Cannot infer the type of the empty array parameter '{name}'.")
+        return bigquery.ArrayQueryParameter(name, _parameter_type(value[0]), list(value))
+
+    return bigquery.ScalarQueryParameter(name, _parameter_type(value), value)
+
+def _parameter_type(value):
+
+    import datetime
+    import decimal
+
+    # bool before int, datetime before date (subclasses)
+    types = [
+        (bool, "BOOL"),
+        (int, "INT64"),
+        (float, "FLOAT64"),
+        (decimal.Decimal, "NUMERIC"),
+        (str, "STRING"),
+        (bytes, "BYTES"),
+        (datetime.datetime, "TIMESTAMP"),
+        (datetime.date, "DATE"),
+        (datetime.time, "TIME"),
+    ]
+    for python_type, bigquery_type in types:
+        if isinstance(value, python_type):
+            return bigquery_type
+
+    raise ValueError(f"Unsupported query parameter type: {type(value).__name__}.")
+
+def _params_key(params):
+
+    if not params:
+        return []
+
+    return [[name, _parameter_type(value) if not isinstance(value, (list, tuple)) else "ARRAY", repr(value)]
+            for name, value in sorted(params.items())]
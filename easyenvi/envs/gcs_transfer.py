@@ -0,0 +1,172 @@
+import base64
+import os
+import uuid
+
+from concurrent.futures import ThreadPoolExecutor
+
+PARALLEL_THRESHOLD = 256 * 1024 * 1024
+PARALLEL_SLICES = 8
+MAX_COMPOSE_SOURCES = 32
+PARTS_INFIX = ".parts-"
+CHECKSUM_CHUNK_SIZE = 8 * 1024 * 1024
+
+def slice_ranges(size: int, num_slices: int):
+    """
+    Split `size` bytes into at most `num_slices` contiguous (start, end) ranges
+    of nearly equal length (end excluded).
+
+    Parameters
+    ----------
+    size : int
+        number of bytes.
+    num_slices : int
+        maximum number of ranges.
+    """
+
+    num_slices = max(1, min(num_slices, size))
+    bounds = [size * i // num_slices for i in range(num_slices + 1)]
+
+    return list(zip(bounds[:-1], bounds[1:]))
+
+def file_crc32c(path: str):
+    """
+    CRC32C checksum of a local file, base64-encoded as given by Cloud Storage.
+
+    Parameters
+    ----------
+    path : str
+        path of the file.
+    """
+
+    import google_crc32c
+
+    checksum = google_crc32c.Checksum()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHECKSUM_CHUNK_SIZE), b""):
+            checksum.update(chunk)
+
+    return base64.b64encode(checksum.digest()).decode()
+
+def sliced_download(
+        blob,
+        output_path: str,
+        size: int,
+        num_slices: int = PARALLEL_SLICES,
+        crc32c: str | None = None
+        ):
+    """
+    Download an object as `num_slices` byte ranges fetched concurrently, each
+    written in place into a file preallocated to the object size. The file is
+    removed if a range fails or if its checksum differs from `crc32c`.
+
+    Parameters
+    ----------
+    blob : google.cloud.storage.Blob
+        object to download (pinned to a generation, so that every range comes
+        from the same version).
+    output_path : str
+        path of the local file.
+    size : int
+        size of the object.
+    num_slices : int
+        number of ranges. Default is 8.
+    crc32c : str (optional)
+        expected base64-encoded CRC32C of the object. Default is None (not verified).
+    """
+
+    ranges = slice_ranges(size, num_slices)
+
+    with open(output_path, 'wb') as f:
+        f.truncate(size)
+
+    def download_range(start, end):
+        with open(output_path, 'r+b') as f:
+            f.seek(start)
+            # Checksums of the whole object do not apply to a range: verified below
+            blob.download_to_file(f, start=start, end=end - 1, checksum=None)
+
+    try:
+        with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+            list(executor.map(download_range, *zip(*ranges)))
+        if crc32c is not None:
+            check_crc32c(output_path, crc32c, f"gs://{blob.bucket.name}/{blob.name}")
+    except BaseException:
+        os.remove(output_path)
+        raise
+
+def composite_upload(
+        bucket,
+        name: str,
+        source_path: str,
+        num_slices: int = PARALLEL_SLICES,
+        verify: bool = True
+        ):
+    """
+    Upload a local file as up to `num_slices` temporary objects sent concurrently,
+    then compose them into the object `name` and delete them. Each part is
+    checked by Cloud Storage against its CRC32C, and the composed object against
+    the CRC32C of the file (it is deleted if they differ).
+
+    Parameters
+    ----------
+    bucket : google.cloud.storage.Bucket
+        destination bucket.
+    name : str
+        name of the object.
+    source_path : str
+        path of the local file.
+    num_slices : int
+        number of parts, at most 32 (limit of a compose request). Default is 8.
+    verify : bool
+        whether to verify checksums. Default is True.
+
+    Returns the composed object.
+    """
+
+    if not 1 <= num_slices <= MAX_COMPOSE_SOURCES:
+        raise ValueError(f"num_slices must be between 1 and {MAX_COMPOSE_SOURCES}.")
+
+    ranges = slice_ranges(os.path.getsize(source_path), num_slices)
+    parts_prefix = f"{name}{PARTS_INFIX}{uuid.uuid4().hex}/"
+    parts = [bucket.blob(f"{parts_prefix}{i:02d}") for i in range(len(ranges))]
+
+    def upload_part(part, start, end):
+        with open(source_path, 'rb') as f:
+            f.seek(start)
+            part.upload_from_file(f, size=end - start, checksum="crc32c" if verify else None)
+
+    try:
+        with ThreadPoolExecutor(max_workers=len(parts)) as executor:
+            list(executor.map(upload_part, parts, *zip(*ranges)))
+
+        blob = bucket.blob(name)
+        blob.compose(parts)
+    finally:
+        bucket.delete_blobs(parts, on_error=lambda part: None)
+
+    if verify:
+        try:
+            check_crc32c(source_path, blob.crc32c, f"gs://{bucket.name}/{name}")
+        except ValueError:
+            blob.delete()
+            raise
+
+    return blob
+
+def check_crc32c(path: str, expected: str, description: str):
+    """
+    Raise a ValueError if the CRC32C checksum of a local file differs from `expected`.
+
+    Parameters
+    ----------
+    path : str
+        path of the file.
+    expected : str
+        base64-encoded CRC32C, as given by Cloud Storage.
+    description : str
+        name of the object, used in the error message.
+    """
+
+    actual = file_crc32c(path)
+    if actual != expected:
+        raise ValueError(f"CRC32C mismatch for '{description}': expected {expected}, got {actual}.")
@@ -0,0 +1,317 @@
+import base64
+import json
+import os
+import re
+import sqlite3
+import time
+
+from contextlib import closing
+
+UPSERT_EVENTS = ("OBJECT_FINALIZE", "OBJECT_METADATA_UPDATE")
+DELETE_EVENTS = ("OBJECT_DELETE", "OBJECT_ARCHIVE")
+
+def glob_to_regex(pattern: str):
+    """
+    Translate a Cloud Storage glob pattern (`**` crosses "/", `*` and `?` do not)
+    into a compiled regular expression.
+
+    Parameters
+    ----------
+    pattern : str
+        glob pattern.
+    """
+
+    regex, i = "", 0
+    while i < len(pattern):
+        if pattern.startswith("**", i):
+            regex += ".*"
+            i += 2
+        elif pattern[i] == "*":
+            regex += "[^/]*"
+            i += 1
+        elif pattern[i] == "?":
+            regex += "[^/]"
+            i += 1
+        elif pattern[i] == "[" and "]" in pattern[i + 1:]:
+            end = pattern.index("]", i + 1)
+            content = pattern[i + 1:end]
+            if content.startswith("!"):
+                content = "^" + content[1:]
+            regex += f"[{content}]"
+            i = end + 1
+        else:
+            regex += re.escape(pattern[i])
+            i += 1
+
+    return re.compile(regex + r"\Z", re.DOTALL)
+
+def filter_listing(entries, prefix: str, delimiter: str | None = None, pattern: str | None = None):
+    """
+    Apply a delimiter (directory-style listing) and a glob pattern (matched
+    against full object names) to a list of entries under a prefix.
+
+    Parameters
+    ----------
+    entries : list
+        object descriptions (dictionaries with at least a 'name' key).
+    prefix : str
+        common prefix of the entries.
+    delimiter : str (optional)
+        delimiter collapsing deeper objects into directory entries.
+    pattern : str (optional)
+        glob pattern the object names must match.
+    """
+
+    regex = glob_to_regex(pattern) if pattern is not None else None
+
+    files, directories = [], {}
+    for entry in entries:
+        rest = entry['name'][len(prefix):]
+        if delimiter and delimiter in rest:
+            name = prefix + rest[:rest.index(delimiter) + len(delimiter)]
+            directories.setdefault(name, {'name': name, 'type': 'directory'})
+        elif regex is None or regex.match(entry['name']):
+            files.append(entry)
+
+    return files + list(directories.values())
+
+class ListingIndex:
+    """
+    Local index of Cloud Storage listings, stored in a SQLite database that can be
+    shared between processes.
+
+    Listings of a prefix are served from the index while they are younger than
+    `ttl`. The index can be kept up to date without relisting by replaying
+    Cloud Storage Pub/Sub notifications (OBJECT_FINALIZE, OBJECT_DELETE, ...)
+    exported as JSON lines.
+
+    Parameters
+    ----------
+    path : str
+        path of the SQLite database.
+    ttl : float (optional)
+        Time (seconds) during which a listing is served from the index. None means
+        listings never expire (the index is then kept up to date by notifications).
+        Default is 300.
+    """
+
+    def __init__(
+            self,
+            path: str,
+            ttl: float | None = 300
+            ):
+
+        self.path = path
+        self.ttl = ttl
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with closing(self._connect()) as connection, connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS objects ("
+                "bucket TEXT, name TEXT, size INTEGER, md5 TEXT, generation INTEGER, updated TEXT, "
+                "PRIMARY KEY (bucket, name))"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS listings ("
+                "bucket TEXT, prefix TEXT, refreshed_at REAL, PRIMARY KEY (bucket, prefix))"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS replay_offsets (source TEXT PRIMARY KEY, offset INTEGER)"
+            )
+
+    def is_fresh(
+            self,
+            bucket: str,
+            prefix: str
+            ):
+        """
+        Whether the prefix is covered by a listing younger than `ttl`.
+        """
+
+        with closing(self._connect()) as connection:
+            rows = connection.execute(
+                "SELECT prefix, refreshed_at FROM listings WHERE bucket = ?", (bucket,)
+            ).fetchall()
+
+        now = time.time()
+        return any(
+            prefix.startswith(listed_prefix) and (self.ttl is None or now - refreshed_at < self.ttl)
+            for listed_prefix, refreshed_at in rows
+        )
+
+    def replace(
+            self,
+            bucket: str,
+            prefix: str,
+            entries: list
+            ):
+        """
+        Replace the indexed objects under a prefix with a fresh listing.
+
+        Parameters
+        ----------
+        bucket : str
+            bucket name.
+        prefix : str
+            listed prefix.
+        entries : list
+            object descriptions, as returned by `GCS.list_files(detail=True)`.
+        """
+
+        lower, upper = _prefix_range(prefix)
+        with closing(self._connect()) as connection, connection:
+            if upper is None:
+                connection.execute("DELETE FROM objects WHERE bucket = ? AND name >= ?", (bucket, lower))
+            else:
+                connection.execute(
+                    "DELETE FROM objects WHERE bucket = ? AND name >= ? AND name < ?", (bucket, lower, upper)
+                )
+            connection.executemany(
+                "INSERT OR REPLACE INTO objects VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (bucket, e['name'], e['size'], e['md5'], e['generation'], e['updated'])
+                    for e in entries
+                ]
+            )
+            connection.execute(
+                "INSERT OR REPLACE INTO listings VALUES (?, ?, ?)", (bucket, prefix, time.time())
+            )
+
+    def query(
+            self,
+            bucket: str,
+            prefix: str,
+            delimiter: str | None = None,
+            pattern: str | None = None
+            ):
+        """
+        List indexed objects under a prefix.
+
+        Parameters
+        ----------
+        bucket : str
+            bucket name.
+        prefix : str
+            prefix to list.
+        delimiter : str (optional)
+            delimiter collapsing deeper objects into directory entries.
+        pattern : str (optional)
+            glob pattern the object names must match.
+        """
+
+        lower, upper = _prefix_range(prefix)
+        with closing(self._connect()) as connection:
+            if upper is None:
+                rows = connection.execute(
+                    "SELECT name, size, md5, generation, updated FROM objects "
+                    "WHERE bucket = ? AND name >= ? ORDER BY name", (bucket, lower)
+                ).fetchall()
+            else:
+                rows = connection.execute(
+                    "SELECT name, size, md5, generation, updated FROM objects "
+                    "WHERE bucket = ? AND name >= ? AND name < ? ORDER BY name", (bucket, lower, upper)
+                ).fetchall()
+
+        entries = [
+            {'name': name, 'size': size, 'md5': md5, 'generation': generation, 'updated': updated, 'type': 'file'}
+            for name, size, md5, generation, updated in rows
+        ]
+
+        return filter_listing(entries, prefix, delimiter=delimiter, pattern=pattern)
+
+    def apply_event(
+            self,
+            event_type: str,
+            resource: dict
+            ):
+        """
+        Apply a Cloud Storage notification to the index.
+
+        Parameters
+        ----------
+        event_type : str
+            notification type (OBJECT_FINALIZE, OBJECT_METADATA_UPDATE, OBJECT_DELETE, OBJECT_ARCHIVE).
+        resource : dict
+            object resource carried by the notification (bucket, name, size, md5Hash, generation, updated).
+            A deletion without generation removes the object whatever its generation.
+        """
+
+        with closing(self._connect()) as connection, connection:
+            self._apply_event(connection, event_type, resource)
+
+    def replay_notifications(self, path: str):
+        """
+        Apply the notifications appended to a JSON lines file since the last replay.
+        Each line is a Pub/Sub message ({"attributes": {"eventType": ...}, "data": ...},
+        with `data` base64-encoded or already decoded). Returns the number of
+        notifications applied.
+
+        Parameters
+        ----------
+        path : str
+            path to the JSON lines file.
+        """
+
+        source = os.path.abspath(path)
+
+        with closing(self._connect()) as connection, connection:
+            row = connection.execute(
+                "SELECT offset FROM replay_offsets WHERE source = ?", (source,)
+            ).fetchone()
+            offset = row[0] if row is not None else 0
+            if offset > os.path.getsize(path):
+                offset = 0
+
+            applied = 0
+            with open(path, 'rb') as f:
+                f.seek(offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    offset += len(line)
+                    if not line.strip():
+                        continue
+
+                    message = json.loads(line)
+                    data = message.get('data', {})
+                    if isinstance(data, str):
+                        data = json.loads(base64.b64decode(data))
+                    event_type = message.get('attributes', {}).get('eventType')
+
+                    self._apply_event(connection, event_type, data)
+                    applied += 1
+
+            connection.execute("INSERT OR REPLACE INTO replay_offsets VALUES (?, ?)", (source, offset))
+
+        return applied
+
+    def _apply_event(self, connection, event_type, resource):
+
+        bucket, name = resource['bucket'], resource['name']
+        generation = int(resource.get('generation', 0))
+
+        if event_type in UPSERT_EVENTS:
+            connection.execute(
+                "DELETE FROM objects WHERE bucket = ? AND name = ? AND generation <= ?", (bucket, name, generation)
+            )
+            connection.execute(
+                "INSERT OR IGNORE INTO objects VALUES (?, ?, ?, ?, ?, ?)",
+                (bucket, name, int(resource.get('size', 0)), resource.get('md5Hash'), generation, resource.get('updated'))
+            )
+        elif event_type in DELETE_EVENTS and 'generation' not in resource:
+            connection.execute("DELETE FROM objects WHERE bucket = ? AND name = ?", (bucket, name))
+        elif event_type in DELETE_EVENTS:
+            connection.execute(
+                "DELETE FROM objects WHERE bucket = ? AND name = ? AND generation <= ?", (bucket, name, generation)
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+def _prefix_range(prefix):
+
+    if not prefix:
+        return "", None
+
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
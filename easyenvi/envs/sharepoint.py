@@ -1,5 +1,12 @@
+import glob
 import os
+import shutil
+import threading
 
+from easyenvi.cache import SharedCache
+from easyenvi.envs.listing_index import glob_to_regex
+from easyenvi.file.registry import get_extension
+from office365.runtime.client_request_exception import ClientRequestException
 from office365.sharepoint.client_context import ClientContext
 from office365.runtime.auth.client_credential import ClientCredential
 from office365.runtime.auth.user_credential import UserCredential
@@ -22,6 +29,14 @@ class sharepoint:
         User name of a SharePoint user account.
     user_password : str (optional)
         User password of a SharePoint user account.
+    cache_dir : str (optional)
+        Directory of the host-wide cache of downloaded files. Processes sharing this
+        directory download each file version only once. Default is None (no cache).
+    cache_max_size : int (optional)
+        Maximum size (bytes) of the cache. Default is None (no limit).
+    write_queue : easyenvi.utils.WriteBehindQueue (optional)
+        Queue running `upload` in the background (write-behind). Default is None
+        (files are uploaded before `upload` returns).
     """
 
     def __init__(
@@ -30,7 +45,10 @@ class sharepoint:
             client_id: str | None = None, 
             client_secret: str | None = None, 
             username: str | None = None, 
-            user_password: str | None = None
+            user_password: str | None = None,
+            cache_dir: str | None = None,
+            cache_max_size: int | None = None,
+            write_queue=None
             ):
 
         if client_id is not None:
@@ -38,7 +56,12 @@ class sharepoint:
         elif username is not None:
             credentials = UserCredential(username, user_password)
 
-        self.env = ClientContext(site_url).with_credentials(credentials)
+        self.site_url = site_url
+        self._new_context = lambda: ClientContext(site_url).with_credentials(credentials)
+        self.env = self._new_context()
+        self._thread_contexts = threading.local()
+        self.cache = SharedCache(cache_dir, max_size=cache_max_size) if cache_dir is not None else None
+        self.write_queue = write_queue
 
     def download(
             self, 
@@ -56,6 +79,32 @@ class sharepoint:
             Local path to store the downloaded file
         """
 
+        if self.write_queue is not None:
+            self.write_queue.wait(self._write_key(input_path))
+
+        if self.cache is None:
+            self._download(input_path, output_path)
+            return
+
+        remote_file = self.env.web.get_file_by_server_relative_path(input_path).get().execute_query()
+        version = remote_file.properties.get('ETag') or remote_file.properties.get('TimeLastModified')
+
+        extension = get_extension(input_path)
+        suffix = f".{extension}" if extension else ""
+
+        with self.cache.open(
+                key=f"sharepoint:{self.site_url}{input_path}#{version}",
+                fetch=lambda local_path: self._download(input_path, local_path),
+                suffix=suffix
+                ) as local_path:
+            shutil.copyfile(local_path, output_path)
+
+    def _download(
+            self,
+            input_path: str,
+            output_path: str
+            ):
+
         with open(output_path, "wb") as local_file:
            (self.env
             .web
@@ -78,13 +127,52 @@ class sharepoint:
             Local path to the file to be uploaded
         output_path : str
             SharePoint path to store the uploaded file
+
+        With a write queue, the file is uploaded in the background: it must not be
+        modified until then (see `flush`).
         """
-        
+
+        if self.write_queue is not None:
+            self.write_queue.submit(self._write_key(output_path), self._upload_in_background, input_path, output_path)
+            return
+
+        self._upload(input_path, output_path)
+
+    def flush(self):
+        """
+        Wait until the files uploaded in the background are written (no-op without
+        a write queue). Raises the error of a failed upload.
+        """
+
+        if self.write_queue is not None:
+            self.write_queue.flush()
+
+    def _upload(
+            self,
+            input_path: str,
+            output_path: str,
+            context=None
+            ):
+
         with open(input_path, 'rb') as content_file:
             file_content = content_file.read()
 
         dir, name = os.path.split(output_path)
-        self.env.web.get_folder_by_server_relative_url(dir).upload_file(name, file_content).execute_query()
+        (context or self.env).web.get_folder_by_server_relative_url(dir).upload_file(name, file_content).execute_query()
+
+    def _upload_in_background(
+            self,
+            input_path: str,
+            output_path: str
+            ):
+
+        # A client context queues queries until they are executed: each background
+        # thread uses its own context rather than the caller's
+        context = getattr(self._thread_contexts, 'context', None)
+        if context is None:
+            context = self._thread_contexts.context = self._new_context()
+
+        self._upload(input_path, output_path, context=context)
            
     def list_files(
             self, 
@@ -99,6 +187,9 @@ class sharepoint:
             Sharepoint access path for listing files
         """
 
+        # Files uploaded in the background are listed
+        self.flush()
+
         root_folder = self.env.web.get_folder_by_server_relative_path(folder)
         root_folder.expand(["Files", "Folders"]).get().execute_query()
         files = [file.properties['ServerRelativeUrl'].split('/')[-1] for file in root_folder.files]
@@ -118,5 +209,95 @@ class sharepoint:
             Sharepoint path of the file to be deleted
         """
 
+        if self.write_queue is not None:
+            self.write_queue.wait(self._write_key(file_path))
+
         path_env = self.env.web.get_file_by_server_relative_url(file_path)
-        path_env.delete_object().execute_query()
\ No newline at end of file
+        path_env.delete_object().execute_query()
+
+    def delete(
+            self,
+            path: str,
+            recursive: bool = False,
+            batch_size: int = 100
+            ):
+        """
+        Delete files matching a path or a glob pattern (e.g.
+        "/Documents partages/folder/*.csv", "folder/**/*.tmp"; `*` and `?` do not
+        match "/"). Deletions are grouped into `$batch` requests. Returns the list
+        of deleted files. An existing path containing brackets (e.g.
+        "report [draft].csv") is deleted literally.
+        Files being uploaded in the background are written before being deleted.
+
+        Parameters
+        ----------
+        path : str
+            Sharepoint path (or glob pattern) of the files to delete
+        recursive : bool
+            whether to delete matching folders with their content. Default is False.
+        batch_size : int
+            number of deletions per batch request. Default is 100.
+        """
+
+        if self.write_queue is not None:
+            self.write_queue.wait_matching(self._write_key(path))
+
+        parts = path.rstrip('/').split('/')
+        magic_index = next((i for i, part in enumerate(parts) if glob.has_magic(part)), None)
+
+        # SharePoint names cannot contain "*" or "?", but can contain "[": such
+        # paths are first looked up literally, as a file then as a folder
+        literal = None
+        if magic_index is not None and not any(char in path for char in '*?'):
+            if self._exists(path):
+                literal = 'file'
+            elif self._exists(path, folder=True):
+                literal = 'folder'
+
+        if magic_index is None or literal is not None:
+            if recursive and literal != 'file':
+                self.env.web.get_folder_by_server_relative_url(path).delete_object().execute_query()
+            else:
+                self.delete_file(path)
+            return [path]
+
+        base_folder = '/'.join(parts[:magic_index])
+        pattern = '/'.join(parts[magic_index:])
+
+        folder = self.env.web.get_folder_by_server_relative_path(base_folder).get().execute_query()
+        base_url = folder.properties['ServerRelativeUrl'].rstrip('/') + '/'
+
+        # Matched one path segment at a time ("**" crosses folders), and with
+        # `recursive` against the folders containing the file
+        regex = glob_to_regex(pattern)
+        files = folder.get_files(recursive=recursive or '/' in pattern or '**' in pattern).execute_query()
+        targets = []
+        for remote_file in files:
+            url = remote_file.properties['ServerRelativeUrl']
+            relative_path = url[len(base_url):]
+            candidates = [relative_path]
+            if recursive:
+                segments = relative_path.split('/')
+                candidates += ['/'.join(segments[:i]) for i in range(1, len(segments))]
+            if any(regex.match(candidate) for candidate in candidates):
+                self.env.web.get_file_by_server_relative_url(url).delete_object()
+                targets.append(url)
+
+        if targets:
+            self.env.execute_batch(items_per_batch=batch_size)
+
+        return targets
+
+    def _exists(self, path, folder=False):
+
+        web = self.env.web
+        remote = web.get_folder_by_server_relative_path(path) if folder else web.get_file_by_server_relative_path(path)
+        try:
+            remote.get().execute_query()
+        except (ClientRequestException, FileNotFoundError):
+            return False
+
+        return True
+
+    def _write_key(self, path):
+        return f"sharepoint:{self.site_url}/{path.lstrip('/')}"
\ No newline at end of file
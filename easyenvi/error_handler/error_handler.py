@@ -1,14 +1,22 @@
+import functools
 import re
 
 requirements = {
     "db-dtypes": "db-dtypes>=0.3.0",
     "gcsfs": "gcsfs>=2023.1.0",
-    "google": "google-cloud-bigquery>=3.0.0 google-cloud-storage>=2.0.0",
+    "google": "google-cloud-bigquery>=3.0.0 google-cloud-storage>=2.10.0",
+    "google_crc32c": "google-crc32c>=1.5.0",
+    "google.cloud.bigquery_storage": "google-cloud-bigquery-storage>=2.27.0",
+    "google.cloud.bigquery_storage_v1": "google-cloud-bigquery-storage>=2.27.0",
+    "joblib": "joblib>=1.0.0",
+    "msgpack": "msgpack>=1.0.0",
+    "numpy": "numpy>=1.17.0",
     "office365": "Office365-REST-Python-Client>=2.5.4",
     "openpyxl": "openpyxl>=3.0.7",
     "pandas": "pandas>=1.3.5",
     "PIL": "pillow>=7.0.0",
     "pyarrow": "pyarrow>=3.0.0",
+    "python_calamine": "python-calamine>=0.2.0",
     "PyPDF2": "PyPDF2>=2.5.0",
     "docx": "python-docx>=0.8.0",
     "pptx": "python-pptx>=0.6.0",
@@ -25,6 +33,7 @@ def get_missing_module(error_message: str):
 
 def missing_module_error_handler(func):
 
+    @functools.wraps(func)
     def wrapper(*args,  **kwargs):
 
         try:
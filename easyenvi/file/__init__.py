@@ -1,13 +1,38 @@
 from easyenvi.file.file_manager import(
     save,
     load,
+    register_format,
+    default_registry,
     loader_config,
     saver_config
 )
 
+from easyenvi.file.images import (
+    load_images,
+    save_images
+)
+
+from easyenvi.file.pdf import (
+    PdfDocument,
+    extract_text
+)
+
+from easyenvi.file.registry import (
+    FormatRegistry,
+    sniff_format
+)
+
 __all__ = [
     "save",
     "load",
+    "register_format",
+    "default_registry",
     "loader_config",
-    "saver_config"
+    "saver_config",
+    "load_images",
+    "save_images",
+    "PdfDocument",
+    "extract_text",
+    "FormatRegistry",
+    "sniff_format"
 ]
\ No newline at end of file
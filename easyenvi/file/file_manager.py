@@ -1,13 +1,21 @@
 from easyenvi.file import format_converter
+from easyenvi.file.registry import FormatRegistry
 
 from ..error_handler import missing_module_error_handler
 
 loader_config = {
     'csv':      format_converter.csv_loader,
     'docx':     format_converter.docx_loader,
+    'joblib':   format_converter.joblib_loader,
+    'jpeg':     format_converter.jpg_loader,
     'jpg':      format_converter.jpg_loader,
     'json':     format_converter.json_loader,
+    'jsonl':    format_converter.jsonl_loader,
     'md':       format_converter.md_loader,
+    'msgpack':  format_converter.msgpack_loader,
+    'ndjson':   format_converter.jsonl_loader,
+    'npy':      format_converter.npy_loader,
+    'npz':      format_converter.npz_loader,
     'parquet':  format_converter.parquet_loader,
     'pdf':      format_converter.pdf_loader,
     'pickle':   format_converter.pickle_loader,
@@ -25,9 +33,16 @@ loader_config = {
 saver_config = {
     'csv':      format_converter.csv_saver,
     'docx':     format_converter.docx_saver,
+    'joblib':   format_converter.joblib_saver,
+    'jpeg':     format_converter.jpg_saver,
     'jpg':      format_converter.jpg_saver,
     'json':     format_converter.json_saver,
+    'jsonl':    format_converter.jsonl_saver,
     'md':       format_converter.md_saver,
+    'msgpack':  format_converter.msgpack_saver,
+    'ndjson':   format_converter.jsonl_saver,
+    'npy':      format_converter.npy_saver,
+    'npz':      format_converter.npz_saver,
     'parquet':  format_converter.parquet_saver,
     'pdf':      format_converter.pdf_saver,
     'pickle':   format_converter.pickle_saver,
@@ -42,33 +57,47 @@ saver_config = {
     'yml':      format_converter.yaml_saver
 }
 
+default_registry = FormatRegistry(
+    loaders=loader_config,
+    savers=saver_config,
+    use_entry_points=True
+    )
+
 @missing_module_error_handler
 def load(
         path: str, 
+        format: str | None = None,
         **kwargs
         ):
 
-    extension = path.split('.')[-1]
-
-    if extension not in loader_config:
-        raise ValueError(f"Extension '{extension}' is not currently supported.")
-
-    loader = loader_config[extension]
-
-    return loader(path, **kwargs)
+    return default_registry.load(path, format=format, **kwargs)
 
 @missing_module_error_handler
 def save(
         obj, 
         path: str, 
+        format: str | None = None,
         **kwargs
         ):
 
-    extension = path.split('.')[-1]
+    return default_registry.save(obj, path, format=format, **kwargs)
 
-    if extension not in saver_config:
-        raise ValueError(f"Extension '{extension}' is not currently supported.")
+def register_format(
+        extension: str,
+        loader=None,
+        saver=None
+        ):
+    """
+    Register a loader and/or a saver for an extension, for every environment.
 
-    saver = saver_config[extension]
+    Parameters
+    ----------
+    extension : str
+        extension handled (without the leading dot).
+    loader : callable (optional)
+        function loader(path, **kwargs) returning the object.
+    saver : callable (optional)
+        function saver(obj, path, **kwargs).
+    """
 
-    return saver(obj, path, **kwargs)
\ No newline at end of file
+    default_registry.register(extension, loader=loader, saver=saver)
@@ -1,15 +1,174 @@
+import os
+import re
+
 import fsspec
 
+from easyenvi.file.registry import PICKLE_OOB_MAGIC
+
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+
+# HELPERS
+# Run of digits that may be an integer beyond 64 bits (below -2**63 from 19 digits,
+# above 2**64 - 1 from 20 digits), which orjson reads as a float
+_LONG_INTEGER = re.compile(rb"\d{19}")
+
+def _json_backend():
+    """
+    Return (loads, dumps) functions, dumps returning bytes. orjson is used when
+    installed (several times faster than the standard library), falling back to
+    the standard library where their outputs would differ (NaN and infinities,
+    integers beyond 64 bits, non-str keys), so that results do not depend on it.
+    """
+
+    import json
+
+    def std_dumps(obj):
+        return json.dumps(obj).encode('utf-8')
+
+    try:
+        import orjson
+    except ImportError:
+        return json.loads, std_dumps
+
+    def loads(data):
+        if _LONG_INTEGER.search(data) is None:
+            try:
+                return orjson.loads(data)
+            except orjson.JSONDecodeError:
+                # e.g. NaN / Infinity, accepted by the standard library
+                pass
+        return json.loads(data)
+
+    def dumps(obj):
+        try:
+            data = orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+        except TypeError:
+            # Non-str keys, integers beyond 64 bits
+            return std_dumps(obj)
+        if b"null" in data:
+            # orjson writes NaN and infinities as null
+            try:
+                return std_dumps(obj)
+            except TypeError:
+                # NumPy values, only serializable by orjson
+                return data
+        return data
+
+    return loads, dumps
+
+def _iter_lines(path, buffer_size=DEFAULT_BUFFER_SIZE, **kwargs):
+    # The file is opened eagerly so that it stays readable even if it is removed
+    # (e.g. evicted from a cache) before the iteration starts.
+    f = fsspec.open(path, 'rb', **kwargs).open()
+    return _read_lines(f, buffer_size)
+
+def _read_lines(f, buffer_size):
+    with f:
+        remainder = b""
+        while True:
+            chunk = f.read(buffer_size)
+            if not chunk:
+                break
+            lines = (remainder + chunk).split(b"\n")
+            remainder = lines.pop()
+            yield from lines
+        if remainder:
+            yield remainder
+
+def _text_loader(path, stream=False, buffer_size=DEFAULT_BUFFER_SIZE, **kwargs):
+    if not stream:
+        with fsspec.open(path, 'rt', **kwargs) as f:
+            return f.read()
+
+    return (line.decode('utf-8').rstrip('\r') for line in _iter_lines(path, buffer_size, **kwargs))
+
+def _text_saver(obj, path, buffer_size=DEFAULT_BUFFER_SIZE, **kwargs):
+    if isinstance(obj, str):
+        with fsspec.open(path, 'wt', **kwargs) as f:
+            f.write(obj)
+        return
+
+    # Iterable of lines, written incrementally
+    with fsspec.open(path, 'wb', **kwargs) as f:
+        buffer = bytearray()
+        for line in obj:
+            buffer += line.encode('utf-8')
+            if not line.endswith('\n'):
+                buffer += b"\n"
+            if len(buffer) >= buffer_size:
+                f.write(buffer)
+                buffer.clear()
+        f.write(buffer)
+
 # CSV
-def csv_loader(path, **kwargs):
+# Local files above this size are split into blocks parsed in parallel processes
+# (a gain only with several cores)
+CSV_PARALLEL_MIN_SIZE = 64 * 1024 * 1024
+
+def csv_loader(path, engine=None, dtype=None, usecols=None, sep=',', parallel=False,
+               block_size=CSV_PARALLEL_MIN_SIZE, max_workers=None, **kwargs):
     import pandas as pd
-    
-    with fsspec.open(path, 'rb', **kwargs) as f:
-        return pd.read_csv(f)
 
-def csv_saver(obj, path, **kwargs):
+    options = {'engine': engine, 'dtype': dtype, 'usecols': usecols, 'sep': sep}
+
+    fs, fs_path = fsspec.core.url_to_fs(path, **kwargs)
+    if parallel and isinstance(fs, fsspec.implementations.local.LocalFileSystem) \
+            and os.path.getsize(fs_path) > block_size:
+        return _csv_parallel_load(fs_path, options, block_size, max_workers)
+
+    with fs.open(fs_path, 'rb') as f:
+        return pd.read_csv(f, **options)
+
+def csv_saver(obj, path, index=True, sep=',', **kwargs):
     with fsspec.open(path, 'wb', **kwargs) as f:
-        obj.to_csv(f)
+        obj.to_csv(f, index=index, sep=sep)
+
+def _csv_parallel_load(path, options, block_size, max_workers):
+    # Blocks are cut at line boundaries: fields must not contain line breaks
+    import io
+    import pandas as pd
+    from concurrent.futures import ProcessPoolExecutor
+
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        header = f.readline()
+        offsets = [f.tell()]
+        while offsets[-1] < size:
+            f.seek(min(offsets[-1] + block_size, size))
+            f.readline()
+            offsets.append(f.tell())
+
+    columns = list(pd.read_csv(io.BytesIO(header), sep=options['sep'], nrows=0).columns)
+    blocks = [(path, start, end, columns, options) for start, end in zip(offsets[:-1], offsets[1:]) if end > start]
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        frames = list(executor.map(_csv_parse_block, blocks))
+
+        # Each block infers its own dtypes: columns read as numbers in some blocks
+        # and as strings in others are parsed again as strings, as a single parse would
+        if options['dtype'] is None:
+            mixed = [column for column in columns if _csv_mixed_dtypes(frames, column)]
+            if mixed:
+                options = {**options, 'dtype': {column: str for column in mixed}}
+                blocks = [(path, start, end, columns, options) for path, start, end, columns, _ in blocks]
+                frames = list(executor.map(_csv_parse_block, blocks))
+
+    return pd.concat(frames, ignore_index=True)
+
+def _csv_mixed_dtypes(frames, column):
+    kinds = {frame[column].dtype.kind for frame in frames if column in frame}
+    return 'O' in kinds and bool(kinds & set('iuf'))
+
+def _csv_parse_block(block):
+    import io
+    import pandas as pd
+
+    path, start, end, columns, options = block
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+
+    return pd.read_csv(io.BytesIO(data), header=None, names=columns, **options)
 
 # DOCX
 def docx_loader(path, **kwargs):
@@ -22,6 +181,24 @@ def docx_saver(obj, path, **kwargs):
     with fsspec.open(path, 'wb', **kwargs) as f:
         obj.save(f)
 
+# JOBLIB
+def joblib_loader(path, mmap_mode=None, **kwargs):
+    import joblib
+
+    fs, fs_path = fsspec.core.url_to_fs(path, **kwargs)
+    if mmap_mode is not None and isinstance(fs, fsspec.implementations.local.LocalFileSystem):
+        # Arrays of uncompressed files are memory-mapped instead of read
+        return joblib.load(fs_path, mmap_mode=mmap_mode)
+
+    with fs.open(fs_path, 'rb') as f:
+        return joblib.load(f)
+
+def joblib_saver(obj, path, compress=0, **kwargs):
+    import joblib
+
+    with fsspec.open(path, 'wb', **kwargs) as f:
+        joblib.dump(obj, f, compress=compress)
+
 # JPG
 def jpg_loader(path, **kwargs):
     from PIL import Image
@@ -30,15 +207,19 @@ def jpg_loader(path, **kwargs):
         return Image.open(f).copy()
 
 def jpg_saver(obj, path, **kwargs):
+    if obj.mode not in ('RGB', 'L', 'CMYK'):
+        obj = obj.convert('RGB')
+
+    # Explicit format: remote file objects do not carry the extension PIL relies on
     with fsspec.open(path, 'wb', **kwargs) as f:
-        obj.save(f)
+        obj.save(f, format='JPEG')
 
 # JSON
 def json_loader(path, **kwargs):
-    import json
+    loads, _ = _json_backend()
     
-    with fsspec.open(path, 'rt', **kwargs) as f:
-        return json.load(f)
+    with fsspec.open(path, 'rb', **kwargs) as f:
+        return loads(f.read())
 
 def json_saver(obj, path, **kwargs):
     import json
@@ -46,14 +227,124 @@ def json_saver(obj, path, **kwargs):
     with fsspec.open(path, 'wt', **kwargs) as f:
         json.dump(obj, f)
 
+# JSONL / NDJSON
+def jsonl_loader(path, stream=False, buffer_size=DEFAULT_BUFFER_SIZE, **kwargs):
+    loads, _ = _json_backend()
+
+    records = (loads(line) for line in _iter_lines(path, buffer_size, **kwargs) if line.strip())
+    return records if stream else list(records)
+
+def jsonl_saver(obj, path, buffer_size=DEFAULT_BUFFER_SIZE, **kwargs):
+    _, dumps = _json_backend()
+
+    with fsspec.open(path, 'wb', **kwargs) as f:
+        buffer = bytearray()
+        for record in obj:
+            buffer += dumps(record)
+            buffer += b"\n"
+            if len(buffer) >= buffer_size:
+                f.write(buffer)
+                buffer.clear()
+        f.write(buffer)
+
 # MD
-def md_loader(path, **kwargs):
-    with fsspec.open(path, 'rt', **kwargs) as f:
-        return f.read()
+def md_loader(path, stream=False, buffer_size=DEFAULT_BUFFER_SIZE, **kwargs):
+    return _text_loader(path, stream=stream, buffer_size=buffer_size, **kwargs)
 
-def md_saver(obj, path, **kwargs):
-    with fsspec.open(path, 'wt', **kwargs) as f:
-        f.write(obj)
+def md_saver(obj, path, buffer_size=DEFAULT_BUFFER_SIZE, **kwargs):
+    _text_saver(obj, path, buffer_size=buffer_size, **kwargs)
+
+# MSGPACK
+# Extension type carrying NumPy arrays: header size | [dtype, shape] | raw bytes
+MSGPACK_NDARRAY_EXT = 42
+
+def msgpack_loader(path, stream=False, buffer_size=DEFAULT_BUFFER_SIZE, **kwargs):
+    import msgpack
+
+    if not stream:
+        with fsspec.open(path, 'rb', **kwargs) as f:
+            return msgpack.unpackb(f.read(), ext_hook=_msgpack_ext_hook, raw=False, strict_map_key=False)
+
+    f = fsspec.open(path, 'rb', **kwargs).open()
+    return _iter_msgpack(f, buffer_size)
+
+def msgpack_saver(obj, path, stream=False, **kwargs):
+    import msgpack
+
+    packer = msgpack.Packer(default=_msgpack_default, use_bin_type=True)
+    with fsspec.open(path, 'wb', **kwargs) as f:
+        if not stream:
+            f.write(packer.pack(obj))
+            return
+        # Iterable of objects, packed one after the other
+        for item in obj:
+            f.write(packer.pack(item))
+
+def _iter_msgpack(f, buffer_size):
+    import msgpack
+
+    with f:
+        unpacker = msgpack.Unpacker(f, read_size=buffer_size, ext_hook=_msgpack_ext_hook, raw=False,
+                                    strict_map_key=False, max_buffer_size=0)
+        yield from unpacker
+
+def _msgpack_default(obj):
+    import msgpack
+    import numpy as np
+    import struct
+
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray) and obj.dtype.kind not in 'OV':
+        # C order, keeping the shape of 0-d arrays (unlike np.ascontiguousarray)
+        array = np.require(obj, requirements='C')
+        header = msgpack.packb([array.dtype.str, list(array.shape)])
+        return msgpack.ExtType(MSGPACK_NDARRAY_EXT, struct.pack('<I', len(header)) + header + array.tobytes())
+    raise TypeError(f"Object of type {type(obj).__name__} is not msgpack serializable.")
+
+def _msgpack_ext_hook(code, data):
+    import msgpack
+    import numpy as np
+    import struct
+
+    if code != MSGPACK_NDARRAY_EXT:
+        return msgpack.ExtType(code, data)
+
+    header_size, = struct.unpack_from('<I', data)
+    dtype, shape = msgpack.unpackb(data[4:4 + header_size])
+    # Copied out of the (immutable) bytes so that the array is writeable
+    return np.frombuffer(data, dtype=dtype, offset=4 + header_size).reshape(shape).copy()
+
+# NPY
+def npy_loader(path, mmap_mode=None, **kwargs):
+    import numpy as np
+
+    fs, fs_path = fsspec.core.url_to_fs(path, **kwargs)
+    if mmap_mode is not None and isinstance(fs, fsspec.implementations.local.LocalFileSystem):
+        return np.load(fs_path, mmap_mode=mmap_mode)
+
+    with fs.open(fs_path, 'rb') as f:
+        return np.load(f)
+
+def npy_saver(obj, path, **kwargs):
+    import numpy as np
+
+    with fsspec.open(path, 'wb', **kwargs) as f:
+        np.save(f, np.asarray(obj), allow_pickle=False)
+
+# NPZ
+def npz_loader(path, **kwargs):
+    import numpy as np
+
+    with fsspec.open(path, 'rb', **kwargs) as f, np.load(f) as archive:
+        return dict(archive)
+
+def npz_saver(obj, path, compressed=False, **kwargs):
+    import numpy as np
+
+    save = np.savez_compressed if compressed else np.savez
+    with fsspec.open(path, 'wb', **kwargs) as f:
+        save(f, **obj)
 
 # PARQUET
 def parquet_loader(path, **kwargs):
@@ -67,12 +358,18 @@ def parquet_saver(obj, path, **kwargs):
         obj.to_parquet(f)
 
 # PDF
-def pdf_loader(path, **kwargs):
-    import copy
+def pdf_loader(path, lazy=False, pages=None, **kwargs):
+    import io
     from PyPDF2 import PdfReader
+
+    if lazy or pages is not None:
+        from easyenvi.file.pdf import PdfDocument
+        return PdfDocument(path, pages=pages, **kwargs)
     
+    # The reader parses objects on demand: it keeps an in-memory copy of the bytes
+    # rather than a deep copy of the parsed document
     with fsspec.open(path, 'rb', **kwargs) as f:
-        return copy.deepcopy(PdfReader(f))
+        return PdfReader(io.BytesIO(f.read()))
 
 def pdf_saver(obj, path, **kwargs):
     from PyPDF2 import PdfWriter
@@ -85,17 +382,72 @@ def pdf_saver(obj, path, **kwargs):
         output.write(f)
 
 # PICKLE
+# Container of a protocol 5 pickle and its out-of-band buffers:
+# magic | pickle size, buffer count | buffer sizes | pickle | buffers (64-byte aligned)
+PICKLE_OOB_ALIGNMENT = 64
+
 def pickle_loader(path, **kwargs):
     import pickle
+    import struct
     
     with fsspec.open(path, 'rb', **kwargs) as f:
-        return pickle.load(f)
+        if f.read(len(PICKLE_OOB_MAGIC)) != PICKLE_OOB_MAGIC:
+            f.seek(0)
+            return pickle.load(f)
+
+        pickle_size, buffer_count = struct.unpack('<QQ', f.read(16))
+        buffer_sizes = struct.unpack(f'<{buffer_count}Q', f.read(8 * buffer_count))
+        f.seek(_align(f.tell()))
+        data = f.read(pickle_size)
+
+        # Buffers are read into one writable block, that the unpickled arrays share
+        f.seek(_align(f.tell()))
+        block = bytearray(_align_sizes(buffer_sizes))
+        view = memoryview(block)
+        f.readinto(view)
 
-def pickle_saver(obj, path, **kwargs):
+    buffers, offset = [], 0
+    for size in buffer_sizes:
+        buffers.append(view[offset:offset + size])
+        offset = _align(offset + size)
+
+    return pickle.loads(data, buffers=buffers)
+
+def pickle_saver(obj, path, out_of_band=False, **kwargs):
     import pickle
-    
+    import struct
+
+    if not out_of_band:
+        with fsspec.open(path, 'wb', **kwargs) as f:
+            pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+        return
+
+    # Large contiguous buffers (NumPy arrays, pandas blocks...) are written as is
+    # instead of being copied into the pickle stream
+    buffers = []
+    data = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+    raw_buffers = [buffer.raw() for buffer in buffers]
+
     with fsspec.open(path, 'wb', **kwargs) as f:
-        pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+        header = PICKLE_OOB_MAGIC + struct.pack(f'<QQ{len(raw_buffers)}Q', len(data), len(raw_buffers),
+                                                *(buffer.nbytes for buffer in raw_buffers))
+        written = _write_aligned(f, header, 0)
+        written = _write_aligned(f, data, written)
+        for buffer in raw_buffers:
+            written = _write_aligned(f, buffer, written)
+
+def _align(offset):
+    return -(-offset // PICKLE_OOB_ALIGNMENT) * PICKLE_OOB_ALIGNMENT
+
+def _align_sizes(sizes):
+    return sum(_align(size) for size in sizes)
+
+def _write_aligned(f, data, written):
+    f.write(data)
+    written += memoryview(data).nbytes
+    padding = _align(written) - written
+    f.write(b"\0" * padding)
+    return written + padding
 
 # PPTX
 def pptx_loader(path, **kwargs):
@@ -117,7 +469,7 @@ def png_loader(path, **kwargs):
 
 def png_saver(obj, path, **kwargs):
     with fsspec.open(path, 'wb', **kwargs) as f:
-        obj.save(f)
+        obj.save(f, format='PNG')
 
 # SQL
 def sql_loader(path, **kwargs):
@@ -142,13 +494,11 @@ def toml_saver(obj, path, **kwargs):
         toml.dump(obj, f)
 
 # TXT
-def txt_loader(path, **kwargs):
-    with fsspec.open(path, 'rt', **kwargs) as f:
-        return f.read()
+def txt_loader(path, stream=False, buffer_size=DEFAULT_BUFFER_SIZE, **kwargs):
+    return _text_loader(path, stream=stream, buffer_size=buffer_size, **kwargs)
 
-def txt_saver(obj, path, **kwargs):
-    with fsspec.open(path, 'wt', **kwargs) as f:
-        f.write(obj)
+def txt_saver(obj, path, buffer_size=DEFAULT_BUFFER_SIZE, **kwargs):
+    _text_saver(obj, path, buffer_size=buffer_size, **kwargs)
 
 # XML
 def xml_loader(path, **kwargs):
@@ -167,15 +517,194 @@ def xml_saver(obj, path, **kwargs):
         tree.write(f)
 
 # XLSX
-def xlsx_loader(path, **kwargs):
+def _xlsx_engine():
+    # calamine (Rust) parses workbooks several times faster than openpyxl
+    try:
+        import python_calamine  # noqa: F401
+        import pandas as pd
+        if tuple(int(v) for v in pd.__version__.split('.')[:2]) >= (2, 2):
+            return 'calamine'
+    except ImportError:
+        pass
+    return 'openpyxl'
+
+def _xlsx_iter_rows(f, sheet_name, cell_range, engine):
+    if engine == 'calamine':
+        # calamine reads whole sheets: only used when the rows are loaded in memory anyway
+        from python_calamine import CalamineWorkbook
+
+        workbook = CalamineWorkbook.from_filelike(f)
+        try:
+            sheet = (workbook.get_sheet_by_index(sheet_name) if isinstance(sheet_name, int)
+                     else workbook.get_sheet_by_name(sheet_name))
+            # Same cell conversion as pandas: integral floats to int, empty strings to None
+            rows = (
+                [None if cell == '' else int(cell) if isinstance(cell, float) and cell.is_integer() else cell
+                 for cell in row]
+                for row in sheet.iter_rows()
+            )
+            if cell_range is None:
+                yield from rows
+                return
+
+            from openpyxl.utils.cell import range_boundaries
+
+            min_col, min_row, max_col, max_row = range_boundaries(cell_range)
+            for row_number, row in enumerate(rows, start=1):
+                if max_row is not None and row_number > max_row:
+                    return
+                if row_number >= (min_row or 1):
+                    yield row[(min_col or 1) - 1:max_col]
+        finally:
+            workbook.close()
+        return
+
+    from openpyxl import load_workbook
+    from openpyxl.utils.cell import range_boundaries
+
+    workbook = load_workbook(f, read_only=True, data_only=True)
+    try:
+        sheet = workbook.worksheets[sheet_name] if isinstance(sheet_name, int) else workbook[sheet_name]
+        bounds = dict(zip(['min_col', 'min_row', 'max_col', 'max_row'], range_boundaries(cell_range))) if cell_range else {}
+        yield from sheet.iter_rows(values_only=True, **bounds)
+    finally:
+        workbook.close()
+
+def _xlsx_skip_rows(rows, skiprows):
+    # Same semantics as pandas: number of first rows, row indices, or predicate on the index
+    import itertools
+
+    if skiprows is None:
+        return rows
+    if isinstance(skiprows, int):
+        return itertools.islice(rows, skiprows, None)
+
+    skip = skiprows if callable(skiprows) else set(skiprows).__contains__
+    return (row for index, row in enumerate(rows) if not skip(index))
+
+def _xlsx_usecols(usecols, columns):
+    # Indices of the selected columns, in sheet order as with pandas
+    if usecols is None:
+        return None
+
+    if isinstance(usecols, str):
+        from openpyxl.utils.cell import column_index_from_string
+
+        indices = set()
+        for part in usecols.split(','):
+            first, _, last = part.strip().partition(':')
+            start = column_index_from_string(first.strip())
+            indices.update(range(start - 1, column_index_from_string(last.strip()) if last else start))
+        return sorted(indices)
+
+    if not callable(usecols):
+        usecols = list(usecols)
+        if all(isinstance(column, int) for column in usecols):
+            return sorted(usecols)
+
+    if columns is None:
+        raise ValueError("Selecting columns by name requires header=True.")
+    if callable(usecols):
+        return [index for index, name in enumerate(columns) if usecols(name)]
+
+    missing = [column for column in usecols if column not in columns]
+    if missing:
+        raise ValueError(f"usecols do not match columns: {missing}")
+    return [index for index, name in enumerate(columns) if name in usecols]
+
+def _xlsx_iter_chunks(f, sheet_name, cell_range, header, chunk_size, engine,
+                      usecols=None, skiprows=None, nrows=None):
+    import itertools
+
+    import pandas as pd
+
+    with f:
+        sheet_rows = _xlsx_iter_rows(f, sheet_name, cell_range, engine)
+        try:
+            rows = _xlsx_skip_rows(sheet_rows, skiprows)
+            columns = None
+            if header:
+                columns = [
+                    f"Unnamed: {i}" if name is None or name != name else name
+                    for i, name in enumerate(next(rows, []))
+                ]
+
+            indices = _xlsx_usecols(usecols, columns)
+            if indices is not None:
+                if columns is not None:
+                    columns = [columns[i] for i in indices if i < len(columns)]
+                rows = ([row[i] if i < len(row) else None for i in indices] for row in rows)
+            if nrows is not None:
+                rows = itertools.islice(rows, nrows)
+
+            chunk = []
+            for row in rows:
+                chunk.append(row)
+                if len(chunk) >= chunk_size:
+                    yield pd.DataFrame(chunk, columns=columns)
+                    chunk = []
+            if chunk or columns is not None:
+                yield pd.DataFrame(chunk, columns=columns)
+        finally:
+            sheet_rows.close()
+
+def xlsx_loader(path, sheet_name=0, usecols=None, skiprows=None, nrows=None, engine=None,
+                stream=False, cell_range=None, header=True, chunk_size=10000, **kwargs):
+    import weakref
+
     import pandas as pd
+
+    if stream:
+        # Row by row reading needs openpyxl read-only mode: calamine loads whole sheets
+        if engine not in (None, 'openpyxl'):
+            raise ValueError("stream=True requires engine='openpyxl'.")
+        engine = 'openpyxl'
+    engine = engine or _xlsx_engine()
+
+    if stream or cell_range is not None:
+        f = fsspec.open(path, 'rb', **kwargs).open()
+        chunks = _xlsx_iter_chunks(f, sheet_name, cell_range, header, chunk_size, engine,
+                                   usecols=usecols, skiprows=skiprows, nrows=nrows)
+        # Closed by the generator once exhausted or closed, or when it is collected unstarted
+        weakref.finalize(chunks, f.close)
+        if stream:
+            return chunks
+        return pd.concat(list(chunks), ignore_index=True)
     
     with fsspec.open(path, 'rb', **kwargs) as f:
-        return pd.read_excel(f)
+        return pd.read_excel(f, sheet_name=sheet_name, usecols=usecols, skiprows=skiprows,
+                             nrows=nrows, header=0 if header else None, engine=engine)
+
+def xlsx_saver(obj, path, index=True, sheet_name='Sheet1', **kwargs):
+    import pandas as pd
+
+    if isinstance(obj, dict):
+        # One sheet per key
+        with fsspec.open(path, 'wb', **kwargs) as f, pd.ExcelWriter(f, engine='openpyxl') as writer:
+            for name, df in obj.items():
+                df.to_excel(writer, sheet_name=name, index=index)
+        return
+
+    if isinstance(obj, pd.DataFrame):
+        with fsspec.open(path, 'wb', **kwargs) as f:
+            obj.to_excel(f, index=index, sheet_name=sheet_name)
+        return
+
+    # Iterable of DataFrames: streamed in write-only mode (the index is not written)
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(sheet_name)
+    header_written = False
+    for df in obj:
+        if not header_written:
+            sheet.append([str(column) for column in df.columns])
+            header_written = True
+        for row in df.itertuples(index=False, name=None):
+            sheet.append(row)
 
-def xlsx_saver(obj, path, **kwargs):
     with fsspec.open(path, 'wb', **kwargs) as f:
-        obj.to_excel(f)
+        workbook.save(f)
 
 # YAML
 def yaml_loader(path, **kwargs):
@@ -0,0 +1,172 @@
+import io
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import fsspec
+
+IMAGE_FORMATS = {
+    'jpg': 'JPEG',
+    'jpeg': 'JPEG',
+    'png': 'PNG',
+}
+
+def load_images(
+        paths: list,
+        size: tuple | None = None,
+        mode: str = 'RGB',
+        draft: bool = True,
+        normalize: bool = False,
+        mean: tuple | None = None,
+        std: tuple | None = None,
+        max_workers: int = 8,
+        **kwargs
+        ):
+    """
+    Load images in parallel into a single NumPy array of shape (N, H, W, C).
+
+    Parameters
+    ----------
+    paths : list
+        paths (local or remote) of the images.
+    size : tuple (optional)
+        (width, height) every image is resized to. Required if the images do not
+        all have the same size.
+    mode : str
+        PIL mode the images are converted to ("RGB", "L", "RGBA"...). Default is "RGB".
+    draft : bool
+        whether to let the JPEG decoder downscale while decoding when `size` is
+        smaller than the image (much faster). Default is True.
+    normalize : bool
+        whether to return float32 values in [0, 1] instead of uint8. Default is False.
+    mean : tuple (optional)
+        per-channel mean subtracted after normalization.
+    std : tuple (optional)
+        per-channel standard deviation dividing after normalization.
+    max_workers : int
+        number of threads reading and decoding images. Default is 8.
+    kwargs
+        storage options forwarded to `fsspec.open`.
+    """
+
+    import numpy as np
+
+    paths = list(paths)
+    if not paths:
+        raise ValueError("No image to load.")
+
+    def decode(path):
+        return _decode_image(path, size=size, mode=mode, draft=draft, **kwargs)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(decode, path) for path in paths]
+
+        first = futures[0].result()
+        output = np.empty((len(paths),) + first.shape, dtype=first.dtype)
+        output[0] = first
+
+        for i, future in enumerate(futures[1:], start=1):
+            image = future.result()
+            if image.shape != first.shape:
+                raise ValueError(
+                    f"Image '{paths[i]}' has shape {image.shape} instead of {first.shape}: specify `size`."
+                )
+            output[i] = image
+
+    if normalize or mean is not None or std is not None:
+        output = output.astype(np.float32)
+        if normalize:
+            output /= 255.0
+        if mean is not None:
+            output -= np.asarray(mean, dtype=np.float32)
+        if std is not None:
+            output /= np.asarray(std, dtype=np.float32)
+
+    return output
+
+def save_images(
+        images,
+        paths: list,
+        use_processes: bool = True,
+        max_workers: int | None = None,
+        **kwargs
+        ):
+    """
+    Encode images in a process pool and write them in parallel. The format of each
+    image is given by the extension of its path (jpg, jpeg or png).
+
+    Parameters
+    ----------
+    images : numpy.ndarray or list
+        array of shape (N, H, W, C) or (N, H, W), or list of PIL images / arrays.
+    paths : list
+        paths (local or remote) to save to.
+    use_processes : bool
+        whether to encode in a process pool (True) or a thread pool (False). Default is True.
+    max_workers : int (optional)
+        number of encoding workers. Default is the number of CPUs.
+    kwargs
+        storage options forwarded to `fsspec.open`.
+    """
+
+    from easyenvi.file.registry import get_extension
+
+    paths = list(paths)
+    if len(images) != len(paths):
+        raise ValueError(f"Got {len(images)} images for {len(paths)} paths.")
+
+    formats = []
+    for path in paths:
+        extension = (get_extension(path) or '').lower()
+        if extension not in IMAGE_FORMATS:
+            raise ValueError(f"Extension '{extension}' is not a supported image format.")
+        formats.append(IMAGE_FORMATS[extension])
+
+    executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    with executor_class(max_workers=max_workers) as encoder, ThreadPoolExecutor(max_workers=8) as writer:
+        writes = [
+            writer.submit(_write_bytes, path, encoded, **kwargs)
+            for path, encoded in zip(paths, encoder.map(_encode_image, list(images), formats))
+        ]
+        for write in writes:
+            write.result()
+
+def _decode_image(path, size, mode, draft, **kwargs):
+    import numpy as np
+    from PIL import Image
+
+    with fsspec.open(path, 'rb', **kwargs) as f:
+        data = f.read()
+
+    with Image.open(io.BytesIO(data)) as image:
+        if draft and size is not None and image.format == 'JPEG':
+            # Decoder-side downscaling by a power of two, never below `size`
+            image.draft(mode, size)
+        image = image.convert(mode)
+        if size is not None and image.size != tuple(size):
+            image = image.resize(tuple(size), Image.BILINEAR)
+
+        array = np.asarray(image)
+
+    return array[..., None] if array.ndim == 2 else array
+
+def _encode_image(image, format):
+    from PIL import Image
+
+    if not isinstance(image, Image.Image):
+        import numpy as np
+
+        array = np.asarray(image)
+        if array.ndim == 3 and array.shape[-1] == 1:
+            array = array[..., 0]
+        image = Image.fromarray(array)
+
+    if format == 'JPEG' and image.mode not in ('RGB', 'L', 'CMYK'):
+        image = image.convert('RGB')
+
+    buffer = io.BytesIO()
+    image.save(buffer, format=format)
+    return buffer.getvalue()
+
+def _write_bytes(path, data, **kwargs):
+    with fsspec.open(path, 'wb', **kwargs) as f:
+        f.write(data)
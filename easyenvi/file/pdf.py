@@ -0,0 +1,178 @@
+import mmap
+import os
+
+from concurrent.futures import ProcessPoolExecutor
+
+import fsspec
+
+REMOTE_BLOCK_SIZE = 1024 * 1024
+
+class PdfDocument:
+    """
+    PDF parsed lazily: the byte source stays open (memory-mapped for local files,
+    range reads through a block cache for remote ones) and pages are only parsed
+    when accessed. Close it (or use it as a context manager) when done.
+
+    Parameters
+    ----------
+    path : str
+        path (local or remote) of the PDF.
+    pages : int, slice, range or list (optional)
+        pages (0-based) exposed by the document. Default is every page.
+    kwargs
+        storage options forwarded to fsspec.
+    """
+
+    def __init__(
+            self,
+            path: str,
+            pages=None,
+            **kwargs
+            ):
+        from PyPDF2 import PdfReader
+
+        self.path = path
+        self.storage_options = kwargs
+
+        fs, fs_path = fsspec.core.url_to_fs(path, **kwargs)
+        self._file = None
+        self._mmap = None
+        try:
+            if isinstance(fs, fsspec.implementations.local.LocalFileSystem) and os.path.getsize(fs_path) > 0:
+                self._file = open(fs_path, 'rb')
+                self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+                stream = self._mmap
+            else:
+                self._file = fs.open(fs_path, 'rb', block_size=REMOTE_BLOCK_SIZE, cache_type='blockcache')
+                stream = self._file
+
+            self.reader = PdfReader(stream)
+            self.page_indices = _select_pages(pages, len(self.reader.pages))
+        except BaseException:
+            # Invalid PDF or page selection: nothing stays open
+            self.close()
+            raise
+
+    @property
+    def pages(self):
+        """
+        Selected pages, parsed on access.
+        """
+
+        return _PageView(self.reader, self.page_indices)
+
+    def extract_text(self, max_workers: int | None = None):
+        """
+        Extract the text of the selected pages, in parallel processes.
+
+        Parameters
+        ----------
+        max_workers : int (optional)
+            number of processes. Default is the number of CPUs.
+        """
+
+        return extract_text(self.path, pages=self.page_indices, max_workers=max_workers, **self.storage_options)
+
+    def close(self):
+        """
+        Close the underlying byte source.
+        """
+
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+
+    def __len__(self):
+        return len(self.page_indices)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class _PageView:
+
+    def __init__(self, reader, indices):
+        self._reader = reader
+        self._indices = indices
+
+    def __len__(self):
+        return len(self._indices)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._reader.pages[index] for index in self._indices[i]]
+        return self._reader.pages[self._indices[i]]
+
+    def __iter__(self):
+        for index in self._indices:
+            yield self._reader.pages[index]
+
+def extract_text(
+        paths,
+        pages=None,
+        max_workers: int | None = None,
+        pages_per_task: int = 16,
+        **kwargs
+        ):
+    """
+    Extract the text of PDF pages in parallel processes, across pages and across
+    documents. Returns the list of page texts for a single path, or one such list
+    per path.
+
+    Parameters
+    ----------
+    paths : str or list
+        path(s) (local or remote) of the PDF(s).
+    pages : int, slice, range or list (optional)
+        pages (0-based) to extract, in every document. Default is every page.
+    max_workers : int (optional)
+        number of processes. Default is the number of CPUs.
+    pages_per_task : int
+        number of pages extracted by a process at once. Default is 16.
+    kwargs
+        storage options forwarded to fsspec.
+    """
+
+    single = isinstance(paths, str)
+    paths = [paths] if single else list(paths)
+
+    tasks = []
+    for document_index, path in enumerate(paths):
+        with PdfDocument(path, pages=pages, **kwargs) as document:
+            indices = document.page_indices
+        for start in range(0, len(indices), pages_per_task):
+            tasks.append((document_index, path, indices[start:start + pages_per_task]))
+
+    texts = [[] for _ in paths]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(_extract_pages, [(path, indices, kwargs) for _, path, indices in tasks])
+        for (document_index, _, _), chunk in zip(tasks, results):
+            texts[document_index].extend(chunk)
+
+    return texts[0] if single else texts
+
+def _extract_pages(task):
+
+    path, indices, kwargs = task
+    with PdfDocument(path, pages=indices, **kwargs) as document:
+        return [page.extract_text() for page in document.pages]
+
+def _select_pages(pages, num_pages):
+
+    if pages is None:
+        return list(range(num_pages))
+    if isinstance(pages, int):
+        pages = [pages]
+    elif isinstance(pages, slice):
+        pages = range(num_pages)[pages]
+
+    indices = [page + num_pages if page < 0 else page for page in pages]
+    for index in indices:
+        if not 0 <= index < num_pages:
+            raise IndexError(f"Page {index} out of range (document has {num_pages} pages).")
+
+    return indices
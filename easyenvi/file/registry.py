@@ -0,0 +1,277 @@
+import codecs
+import json
+import posixpath
+import zipfile
+
+import fsspec
+
+LOADER_ENTRY_POINT_GROUP = "easyenvi.loaders"
+SAVER_ENTRY_POINT_GROUP = "easyenvi.savers"
+
+# Header of the pickle container with out-of-band buffers (see pickle_saver)
+PICKLE_OOB_MAGIC = b"EZPKOOB5"
+
+# Signatures checked against the first bytes of an extensionless file
+# (ordered: the first matching prefix wins)
+MAGIC_NUMBERS = [
+    (b"\x89PNG\r\n\x1a\n",  'png'),
+    (b"\xff\xd8\xff",       'jpg'),
+    (b"%PDF-",              'pdf'),
+    (b"PAR1",               'parquet'),
+    (b"<?xml",              'xml'),
+    (b"\x93NUMPY",          'npy'),
+    (PICKLE_OOB_MAGIC,      'pickle'),
+]
+
+# Members identifying the Office Open XML flavour of a zip archive
+ZIP_MARKERS = [
+    ("word/",   'docx'),
+    ("ppt/",    'pptx'),
+    ("xl/",     'xlsx'),
+]
+
+SNIFF_SIZE = 2048
+
+def get_extension(path: str):
+    """
+    Return the extension of a path, or None if its last component has none.
+
+    Parameters
+    ----------
+    path : str
+        path (local or remote) of the file.
+    """
+
+    name = posixpath.basename(path.replace('\\', '/'))
+    if '.' not in name.lstrip('.'):
+        return None
+    return name.rsplit('.', 1)[-1]
+
+def sniff_format(path: str, **kwargs):
+    """
+    Guess the format of a file from its first bytes.
+
+    Parameters
+    ----------
+    path : str
+        path (local or remote) of the file.
+    kwargs
+        storage options forwarded to `fsspec.open`.
+    """
+
+    with fsspec.open(path, 'rb', **kwargs) as f:
+        head = f.read(SNIFF_SIZE)
+
+        for signature, extension in MAGIC_NUMBERS:
+            if head.startswith(signature):
+                return extension
+
+        if head.startswith(b"PK\x03\x04"):
+            f.seek(0)
+            with zipfile.ZipFile(f) as archive:
+                names = archive.namelist()
+            for marker, extension in ZIP_MARKERS:
+                if any(name.startswith(marker) for name in names):
+                    return extension
+            if names and all(name.endswith('.npy') for name in names):
+                return 'npz'
+            return None
+
+    if head[:1] == b"\x80" and head[1:2] in (b"\x02", b"\x03", b"\x04", b"\x05"):
+        return 'pickle'
+
+    try:
+        # Not final: a multi-byte character cut by the end of the head is not an error
+        text = codecs.getincrementaldecoder('utf-8')().decode(head, final=False).lstrip('\ufeff \t\r\n')
+    except UnicodeDecodeError:
+        return None
+
+    if text.startswith('{'):
+        lines = text.splitlines()
+        if len(lines) > 1 and lines[1].lstrip().startswith('{'):
+            try:
+                json.loads(lines[0])
+                return 'jsonl'
+            except ValueError:
+                pass
+    if text.startswith(('{', '[')):
+        return 'json'
+    if text.startswith('<'):
+        return 'xml'
+    return 'txt'
+
+class FormatRegistry:
+    """
+    Maps file extensions to loaders and savers.
+
+    A registry first looks at its own handlers, then at its parent registry. The
+    default registry (`easyenvi.file.default_registry`) is backed by
+    `loader_config` / `saver_config` and falls back on handlers published by
+    third-party packages through the `easyenvi.loaders` and `easyenvi.savers`
+    entry point groups, e.g. in a `pyproject.toml`:
+
+        [project.entry-points."easyenvi.loaders"]
+        feather = "my_package.formats:feather_loader"
+
+    Parameters
+    ----------
+    loaders : dict (optional)
+        Mapping extension -> loader(path, **kwargs).
+    savers : dict (optional)
+        Mapping extension -> saver(obj, path, **kwargs).
+    parent : FormatRegistry (optional)
+        Registry consulted for extensions this one does not handle.
+    use_entry_points : bool
+        Whether to look up handlers in the installed entry points. Default is False.
+    """
+
+    def __init__(
+            self,
+            loaders: dict | None = None,
+            savers: dict | None = None,
+            parent: "FormatRegistry | None" = None,
+            use_entry_points: bool = False
+            ):
+
+        self.loaders = loaders if loaders is not None else {}
+        self.savers = savers if savers is not None else {}
+        self.parent = parent
+        self.use_entry_points = use_entry_points
+
+        self._entry_points = {}
+        self._resolved_entry_points = {}
+
+    def register(
+            self,
+            extension: str,
+            loader=None,
+            saver=None
+            ):
+        """
+        Register a loader and/or a saver for an extension.
+
+        Parameters
+        ----------
+        extension : str
+            extension handled (without the leading dot).
+        loader : callable (optional)
+            function loader(path, **kwargs) returning the object.
+        saver : callable (optional)
+            function saver(obj, path, **kwargs).
+        """
+
+        extension = extension.lstrip('.')
+        if loader is not None:
+            self.loaders[extension] = loader
+        if saver is not None:
+            self.savers[extension] = saver
+
+    def get_loader(self, extension: str):
+        """
+        Return the loader registered for an extension, or None.
+        """
+
+        return self._resolve('loaders', LOADER_ENTRY_POINT_GROUP, extension)
+
+    def get_saver(self, extension: str):
+        """
+        Return the saver registered for an extension, or None.
+        """
+
+        return self._resolve('savers', SAVER_ENTRY_POINT_GROUP, extension)
+
+    def load(
+            self,
+            path: str,
+            format: str | None = None,
+            **kwargs
+            ):
+        """
+        Load a file with the loader matching its extension. Files without an
+        extension are identified from their first bytes.
+
+        Parameters
+        ----------
+        path : str
+            path to load from.
+        format : str (optional)
+            extension to use instead of the one of the path.
+        """
+
+        extension = format or get_extension(path) or sniff_format(path, **kwargs)
+
+        loader = self.get_loader(extension) if extension is not None else None
+        if loader is None:
+            raise ValueError(f"Extension '{extension}' is not currently supported.")
+
+        return loader(path, **kwargs)
+
+    def save(
+            self,
+            obj,
+            path: str,
+            format: str | None = None,
+            **kwargs
+            ):
+        """
+        Save an object with the saver matching the extension of the path.
+
+        Parameters
+        ----------
+        obj
+            object to save.
+        path : str
+            path to save to.
+        format : str (optional)
+            extension to use instead of the one of the path. Required when the
+            path has no extension.
+        """
+
+        extension = format or get_extension(path)
+        if extension is None:
+            raise ValueError(f"Cannot infer the format of '{path}': specify `format`.")
+
+        saver = self.get_saver(extension)
+        if saver is None:
+            raise ValueError(f"Extension '{extension}' is not currently supported.")
+
+        return saver(obj, path, **kwargs)
+
+    def _resolve(self, kind, group, extension):
+
+        handler = getattr(self, kind).get(extension)
+        if handler is not None:
+            return handler
+
+        if self.parent is not None:
+            handler = self.parent._resolve(kind, group, extension)
+            if handler is not None:
+                return handler
+
+        if self.use_entry_points:
+            return self._resolve_entry_point(group, extension)
+
+        return None
+
+    def _resolve_entry_point(self, group, extension):
+
+        key = (group, extension)
+        if key in self._resolved_entry_points:
+            return self._resolved_entry_points[key]
+
+        if group not in self._entry_points:
+            self._entry_points[group] = {ep.name: ep for ep in _iter_entry_points(group)}
+
+        entry_point = self._entry_points[group].get(extension)
+        handler = entry_point.load() if entry_point is not None else None
+        self._resolved_entry_points[key] = handler
+
+        return handler
+
+def _iter_entry_points(group):
+    from importlib.metadata import entry_points
+
+    eps = entry_points()
+    if hasattr(eps, 'select'):
+        return eps.select(group=group)
+    return eps.get(group, [])
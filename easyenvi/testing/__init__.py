@@ -0,0 +1,15 @@
+from .bigquery import FakeBigQuery, FakeBigQueryClient
+from .gcs import FakeGCS, FakeGCSFileSystem, FakeStorageClient
+from .sharepoint import FakeClientContext, FakeSharePoint
+from .throttle import Throttle
+
+__all__ = [
+    "FakeBigQuery",
+    "FakeBigQueryClient",
+    "FakeClientContext",
+    "FakeGCS",
+    "FakeGCSFileSystem",
+    "FakeSharePoint",
+    "FakeStorageClient",
+    "Throttle"
+]
\ No newline at end of file
@@ -0,0 +1,460 @@
+import datetime
+import os
+import re
+import sqlite3
+import time
+
+from contextlib import closing
+
+from easyenvi.testing.throttle import Throttle
+
+DEFAULT_PAGE_SIZE = 100000
+METADATA_TABLE = "__tables__"
+
+# String literals, quoted identifiers, array parameters and parameters, in that order
+SQL_TOKENS = re.compile(
+    r"(?P<string>'(?:\\.|[^'\\])*')"
+    r"|(?P<dstring>\"(?:\\.|[^\"\\])*\")"
+    r"|`(?P<identifier>[^`]*)`"
+    r"|UNNEST\s*\(\s*@(?P<array>\w+)\s*\)"
+    r"|@(?P<param>\w+)",
+    re.IGNORECASE
+)
+DOTTED_NAME = re.compile(r"\b([A-Za-z_][\w-]*)\.([A-Za-z_]\w*)(?:\.([A-Za-z_]\w*))?\b")
+
+class FakeBigQuery:
+    """
+    In-process stand-in for Big Query, backed by SQLite: each data set is a
+    SQLite database (`<root>/<dataset>.sqlite`), attached under its name so that
+    "dataset.table" references resolve. It provides a client replacing
+    `google.cloud.bigquery.Client` for queries (named and array parameters,
+    dry runs, bytes-billed limits, paged results) and load jobs.
+
+    Queries must use the SQL subset shared by Big Query and SQLite; backquoted
+    table paths and "project.dataset.table" references are translated. The
+    bytes scanned by a query are estimated from the in-memory size of the tables
+    it reads, recorded when they are loaded. The Storage Write API
+    (`BQ.stream_append`) is not emulated.
+
+    Parameters
+    ----------
+    root : str
+        directory holding the data sets.
+    project_id : str
+        ID of the emulated project. Default is "fake-project".
+    latency : float
+        Time (seconds) added to every request (query, page of results, load job). Default is 0.
+    bandwidth : float (optional)
+        Throughput (bytes per second) of result pages and loaded tables. Default is None (unlimited).
+
+    Examples
+    --------
+    backend = FakeBigQuery("tests/fake_bq", latency=0.1)
+    bq = backend.attach(BQ(project_id="fake-project"))
+    bq.write(df, "mydata.mytable")
+    """
+
+    def __init__(
+            self,
+            root: str,
+            project_id: str = "fake-project",
+            latency: float = 0.0,
+            bandwidth: float | None = None
+            ):
+
+        self.root = os.path.abspath(root)
+        self.project_id = project_id
+        self.throttle = Throttle(latency=latency, bandwidth=bandwidth)
+
+        os.makedirs(self.root, exist_ok=True)
+
+    def client(self):
+        """
+        Client replacing `google.cloud.bigquery.Client`.
+        """
+
+        return FakeBigQueryClient(self)
+
+    def attach(self, env):
+        """
+        Make a `BQ` environment use this backend. Returns the environment.
+
+        Parameters
+        ----------
+        env : BQ
+            environment to attach.
+        """
+
+        env._bq_client = self.client()
+        return env
+
+    @property
+    def stats(self):
+        """
+        Requests sent and bytes read / written.
+        """
+
+        return self.throttle.stats
+
+    def datasets(self):
+        """
+        Names of the data sets.
+        """
+
+        return sorted(name[:-len(".sqlite")] for name in os.listdir(self.root) if name.endswith(".sqlite"))
+
+    def connect(self):
+        """
+        SQLite connection with every data set attached.
+        """
+
+        connection = sqlite3.connect(":memory:", check_same_thread=False)
+        for dataset in self.datasets():
+            connection.execute("ATTACH DATABASE ? AS " + _quote(dataset), (self._dataset_path(dataset),))
+
+        return connection
+
+    def table_metadata(self, dataset: str, table: str):
+        """
+        (modified timestamp, number of rows, size in bytes) of a table, or None
+        if it does not exist.
+        """
+
+        if dataset not in self.datasets():
+            return None
+
+        with closing(sqlite3.connect(self._dataset_path(dataset))) as connection:
+            exists = connection.execute(
+                "SELECT 1 FROM sqlite_master WHERE type IN ('table', 'view') AND name = ?", (table,)
+            ).fetchone()
+            if exists is None:
+                return None
+            _create_metadata_table(connection)
+            row = connection.execute(
+                f"SELECT modified, num_rows, num_bytes FROM {METADATA_TABLE} WHERE name = ?", (table,)
+            ).fetchone()
+
+        return row if row is not None else (None, None, 0)
+
+    def load_dataframe(
+            self,
+            obj,
+            dataset: str,
+            table: str,
+            write_disposition: str | None = None
+            ):
+        """
+        Write a pandas.DataFrame into a table. Returns the number of rows loaded.
+
+        Parameters
+        ----------
+        obj : pandas.DataFrame
+            rows to load.
+        dataset : str
+            data set of the table (created if needed).
+        table : str
+            name of the table.
+        write_disposition : str (optional)
+            "WRITE_TRUNCATE", "WRITE_EMPTY" or "WRITE_APPEND". Default is "WRITE_APPEND".
+        """
+
+        write_disposition = write_disposition or "WRITE_APPEND"
+        num_bytes = int(obj.memory_usage(index=False, deep=True).sum())
+
+        with closing(sqlite3.connect(self._dataset_path(dataset))) as connection, connection:
+            _create_metadata_table(connection)
+            exists = connection.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+            ).fetchone() is not None
+
+            if exists and write_disposition == "WRITE_EMPTY":
+                from google.api_core.exceptions import Conflict
+                raise Conflict(f"Table {dataset}.{table} already exists (WRITE_EMPTY).")
+
+            if_exists = "replace" if write_disposition == "WRITE_TRUNCATE" else "append"
+            obj.to_sql(table, connection, if_exists=if_exists, index=False)
+
+            previous = connection.execute(
+                f"SELECT num_rows, num_bytes FROM {METADATA_TABLE} WHERE name = ?", (table,)
+            ).fetchone()
+            num_rows = len(obj)
+            if previous is not None and if_exists == "append":
+                num_rows, num_bytes = num_rows + previous[0], num_bytes + previous[1]
+            connection.execute(
+                f"INSERT OR REPLACE INTO {METADATA_TABLE} VALUES (?, ?, ?, ?)",
+                (table, time.time(), num_rows, num_bytes)
+            )
+
+        return len(obj)
+
+    def _dataset_path(self, dataset):
+        return os.path.join(self.root, f"{dataset}.sqlite")
+
+class FakeBigQueryClient:
+    """
+    Client of a `FakeBigQuery` backend, replacing `google.cloud.bigquery.Client`.
+    """
+
+    def __init__(self, backend: FakeBigQuery):
+        self.backend = backend
+        self.project = backend.project_id
+
+    def query(self, query: str, job_config=None, **kwargs):
+
+        from google.api_core.exceptions import BadRequest
+
+        self.backend.throttle.request()
+
+        sql, params, references = self._translate(query, getattr(job_config, 'query_parameters', None) or [])
+        with closing(self.backend.connect()) as connection:
+            try:
+                connection.execute("EXPLAIN " + sql, params)
+            except sqlite3.Error as error:
+                raise BadRequest(f"Invalid query: {error}")
+
+        total_bytes = 0
+        for reference in references:
+            metadata = self.backend.table_metadata(reference.dataset_id, reference.table_id)
+            total_bytes += metadata[2] if metadata is not None else 0
+
+        maximum_bytes_billed = getattr(job_config, 'maximum_bytes_billed', None)
+        if maximum_bytes_billed is not None and total_bytes > maximum_bytes_billed:
+            raise BadRequest(f"Query exceeded limit for bytes billed: {maximum_bytes_billed}.")
+
+        return FakeQueryJob(self, sql, params, references, total_bytes, dry_run=bool(getattr(job_config, 'dry_run', False)))
+
+    def get_table(self, table):
+
+        from google.api_core.exceptions import NotFound
+
+        self.backend.throttle.request()
+        reference = table if isinstance(table, FakeTableReference) else self._reference(str(table))
+        metadata = self.backend.table_metadata(reference.dataset_id, reference.table_id)
+        if metadata is None:
+            raise NotFound(f"Not found: Table {reference}")
+
+        return FakeTable(reference, *metadata)
+
+    def load_table_from_dataframe(self, dataframe, destination, job_config=None, **kwargs):
+
+        reference = self._reference(str(destination))
+        write_disposition = getattr(job_config, 'write_disposition', None)
+
+        self.backend.throttle.request()
+        self.backend.throttle.transfer(int(dataframe.memory_usage(index=False, deep=True).sum()), upload=True)
+        num_rows = self.backend.load_dataframe(dataframe, reference.dataset_id, reference.table_id,
+                                               write_disposition=write_disposition)
+
+        return FakeLoadJob(reference, num_rows)
+
+    def close(self):
+        pass
+
+    def _reference(self, path):
+
+        parts = path.replace(':', '.').split('.')
+        if len(parts) == 2:
+            parts = [self.project] + parts
+        if len(parts) != 3:
+            raise ValueError(f"Invalid table path '{path}'.")
+
+        return FakeTableReference(*parts)
+
+    def _translate(self, query, query_parameters):
+        # Big Query SQL -> SQLite SQL, named parameters and referenced tables
+
+        values = {}
+        for parameter in query_parameters:
+            if hasattr(parameter, 'values'):
+                values[parameter.name] = list(parameter.values)
+            else:
+                values[parameter.name] = _sqlite_value(parameter.value)
+
+        params, references = {}, {}
+        datasets = set(self.backend.datasets())
+
+        def reference(parts):
+            if len(parts) == 3 and parts[0] == self.project:
+                parts = parts[1:]
+            if len(parts) == 2 and parts[0] in datasets:
+                table = FakeTableReference(self.project, *parts)
+                references[str(table)] = table
+            return parts
+
+        def replace(match):
+            if match.group('string') is not None:
+                return match.group('string')
+            if match.group('dstring') is not None:
+                return "'" + match.group('dstring')[1:-1].replace("'", "''") + "'"
+            if match.group('identifier') is not None:
+                return ".".join(_quote(part) for part in reference(match.group('identifier').split('.')))
+            if match.group('array') is not None:
+                name = match.group('array')
+                names = [f"{name}_{i}" for i in range(len(values[name]))]
+                params.update({key: _sqlite_value(value) for key, value in zip(names, values[name])})
+                return "(" + ", ".join(f":{key}" for key in names) + ")" if names else "(NULL)"
+            name = match.group('param')
+            params[name] = values[name]
+            return f":{name}"
+
+        def replace_names(match):
+            parts = [part for part in match.groups() if part is not None]
+            return ".".join(reference(parts)) if len(parts) == 3 or parts[0] in datasets else match.group(0)
+
+        # Unquoted dotted names are translated outside of literals only
+        pieces, last = [], 0
+        for match in SQL_TOKENS.finditer(query):
+            pieces.append(DOTTED_NAME.sub(replace_names, query[last:match.start()]))
+            pieces.append(replace(match))
+            last = match.end()
+        pieces.append(DOTTED_NAME.sub(replace_names, query[last:]))
+
+        return "".join(pieces), params, list(references.values())
+
+class FakeTableReference:
+
+    def __init__(self, project, dataset_id, table_id):
+        self.project = project
+        self.dataset_id = dataset_id
+        self.table_id = table_id
+
+    def __str__(self):
+        return f"{self.project}.{self.dataset_id}.{self.table_id}"
+
+    def __repr__(self):
+        return f"FakeTableReference('{self}')"
+
+class FakeTable:
+
+    def __init__(self, reference, modified, num_rows, num_bytes):
+        self.reference = reference
+        self.project = reference.project
+        self.dataset_id = reference.dataset_id
+        self.table_id = reference.table_id
+        self.full_table_id = f"{reference.project}:{reference.dataset_id}.{reference.table_id}"
+        self.modified = (
+            datetime.datetime.fromtimestamp(modified, tz=datetime.timezone.utc) if modified is not None else None
+        )
+        self.num_rows = num_rows
+        self.num_bytes = num_bytes
+        self.streaming_buffer = None
+
+class FakeLoadJob:
+
+    def __init__(self, destination, output_rows):
+        self.destination = destination
+        self.output_rows = output_rows
+        self.state = "DONE"
+
+    def result(self, *args, **kwargs):
+        return self
+
+class FakeQueryJob:
+
+    def __init__(self, client, sql, params, references, total_bytes_processed, dry_run=False):
+        self._client = client
+        self._sql = sql
+        self._params = params
+        self.referenced_tables = references
+        self.total_bytes_processed = total_bytes_processed
+        self.total_bytes_billed = 0 if dry_run else total_bytes_processed
+        self.dry_run = dry_run
+        self.state = "DONE"
+
+    def result(self, page_size: int | None = None, **kwargs):
+        return FakeRowIterator(self._client.backend, self._sql, self._params, page_size, dry_run=self.dry_run)
+
+    def to_dataframe(self, **kwargs):
+        return self.result().to_dataframe()
+
+    def to_arrow(self, **kwargs):
+        return self.result().to_arrow()
+
+class FakeRowIterator:
+    """
+    Query result read page by page from a SQLite cursor, one request being sent
+    per page.
+    """
+
+    def __init__(self, backend, sql, params, page_size, dry_run=False):
+        self._backend = backend
+        self._sql = sql
+        self._params = params
+        self._dry_run = dry_run
+        self.page_size = page_size or DEFAULT_PAGE_SIZE
+
+    @property
+    def total_rows(self):
+        if self._dry_run:
+            return 0
+        with closing(self._backend.connect()) as connection:
+            return connection.execute(f"SELECT COUNT(*) FROM ({self._sql})", self._params).fetchone()[0]
+
+    def to_dataframe_iterable(self, bqstorage_client=None, **kwargs):
+        return self._pages()
+
+    def to_arrow_iterable(self, bqstorage_client=None, **kwargs):
+        import pyarrow as pa
+
+        return (pa.RecordBatch.from_pandas(page, preserve_index=False) for page in self._pages())
+
+    def to_dataframe(self, **kwargs):
+        import pandas as pd
+
+        pages = list(self._pages(empty_page=True))
+        return pd.concat(pages, ignore_index=True) if len(pages) > 1 else pages[0]
+
+    def to_arrow(self, **kwargs):
+        import pyarrow as pa
+
+        return pa.Table.from_pandas(self.to_dataframe(), preserve_index=False)
+
+    def __iter__(self):
+        for page in self._pages():
+            yield from page.to_dict(orient='records')
+
+    def _pages(self, empty_page=False):
+        import pandas as pd
+
+        if self._dry_run:
+            if empty_page:
+                yield pd.DataFrame()
+            return
+
+        with closing(self._backend.connect()) as connection:
+            cursor = connection.execute(self._sql, self._params)
+            columns = [description[0] for description in cursor.description or []]
+
+            empty = True
+            while True:
+                self._backend.throttle.request()
+                rows = cursor.fetchmany(self.page_size)
+                if not rows:
+                    break
+                page = pd.DataFrame.from_records(rows, columns=columns)
+                self._backend.throttle.transfer(int(page.memory_usage(index=False, deep=True).sum()))
+                empty = False
+                yield page
+
+            if empty and empty_page:
+                yield pd.DataFrame(columns=columns)
+
+def _create_metadata_table(connection):
+    connection.execute(
+        f"CREATE TABLE IF NOT EXISTS {METADATA_TABLE} "
+        "(name TEXT PRIMARY KEY, modified REAL, num_rows INTEGER, num_bytes INTEGER)"
+    )
+
+def _quote(identifier):
+    return '"' + identifier.replace('"', '""') + '"'
+
+def _sqlite_value(value):
+
+    import decimal
+
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+
+    return value
@@ -0,0 +1,545 @@
+import base64
+import datetime
+import hashlib
+import os
+import shutil
+import threading
+import time
+import uuid
+
+import fsspec
+
+from fsspec.spec import AbstractBufferedFile, AbstractFileSystem
+
+from easyenvi.envs.listing_index import glob_to_regex
+from easyenvi.testing.throttle import Throttle
+
+GCS_PROTOCOLS = ("gs", "gcs")
+LIST_PAGE_SIZE = 1000
+UPLOAD_PREFIX = ".upload-"
+
+class FakeGCS:
+    """
+    In-process stand-in for Google Cloud Storage, backed by a local directory
+    (one sub-directory per bucket). It provides an fsspec filesystem used for the
+    "gs://" and "gcs://" protocols while the backend is active, and a client
+    replacing `google.cloud.storage.Client`. Object generations are nanosecond
+    timestamps of their last write, so caches keyed on generations behave as
+    with Cloud Storage, and objects have CRC32C checksums. The client supports
+    ranged downloads, uploads and compose requests.
+
+    Parameters
+    ----------
+    root : str
+        directory holding the buckets.
+    latency : float
+        Time (seconds) added to every request. Default is 0.
+    bandwidth : float (optional)
+        Throughput (bytes per second) of a transfer. Default is None (unlimited).
+
+    Examples
+    --------
+    with FakeGCS("tests/fake_gcs", latency=0.02) as backend:
+        gcs = backend.attach(GCS(project_id="test", GCS_path="gs://bucket/"))
+        gcs.save(df, "data.csv")
+    """
+
+    def __init__(
+            self,
+            root: str,
+            latency: float = 0.0,
+            bandwidth: float | None = None
+            ):
+
+        self.root = os.path.abspath(root)
+        self.throttle = Throttle(latency=latency, bandwidth=bandwidth)
+        self.filesystem_class = type("FakeGCSFileSystem", (FakeGCSFileSystem,), {'backend': self})
+        self._previous = None
+        self._checksums = {}
+        self._checksums_lock = threading.Lock()
+
+        os.makedirs(self.root, exist_ok=True)
+
+    def install(self):
+        """
+        Serve the "gs://" and "gcs://" protocols of fsspec from this backend.
+        """
+
+        from fsspec.registry import _registry
+
+        if self._previous is None:
+            self._previous = {protocol: _registry.get(protocol) for protocol in GCS_PROTOCOLS}
+        for protocol in GCS_PROTOCOLS:
+            fsspec.register_implementation(protocol, self.filesystem_class, clobber=True)
+
+    def uninstall(self):
+        """
+        Restore the previous implementations of the "gs://" and "gcs://" protocols.
+        """
+
+        from fsspec.registry import _registry
+
+        if self._previous is None:
+            return
+        for protocol, implementation in self._previous.items():
+            if implementation is None:
+                _registry.pop(protocol, None)
+            else:
+                fsspec.register_implementation(protocol, implementation, clobber=True)
+        self._previous = None
+
+    def filesystem(self):
+        """
+        fsspec filesystem of the backend.
+        """
+
+        return self.filesystem_class()
+
+    def client(self):
+        """
+        Client replacing `google.cloud.storage.Client`.
+        """
+
+        return FakeStorageClient(self)
+
+    def attach(self, env):
+        """
+        Make a `GCS` environment use this backend, and install it. Returns the environment.
+
+        Parameters
+        ----------
+        env : GCS
+            environment to attach.
+        """
+
+        self.install()
+        env._storage_client = self.client()
+        return env
+
+    @property
+    def stats(self):
+        """
+        Requests sent and bytes read / written.
+        """
+
+        return self.throttle.stats
+
+    def local_path(self, bucket: str, name: str = ""):
+        """
+        Local path of an object (or of a bucket when `name` is empty).
+        """
+
+        return os.path.join(self.root, bucket, *[part for part in name.split('/') if part])
+
+    def object_info(self, bucket: str, name: str):
+        """
+        Description of an object, as given by Cloud Storage (name, size, generation,
+        updated, crc32c). Raises FileNotFoundError if it does not exist.
+        """
+
+        local_path = self.local_path(bucket, name)
+        if not os.path.isfile(local_path):
+            raise FileNotFoundError(f"gs://{bucket}/{name}")
+
+        stat = os.stat(local_path)
+        return {
+            'name': f"{bucket}/{name}",
+            'size': stat.st_size,
+            'type': 'file',
+            'generation': str(stat.st_mtime_ns),
+            'updated': datetime.datetime.fromtimestamp(stat.st_mtime_ns / 1e9, tz=datetime.timezone.utc),
+            'crc32c': self._crc32c(local_path, stat.st_mtime_ns),
+        }
+
+    def _crc32c(self, local_path, generation):
+        # Computed once per object version, as Cloud Storage stores it
+        from easyenvi.envs.gcs_transfer import file_crc32c
+
+        with self._checksums_lock:
+            cached = self._checksums.get(local_path)
+        if cached is not None and cached[0] == generation:
+            return cached[1]
+
+        checksum = file_crc32c(local_path)
+        with self._checksums_lock:
+            self._checksums[local_path] = (generation, checksum)
+
+        return checksum
+
+    def iter_objects(self, bucket: str, prefix: str = ""):
+        """
+        Names of the objects of a bucket starting with `prefix`, in lexicographic order.
+        """
+
+        bucket_path = self.local_path(bucket)
+        names = []
+        for directory, _, files in os.walk(bucket_path):
+            relative = os.path.relpath(directory, bucket_path).replace(os.sep, '/')
+            for name in files:
+                if name.startswith(UPLOAD_PREFIX):
+                    continue
+                name = name if relative == '.' else f"{relative}/{name}"
+                if name.startswith(prefix):
+                    names.append(name)
+
+        return sorted(names)
+
+    def write_object(self, bucket: str, name: str, source_path: str):
+        """
+        Move a local file into place as the new version of an object.
+        """
+
+        local_path = self.local_path(bucket, name)
+        os.makedirs(os.path.dirname(local_path), exist_ok=True)
+        os.replace(source_path, local_path)
+        generation = time.time_ns()
+        os.utime(local_path, ns=(generation, generation))
+
+    def temporary_path(self, bucket: str, name: str):
+        """
+        Path of a new temporary file, beside an object, holding its upload.
+        """
+
+        directory = os.path.dirname(self.local_path(bucket, name))
+        os.makedirs(directory, exist_ok=True)
+        return os.path.join(directory, f"{UPLOAD_PREFIX}{uuid.uuid4().hex}")
+
+    def delete_object(self, bucket: str, name: str):
+        """
+        Delete an object, and the directories it leaves empty.
+        """
+
+        local_path = self.local_path(bucket, name)
+        os.remove(local_path)
+
+        bucket_path = self.local_path(bucket)
+        directory = os.path.dirname(local_path)
+        while directory != bucket_path and not os.listdir(directory):
+            os.rmdir(directory)
+            directory = os.path.dirname(directory)
+
+    def __enter__(self):
+        self.install()
+        return self
+
+    def __exit__(self, *exc):
+        self.uninstall()
+
+class FakeGCSFileSystem(AbstractFileSystem):
+    """
+    fsspec filesystem of a `FakeGCS` backend. Reads are range requests of
+    `block_size` bytes and writes are uploaded by chunks, each chunk being a
+    request, as with gcsfs.
+    """
+
+    protocol = GCS_PROTOCOLS
+    root_marker = ""
+    backend = None
+
+    def __init__(self, *args, **storage_options):
+        # Credentials (token, project...) are accepted and ignored
+        super().__init__()
+
+    def ls(self, path, detail=True, **kwargs):
+
+        self.backend.throttle.request()
+        path = self._strip_protocol(path)
+        bucket, _, prefix = path.partition('/')
+
+        if not bucket:
+            entries = [
+                {'name': name, 'size': 0, 'type': 'directory'}
+                for name in sorted(os.listdir(self.backend.root))
+            ]
+        else:
+            local_path = self.backend.local_path(bucket, prefix)
+            if os.path.isfile(local_path):
+                entries = [self.backend.object_info(bucket, prefix)]
+            elif os.path.isdir(local_path):
+                entries = []
+                for name in sorted(os.listdir(local_path)):
+                    if name.startswith(UPLOAD_PREFIX):
+                        continue
+                    child = f"{prefix}/{name}" if prefix else name
+                    if os.path.isdir(os.path.join(local_path, name)):
+                        entries.append({'name': f"{bucket}/{child}", 'size': 0, 'type': 'directory'})
+                    else:
+                        entries.append(self.backend.object_info(bucket, child))
+            else:
+                raise FileNotFoundError(path)
+
+        return entries if detail else [entry['name'] for entry in entries]
+
+    def info(self, path, **kwargs):
+
+        self.backend.throttle.request()
+        path = self._strip_protocol(path)
+        bucket, _, name = path.partition('/')
+
+        local_path = self.backend.local_path(bucket, name)
+        if os.path.isdir(local_path):
+            return {'name': path, 'size': 0, 'type': 'directory'}
+
+        return self.backend.object_info(bucket, name)
+
+    def _open(self, path, mode="rb", block_size=None, autocommit=True, cache_options=None, **kwargs):
+
+        return FakeGCSFile(self, path, mode=mode, block_size=block_size or self.blocksize,
+                           autocommit=autocommit, cache_options=cache_options, **kwargs)
+
+    def rm(self, path, recursive=False, maxdepth=None, batchsize=100):
+
+        paths = self.expand_path(path, recursive=recursive, maxdepth=maxdepth)
+        names = [name for name in paths if os.path.isfile(self._local(name))]
+
+        # One batch request per `batchsize` deletions
+        for start in range(0, len(names), batchsize):
+            self.backend.throttle.request()
+            for name in names[start:start + batchsize]:
+                bucket, _, key = name.partition('/')
+                self.backend.delete_object(bucket, key)
+
+    def rm_file(self, path):
+        self.rm(path)
+
+    def cp_file(self, path1, path2, **kwargs):
+
+        self.backend.throttle.request()
+        source = self._local(self._strip_protocol(path1))
+        bucket, _, name = self._strip_protocol(path2).partition('/')
+
+        temporary_path = self._temporary_path(bucket, name)
+        shutil.copyfile(source, temporary_path)
+        self.backend.write_object(bucket, name, temporary_path)
+
+    def mkdir(self, path, create_parents=True, **kwargs):
+        # Cloud Storage has no directories: only buckets are created
+        bucket = self._strip_protocol(path).partition('/')[0]
+        os.makedirs(self.backend.local_path(bucket), exist_ok=True)
+
+    def makedirs(self, path, exist_ok=False):
+        self.mkdir(path)
+
+    def rmdir(self, path):
+        pass
+
+    def _local(self, path):
+        bucket, _, name = path.partition('/')
+        return self.backend.local_path(bucket, name)
+
+    def _temporary_path(self, bucket, name):
+        return self.backend.temporary_path(bucket, name)
+
+class FakeGCSFile(AbstractBufferedFile):
+
+    def _fetch_range(self, start, end):
+
+        throttle = self.fs.backend.throttle
+        throttle.request()
+        with open(self.fs._local(self.path), 'rb') as f:
+            f.seek(start)
+            data = f.read(end - start)
+        throttle.transfer(len(data))
+
+        return data
+
+    def _initiate_upload(self):
+
+        bucket, _, name = self.path.partition('/')
+        self._temporary_path = self.fs._temporary_path(bucket, name)
+        self._temporary_file = open(self._temporary_path, 'wb')
+
+    def _upload_chunk(self, final=False):
+
+        data = self.buffer.getvalue()
+        throttle = self.fs.backend.throttle
+        throttle.request()
+        throttle.transfer(len(data), upload=True)
+        self._temporary_file.write(data)
+
+        if final:
+            self._temporary_file.close()
+            bucket, _, name = self.path.partition('/')
+            self.fs.backend.write_object(bucket, name, self._temporary_path)
+
+        return True
+
+    def discard(self):
+
+        if getattr(self, '_temporary_file', None) is not None:
+            self._temporary_file.close()
+            os.remove(self._temporary_path)
+
+class FakeStorageClient:
+    """
+    Client of a `FakeGCS` backend, replacing `google.cloud.storage.Client`.
+    """
+
+    def __init__(self, backend: FakeGCS):
+        self.backend = backend
+
+    def bucket(self, bucket_name: str):
+        return FakeBucket(self.backend, bucket_name)
+
+class FakeBucket:
+
+    def __init__(self, backend, name):
+        self.backend = backend
+        self.name = name
+
+    def blob(self, blob_name: str, generation: int | None = None, **kwargs):
+        return FakeBlob(self, blob_name, generation=generation)
+
+    def delete_blobs(self, blobs, on_error=None, **kwargs):
+
+        for blob in blobs:
+            try:
+                blob.delete()
+            except FileNotFoundError:
+                if on_error is None:
+                    raise
+                on_error(blob)
+
+    def list_blobs(self, prefix=None, delimiter=None, match_glob=None, fields=None, **kwargs):
+        return FakeBlobIterator(self, prefix or "", delimiter, match_glob)
+
+class FakeBlob:
+
+    def __init__(self, bucket, name, info=None, generation=None):
+        self.bucket = bucket
+        self.name = name
+        self._info = info
+        self._generation = generation
+
+    @property
+    def size(self):
+        return self._properties()['size']
+
+    @property
+    def generation(self):
+        return int(self._properties()['generation'])
+
+    @property
+    def updated(self):
+        return self._properties()['updated']
+
+    @property
+    def md5_hash(self):
+        digest = hashlib.md5()
+        with open(self.bucket.backend.local_path(self.bucket.name, self.name), 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return base64.b64encode(digest.digest()).decode()
+
+    @property
+    def crc32c(self):
+        return self._properties()['crc32c']
+
+    def download_to_file(self, file_obj, start=None, end=None, checksum=None, **kwargs):
+        """
+        Write the object, or the bytes from `start` to `end` (included), to a file object.
+        """
+
+        backend = self.bucket.backend
+        backend.throttle.request()
+        info = backend.object_info(self.bucket.name, self.name)
+        if self._generation is not None and int(info['generation']) != self._generation:
+            raise FileNotFoundError(f"gs://{self.bucket.name}/{self.name}#{self._generation}")
+
+        start = start or 0
+        end = info['size'] - 1 if end is None else end
+        with open(backend.local_path(self.bucket.name, self.name), 'rb') as f:
+            f.seek(start)
+            data = f.read(end - start + 1)
+        backend.throttle.transfer(len(data))
+        file_obj.write(data)
+
+    def upload_from_file(self, file_obj, size=None, checksum=None, **kwargs):
+        """
+        Upload `size` bytes (or the rest) of a file object as the new version of the object.
+        """
+
+        data = file_obj.read() if size is None else file_obj.read(size)
+        self._write(data)
+
+    def compose(self, sources, **kwargs):
+        """
+        Write the concatenation of the source objects (at most 32) as the new version of the object.
+        """
+
+        if not 1 <= len(sources) <= 32:
+            raise ValueError("A compose request takes between 1 and 32 source objects.")
+
+        backend = self.bucket.backend
+        backend.throttle.request()
+        temporary_path = backend.temporary_path(self.bucket.name, self.name)
+        with open(temporary_path, 'wb') as f:
+            for source in sources:
+                with open(backend.local_path(source.bucket.name, source.name), 'rb') as source_file:
+                    shutil.copyfileobj(source_file, f)
+        backend.write_object(self.bucket.name, self.name, temporary_path)
+        self._info = backend.object_info(self.bucket.name, self.name)
+
+    def delete(self):
+
+        backend = self.bucket.backend
+        backend.throttle.request()
+        if not os.path.isfile(backend.local_path(self.bucket.name, self.name)):
+            raise FileNotFoundError(f"gs://{self.bucket.name}/{self.name}")
+        backend.delete_object(self.bucket.name, self.name)
+
+    def _write(self, data):
+
+        backend = self.bucket.backend
+        backend.throttle.request()
+        backend.throttle.transfer(len(data), upload=True)
+        temporary_path = backend.temporary_path(self.bucket.name, self.name)
+        with open(temporary_path, 'wb') as f:
+            f.write(data)
+        backend.write_object(self.bucket.name, self.name, temporary_path)
+        self._info = backend.object_info(self.bucket.name, self.name)
+
+    def exists(self):
+        self.bucket.backend.throttle.request()
+        return os.path.isfile(self.bucket.backend.local_path(self.bucket.name, self.name))
+
+    def reload(self):
+        self.bucket.backend.throttle.request()
+        self._info = self.bucket.backend.object_info(self.bucket.name, self.name)
+
+    def _properties(self):
+        if self._info is None:
+            self.reload()
+        return self._info
+
+class FakeBlobIterator:
+    """
+    Result of `FakeBucket.list_blobs`: iterating yields the blobs and fills
+    `prefixes`, one request being sent per page of results.
+    """
+
+    def __init__(self, bucket, prefix, delimiter, match_glob):
+        self.bucket = bucket
+        self.prefix = prefix
+        self.delimiter = delimiter
+        self.match_glob = match_glob
+        self.prefixes = set()
+
+    def __iter__(self):
+
+        backend = self.bucket.backend
+        regex = glob_to_regex(self.match_glob) if self.match_glob is not None else None
+
+        blobs = []
+        for name in backend.iter_objects(self.bucket.name, self.prefix):
+            rest = name[len(self.prefix):]
+            if self.delimiter and self.delimiter in rest:
+                self.prefixes.add(self.prefix + rest[:rest.index(self.delimiter) + len(self.delimiter)])
+            elif regex is None or regex.match(name):
+                blobs.append(name)
+
+        num_results = len(blobs) + len(self.prefixes)
+        backend.throttle.request(max(1, -(-num_results // LIST_PAGE_SIZE)))
+
+        for name in blobs:
+            yield FakeBlob(self.bucket, name, info=backend.object_info(self.bucket.name, name))
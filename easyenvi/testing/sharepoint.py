@@ -0,0 +1,273 @@
+import datetime
+import os
+import shutil
+
+from easyenvi.testing.throttle import Throttle
+
+class FakeSharePoint:
+    """
+    In-process stand-in for a SharePoint site, backed by a local directory
+    (server-relative paths are resolved under it). It provides a client context
+    emulating the part of `office365.sharepoint.client_context.ClientContext`
+    used by the `sharepoint` environment: operations are queued and sent by
+    `execute_query` (one request per operation) or `execute_batch` (one request
+    per batch).
+
+    Parameters
+    ----------
+    root : str
+        directory holding the site documents.
+    latency : float
+        Time (seconds) added to every request. Default is 0.
+    bandwidth : float (optional)
+        Throughput (bytes per second) of downloads and uploads. Default is None (unlimited).
+
+    Examples
+    --------
+    backend = FakeSharePoint("tests/fake_sharepoint", latency=0.05)
+    sp = backend.attach(sharepoint(site_url="https://contoso.sharepoint.com/sites/test",
+                                   client_id="id", client_secret="secret"))
+    sp.upload("report.csv", "/Documents/report.csv")
+    """
+
+    def __init__(
+            self,
+            root: str,
+            latency: float = 0.0,
+            bandwidth: float | None = None
+            ):
+
+        self.root = os.path.abspath(root)
+        self.throttle = Throttle(latency=latency, bandwidth=bandwidth)
+
+        os.makedirs(self.root, exist_ok=True)
+
+    def context(self):
+        """
+        Client context replacing `ClientContext`.
+        """
+
+        return FakeClientContext(self)
+
+    def attach(self, env):
+        """
+        Make a `sharepoint` environment use this backend. Returns the environment.
+
+        Parameters
+        ----------
+        env : sharepoint
+            environment to attach.
+        """
+
+        env.env = self.context()
+        env._new_context = self.context
+        return env
+
+    @property
+    def stats(self):
+        """
+        Requests sent and bytes read / written.
+        """
+
+        return self.throttle.stats
+
+    def local_path(self, server_relative_path: str):
+        """
+        Local path of a server-relative path.
+        """
+
+        return os.path.join(self.root, *[part for part in server_relative_path.split('/') if part])
+
+class FakeClientContext:
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.web = FakeWeb(self)
+        self._pending = []
+
+    def add_query(self, operation):
+        self._pending.append(operation)
+
+    def execute_query(self):
+
+        pending, self._pending = self._pending, []
+        for operation in pending:
+            self.backend.throttle.request()
+            operation()
+
+        return self
+
+    def execute_batch(self, items_per_batch: int = 100, **kwargs):
+
+        pending, self._pending = self._pending, []
+        for start in range(0, len(pending), items_per_batch):
+            self.backend.throttle.request()
+            for operation in pending[start:start + items_per_batch]:
+                operation()
+
+        return self
+
+class FakeWeb:
+
+    def __init__(self, context):
+        self.context = context
+
+    def get_file_by_server_relative_path(self, path):
+        return FakeFile(self.context, path)
+
+    def get_file_by_server_relative_url(self, url):
+        return FakeFile(self.context, url)
+
+    def get_folder_by_server_relative_path(self, path):
+        return FakeFolder(self.context, path)
+
+    def get_folder_by_server_relative_url(self, url):
+        return FakeFolder(self.context, url)
+
+class _FakeClientObject:
+
+    def __init__(self, context, path):
+        self.context = context
+        self.path = '/' + '/'.join(part for part in path.split('/') if part)
+        self.properties = {}
+
+    @property
+    def local_path(self):
+        return self.context.backend.local_path(self.path)
+
+    def get(self):
+        self.context.add_query(self._load)
+        return self
+
+    def execute_query(self):
+        self.context.execute_query()
+        return self
+
+class FakeFile(_FakeClientObject):
+
+    def download(self, file_object):
+
+        def operation():
+            self._check_exists()
+            with open(self.local_path, 'rb') as f:
+                data = f.read()
+            self.context.backend.throttle.transfer(len(data))
+            file_object.write(data)
+
+        self.context.add_query(operation)
+        return self
+
+    def delete_object(self):
+
+        def operation():
+            self._check_exists()
+            os.remove(self.local_path)
+
+        self.context.add_query(operation)
+        return self
+
+    def _load(self):
+
+        self._check_exists()
+        stat = os.stat(self.local_path)
+        modified = datetime.datetime.fromtimestamp(stat.st_mtime_ns / 1e9, tz=datetime.timezone.utc)
+        self.properties.update({
+            'Name': os.path.basename(self.local_path),
+            'ServerRelativeUrl': self.path,
+            'Length': str(stat.st_size),
+            'ETag': f'"{{{stat.st_mtime_ns}}},1"',
+            'TimeLastModified': modified.strftime('%Y-%m-%dT%H:%M:%SZ'),
+        })
+
+    def _check_exists(self):
+        if not os.path.isfile(self.local_path):
+            raise FileNotFoundError(f"File Not Found: {self.path}")
+
+class FakeFolder(_FakeClientObject):
+
+    def __init__(self, context, path):
+        super().__init__(context, path)
+        self.files = []
+        self.folders = []
+
+    def expand(self, names):
+        return self
+
+    def upload_file(self, name, content):
+
+        uploaded = FakeFile(self.context, f"{self.path}/{name}")
+
+        def operation():
+            self._check_exists()
+            self.context.backend.throttle.transfer(len(content), upload=True)
+            temporary_path = os.path.join(self.local_path, f".upload-{name}")
+            with open(temporary_path, 'wb') as f:
+                f.write(content)
+            os.replace(temporary_path, uploaded.local_path)
+            uploaded._load()
+
+        self.context.add_query(operation)
+        return uploaded
+
+    def delete_object(self):
+
+        def operation():
+            self._check_exists()
+            shutil.rmtree(self.local_path)
+
+        self.context.add_query(operation)
+        return self
+
+    def get_files(self, recursive: bool = False):
+
+        files = FakeFileCollection(self.context)
+
+        def operation():
+            self._check_exists()
+            for directory, folders, names in os.walk(self.local_path):
+                folders.sort()
+                relative = os.path.relpath(directory, self.local_path).replace(os.sep, '/')
+                for name in sorted(names):
+                    path = self.path + '/' + (name if relative == '.' else f"{relative}/{name}")
+                    remote_file = FakeFile(self.context, path)
+                    remote_file._load()
+                    files.append(remote_file)
+                if not recursive:
+                    break
+
+        self.context.add_query(operation)
+        return files
+
+    def _load(self):
+
+        self._check_exists()
+        self.properties.update({
+            'Name': os.path.basename(self.local_path),
+            'ServerRelativeUrl': self.path,
+        })
+
+        self.files, self.folders = [], []
+        for name in sorted(os.listdir(self.local_path)):
+            child_path = f"{self.path}/{name}".replace('//', '/')
+            if os.path.isdir(os.path.join(self.local_path, name)):
+                folder = FakeFolder(self.context, child_path)
+                folder.properties.update({'Name': name, 'ServerRelativeUrl': folder.path})
+                self.folders.append(folder)
+            else:
+                remote_file = FakeFile(self.context, child_path)
+                remote_file._load()
+                self.files.append(remote_file)
+
+    def _check_exists(self):
+        if not os.path.isdir(self.local_path):
+            raise FileNotFoundError(f"Folder Not Found: {self.path}")
+
+class FakeFileCollection(list):
+
+    def __init__(self, context):
+        super().__init__()
+        self.context = context
+
+    def execute_query(self):
+        self.context.execute_query()
+        return self
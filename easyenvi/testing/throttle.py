@@ -0,0 +1,79 @@
+import threading
+import time
+
+class Throttle:
+    """
+    Simulated network link of a fake backend: every request waits `latency`
+    seconds and every transfer waits for its size divided by `bandwidth`.
+    Bandwidth applies per request (like a single connection), so concurrent
+    transfers overlap as they would against the real service. Requests and
+    transferred bytes are counted, in the current process.
+
+    Parameters
+    ----------
+    latency : float
+        Time (seconds) added to every request. Default is 0.
+    bandwidth : float (optional)
+        Throughput (bytes per second) of a transfer. Default is None (unlimited).
+    """
+
+    def __init__(
+            self,
+            latency: float = 0.0,
+            bandwidth: float | None = None
+            ):
+
+        self.latency = latency
+        self.bandwidth = bandwidth
+
+        self._lock = threading.Lock()
+        self._stats = {'requests': 0, 'bytes_read': 0, 'bytes_written': 0}
+
+    def request(self, count: int = 1):
+        """
+        Account for `count` requests and wait for their latency.
+        """
+
+        with self._lock:
+            self._stats['requests'] += count
+        if self.latency:
+            time.sleep(self.latency)
+
+    def transfer(
+            self,
+            num_bytes: int,
+            upload: bool = False
+            ):
+        """
+        Account for a transfer of `num_bytes` and wait for its duration.
+
+        Parameters
+        ----------
+        num_bytes : int
+            size of the transfer.
+        upload : bool
+            whether the bytes are sent to the backend (False: received from it). Default is False.
+        """
+
+        with self._lock:
+            self._stats['bytes_written' if upload else 'bytes_read'] += num_bytes
+        if self.bandwidth:
+            time.sleep(num_bytes / self.bandwidth)
+
+    @property
+    def stats(self):
+        """
+        Requests sent and bytes read / written since creation or the last `reset`.
+        """
+
+        with self._lock:
+            return dict(self._stats)
+
+    def reset(self):
+        """
+        Reset the counters.
+        """
+
+        with self._lock:
+            for key in self._stats:
+                self._stats[key] = 0
@@ -0,0 +1,11 @@
+from .dataset import select_shard
+from .prefetch import prefetch, prefetch_map, sizeof
+from .write_behind import WriteBehindQueue
+
+__all__ = [
+    "prefetch",
+    "prefetch_map",
+    "select_shard",
+    "sizeof",
+    "WriteBehindQueue"
+]
\ No newline at end of file
@@ -0,0 +1,36 @@
+import random
+
+def select_shard(
+        paths: list,
+        shuffle: bool = False,
+        seed: int | None = None,
+        shard_index: int = 0,
+        num_shards: int = 1
+        ):
+    """
+    Order a list of paths (sorted, or shuffled) and keep the shard of a worker:
+    every `num_shards`-th path starting at `shard_index`. Workers sharing a dataset
+    must use the same `seed` so that their shards are disjoint.
+
+    Parameters
+    ----------
+    paths : list
+        paths of the dataset.
+    shuffle : bool
+        whether to shuffle the paths. Default is False (sorted order).
+    seed : int (optional)
+        seed of the shuffle. Default is None (different order at each call).
+    shard_index : int
+        index of the shard to keep, between 0 and `num_shards` - 1. Default is 0.
+    num_shards : int
+        number of shards. Default is 1.
+    """
+
+    if not 0 <= shard_index < num_shards:
+        raise ValueError(f"shard_index must be between 0 and {num_shards - 1}, not {shard_index}.")
+
+    paths = sorted(paths)
+    if shuffle:
+        random.Random(seed).shuffle(paths)
+
+    return paths[shard_index::num_shards]
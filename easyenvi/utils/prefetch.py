@@ -0,0 +1,161 @@
+import queue
+import threading
+
+_DONE = object()
+
+def prefetch(
+        iterable,
+        depth: int = 1
+        ):
+    """
+    Iterate over `iterable` while a background thread produces up to `depth`
+    items ahead, so that producing the next item (e.g. fetching a page) overlaps
+    with the processing of the current one. Exceptions raised by the producer are
+    re-raised by the consumer.
+
+    Parameters
+    ----------
+    iterable : iterable
+        items to produce in the background.
+    depth : int
+        maximum number of items produced ahead. 0 disables prefetching. Default is 1.
+    """
+
+    if depth <= 0:
+        yield from iterable
+        return
+
+    items = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put((item, None)):
+                    return
+        except BaseException as error:
+            put((_DONE, error))
+            return
+        put((_DONE, None))
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+
+    try:
+        while True:
+            item, error = items.get()
+            if item is _DONE:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stop.set()
+
+def prefetch_map(
+        func,
+        items,
+        depth: int = 4,
+        max_workers: int = 4,
+        max_bytes: int | None = None
+        ):
+    """
+    Iterate over `func(item)` for each item, in order, while a thread pool computes
+    the next results (e.g. downloads and decodes the next files) in the background.
+
+    Parameters
+    ----------
+    func : callable
+        function applied to each item.
+    items : iterable
+        items to apply `func` to.
+    depth : int
+        maximum number of results computed ahead. Default is 4.
+    max_workers : int
+        number of threads. Default is 4.
+    max_bytes : int (optional)
+        no new item is started while the results computed ahead and not yet
+        consumed, with the ones being computed (estimated from the sizes observed
+        so far), exceed this size (bytes; measured for DataFrames, arrays, images,
+        bytes and strings). Default is None (no limit).
+    """
+
+    from collections import deque
+    from concurrent.futures import ThreadPoolExecutor
+
+    if depth < 1:
+        raise ValueError("depth must be at least 1.")
+
+    observed_sizes = []
+
+    def task(item):
+        result = func(item)
+        if max_bytes is None:
+            return result, 0
+        size = sizeof(result)
+        observed_sizes.append(size)
+        return result, size
+
+    items = iter(items)
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    pending = deque()
+
+    def submit():
+        while len(pending) < depth:
+            if pending and max_bytes is not None and not _below_max_bytes(pending, observed_sizes, max_bytes, max_workers):
+                return
+            item = next(items, _DONE)
+            if item is _DONE:
+                return
+            pending.append(executor.submit(task, item))
+
+    try:
+        submit()
+        while pending:
+            result, _ = pending.popleft().result()
+            submit()
+            yield result
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+def _below_max_bytes(pending, observed_sizes, max_bytes, max_workers):
+    # Size held ahead: loaded results, plus running loads estimated at the mean
+    # size observed so far (before any observation, one load per worker)
+    if not observed_sizes:
+        return len(pending) < max_workers
+
+    loaded = [future.result()[1] for future in pending if future.done() and future.exception() is None]
+    mean_size = sum(observed_sizes) / len(observed_sizes)
+
+    return sum(loaded) + (len(pending) - len(loaded)) * mean_size < max_bytes
+
+def sizeof(obj):
+    """
+    Estimated in-memory size (bytes) of an object: measured for DataFrames (deep,
+    in time linear in the number of rows of object columns), arrays, images, bytes
+    and strings. Shallow for other objects (e.g. dicts and lists, whose items are
+    not counted).
+    """
+
+    import sys
+
+    if hasattr(obj, 'memory_usage') and hasattr(obj, 'columns'):
+        return int(obj.memory_usage(index=True, deep=True).sum())
+    if hasattr(obj, 'nbytes'):
+        return int(obj.nbytes)
+    if hasattr(obj, 'size') and hasattr(obj, 'getbands'):
+        width, height = obj.size
+        return width * height * len(obj.getbands())
+
+    return sys.getsizeof(obj)
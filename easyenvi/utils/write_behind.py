@@ -0,0 +1,199 @@
+import atexit
+import re
+import threading
+import weakref
+
+from collections import OrderedDict
+
+class WriteBehindQueue:
+    """
+    Bounded pool of background threads running writes (serialization and upload)
+    submitted under a key, typically the destination path.
+
+    - A write submitted while another write of the same key is still waiting
+      replaces it (coalescing): only the latest object is written.
+    - Writes of a same key never run concurrently and complete in submission order.
+    - `wait` and `wait_matching` wait for the writes of a key or of a path pattern
+      (before reading or deleting it).
+    - `submit` blocks while `max_pending` writes are waiting (backpressure).
+    - `flush` waits for every submitted write and re-raises the first error of the
+      failed ones. Pending writes are flushed when the interpreter exits.
+
+    Parameters
+    ----------
+    max_workers : int
+        number of background threads. Default is 4.
+    max_pending : int
+        maximum number of writes waiting to run. Default is 64.
+    """
+
+    def __init__(
+            self,
+            max_workers: int = 4,
+            max_pending: int = 64
+            ):
+
+        if max_workers < 1 or max_pending < 1:
+            raise ValueError("max_workers and max_pending must be at least 1.")
+
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+
+        self._condition = threading.Condition()
+        self._pending = OrderedDict()
+        self._running = set()
+        self._errors = []
+        self._workers = []
+        self._closed = False
+        self._stats = {'submitted': 0, 'coalesced': 0, 'written': 0, 'failed': 0}
+
+        atexit.register(_flush_at_exit, weakref.ref(self))
+
+    def submit(
+            self,
+            key,
+            func,
+            *args,
+            **kwargs
+            ):
+        """
+        Schedule `func(*args, **kwargs)` as the write of `key`.
+
+        Parameters
+        ----------
+        key : hashable
+            identifier of the destination (e.g. the full path).
+        func : callable
+            function performing the write.
+        """
+
+        with self._condition:
+            if self._closed:
+                raise ValueError("Cannot submit a write to a closed queue.")
+
+            self._stats['submitted'] += 1
+            while True:
+                if key in self._pending:
+                    self._pending[key] = (func, args, kwargs)
+                    self._stats['coalesced'] += 1
+                    return
+                if len(self._pending) < self.max_pending:
+                    break
+                self._condition.wait()
+
+            self._pending[key] = (func, args, kwargs)
+            if len(self._workers) < min(self.max_workers, len(self._pending) + len(self._running)):
+                worker = threading.Thread(target=self._work, daemon=True)
+                worker.start()
+                self._workers.append(worker)
+            self._condition.notify_all()
+
+    def wait(self, key):
+        """
+        Wait until the writes of `key` are done (so that it can be read back).
+        """
+
+        with self._condition:
+            while key in self._pending or key in self._running:
+                self._condition.wait()
+
+    def wait_matching(self, pattern: str):
+        """
+        Wait until the writes of the keys a path or glob pattern may cover are done
+        (so that they can be deleted): keys starting with the part of `pattern`
+        before its first glob character.
+        """
+
+        prefix = re.split(r"[*?[]", pattern, maxsplit=1)[0]
+        with self._condition:
+            while any(str(key).startswith(prefix) for key in (*self._pending, *self._running)):
+                self._condition.wait()
+
+    def flush(self):
+        """
+        Wait until every submitted write is done, and re-raise the first error of
+        the writes that failed since the last flush.
+        """
+
+        with self._condition:
+            while self._pending or self._running:
+                self._condition.wait()
+            errors, self._errors = self._errors, []
+
+        if errors:
+            raise errors[0]
+
+    def close(self):
+        """
+        Flush the pending writes and stop the background threads.
+        """
+
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+
+        try:
+            self.flush()
+        finally:
+            for worker in self._workers:
+                worker.join()
+
+    @property
+    def metrics(self):
+        """
+        Writes submitted, coalesced (replaced before running), written and failed,
+        and writes currently pending or running.
+        """
+
+        with self._condition:
+            metrics = dict(self._stats)
+            metrics['pending'] = len(self._pending)
+            metrics['running'] = len(self._running)
+
+        return metrics
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _work(self):
+
+        while True:
+            with self._condition:
+                while True:
+                    key = next((key for key in self._pending if key not in self._running), None)
+                    if key is not None:
+                        break
+                    if self._closed and not self._pending:
+                        return
+                    self._condition.wait()
+
+                func, args, kwargs = self._pending.pop(key)
+                self._running.add(key)
+                # Room for a write blocked by backpressure
+                self._condition.notify_all()
+
+            error = None
+            try:
+                func(*args, **kwargs)
+            except Exception as exception:
+                error = exception
+
+            with self._condition:
+                self._running.discard(key)
+                if error is None:
+                    self._stats['written'] += 1
+                else:
+                    self._stats['failed'] += 1
+                    self._errors.append(error)
+                self._condition.notify_all()
+
+def _flush_at_exit(reference):
+
+    queue = reference()
+    if queue is not None:
+        queue.close()
@@ -15,4 +15,49 @@ def test_bq_query(envi):
 
     new_dataset = envi.gcloud.BQ.query(query).to_dataframe()
 
-    assert len(new_dataset) > 0
\ No newline at end of file
+    assert len(new_dataset) > 0
+
+def test_bq_normalize_sql():
+    from easyenvi.envs.gcloud import normalize_sql
+
+    query = """
+    SELECT  *   -- all columns
+    FROM `mydata.mytable`
+    WHERE name = 'a  b' /* keep literal */
+    """
+
+    assert normalize_sql(query) == "SELECT * FROM `mydata.mytable` WHERE name = 'a  b'"
+    assert normalize_sql(query) == normalize_sql("SELECT * FROM `mydata.mytable` WHERE name = 'a  b'")
+
+def test_bq_query_to_dataframe_cached(envi):
+    query = "SELECT * FROM mydata.mytable WHERE Age > @age"
+
+    first = envi.gcloud.BQ.query_to_dataframe(query, params={"age": 50})
+    second = envi.gcloud.BQ.query_to_dataframe(query, params={"age": 50})
+
+    assert first.equals(second)
+
+def test_bq_estimate_bytes(envi):
+    assert envi.gcloud.BQ.estimate_bytes("SELECT * FROM mydata.mytable") >= 0
+
+def test_bq_stream_append(envi):
+    dataset = envi.local.load("tests/rsc/inputs/test.parquet")
+
+    with envi.gcloud.BQ.stream_append("mydata.mytable", max_rows=10) as writer:
+        writer.append(dataset)
+
+    assert writer.metrics["rows_written"] == len(dataset)
+
+def test_bq_iter_query(envi):
+    query = "SELECT * FROM mydata.mytable WHERE Age > @age"
+
+    pages = list(envi.gcloud.BQ.iter_query(query, params={"age": 50}, page_size=10))
+
+    assert sum(len(page) for page in pages) > 0
+
+def test_bq_query_to_parquet(envi):
+    query = "SELECT * FROM mydata.mytable WHERE Age > @age"
+
+    num_rows = envi.gcloud.BQ.query_to_parquet(query, "tests/rsc/outputs/query.parquet", params={"age": 50})
+
+    assert len(envi.local.load("tests/rsc/outputs/query.parquet")) == num_rows
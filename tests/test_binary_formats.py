@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def make_artifact():
+    return {
+        "weights": np.arange(20000, dtype=np.float32).reshape(200, 100),
+        "frame": pd.DataFrame({"x": np.arange(1000), "y": np.linspace(0, 1, 1000)}),
+        "name": "model",
+    }
+
+@pytest.mark.parametrize("kwargs", [{}, {"out_of_band": True}])
+def test_pickle_out_of_band(tmp_path, kwargs):
+    from easyenvi import file
+
+    path = str(tmp_path / "artifact.pickle")
+    artifact = make_artifact()
+    file.save(artifact, path, **kwargs)
+
+    loaded = file.load(path)
+    assert np.array_equal(loaded["weights"], artifact["weights"])
+    assert loaded["frame"].equals(artifact["frame"])
+    assert loaded["name"] == "model"
+    assert file.sniff_format(path) == "pickle"
+
+def test_pickle_out_of_band_writable(tmp_path):
+    from easyenvi import file
+
+    path = str(tmp_path / "array.pickle")
+    file.save(np.zeros(1000), path, out_of_band=True)
+
+    array = file.load(path)
+    array[0] = 1
+    assert array.sum() == 1
+
+def test_npy_npz(tmp_path):
+    from easyenvi import file
+
+    array = np.random.default_rng(0).random((50, 4))
+    file.save(array, str(tmp_path / "array.npy"))
+    file.save({"a": array, "b": np.arange(3)}, str(tmp_path / "arrays.npz"), compressed=True)
+
+    assert np.array_equal(file.load(str(tmp_path / "array.npy")), array)
+    mapped = file.load(str(tmp_path / "array.npy"), mmap_mode="r")
+    assert isinstance(mapped, np.memmap) and np.array_equal(mapped, array)
+
+    arrays = file.load(str(tmp_path / "arrays.npz"))
+    assert list(arrays) == ["a", "b"] and np.array_equal(arrays["a"], array)
+
+    assert file.sniff_format(str(tmp_path / "array.npy")) == "npy"
+    assert file.sniff_format(str(tmp_path / "arrays.npz")) == "npz"
+
+@pytest.mark.parametrize("compress", [0, 3])
+def test_joblib(tmp_path, compress):
+    from easyenvi import file
+
+    path = str(tmp_path / "artifact.joblib")
+    artifact = make_artifact()
+    file.save(artifact, path, compress=compress)
+
+    loaded = file.load(path)
+    assert np.array_equal(loaded["weights"], artifact["weights"])
+    assert loaded["frame"].equals(artifact["frame"])
+
+def test_msgpack(tmp_path):
+    from easyenvi import file
+
+    path = str(tmp_path / "record.msgpack")
+    record = {"weights": np.arange(12).reshape(3, 4), "step": np.int64(7), "tags": ["a", "b"]}
+    file.save(record, path)
+
+    loaded = file.load(path)
+    assert np.array_equal(loaded["weights"], record["weights"])
+    assert loaded["step"] == 7 and loaded["tags"] == ["a", "b"]
+    loaded["weights"][0, 0] = -1
+
+    # Datetimes, empty and 0-d arrays
+    arrays = {
+        "dates": np.array(["2024-01-01", "2024-06-30"], dtype="datetime64[ns]"),
+        "durations": np.array([1, 2], dtype="timedelta64[s]"),
+        "empty": np.zeros((0, 3)),
+        "scalar": np.array(5),
+        "transposed": np.arange(6).reshape(2, 3).T,
+    }
+    file.save(arrays, path)
+    loaded = file.load(path)
+    for name, array in arrays.items():
+        assert loaded[name].dtype == array.dtype and loaded[name].shape == array.shape
+        assert np.array_equal(loaded[name], array)
+
+    path = str(tmp_path / "records.msgpack")
+    file.save(({"i": i} for i in range(100)), path, stream=True)
+    assert list(file.load(path, stream=True, buffer_size=16)) == [{"i": i} for i in range(100)]
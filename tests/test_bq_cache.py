@@ -0,0 +1,86 @@
+import datetime
+
+import pandas as pd
+import pytest
+
+QUERY = "SELECT name, age FROM `fake-project.mydata.people` WHERE age > @age"
+
+
+def make_bq(tmp_path, **kwargs):
+    from easyenvi.envs.gcloud import gcloud
+    from easyenvi.testing import FakeBigQuery
+
+    backend = FakeBigQuery(str(tmp_path / "bq"))
+    bq = backend.attach(gcloud(project_id="fake-project", BQ_cache_dir=str(tmp_path / "cache"), **kwargs).BQ)
+    bq.write(pd.DataFrame({"name": ["a", "b", "c"], "age": [10, 60, 70],
+                           "day": [datetime.date(2024, 1, d) for d in (1, 2, 3)]}), "mydata.people")
+    return backend, bq
+
+def was_cached(bq, query, **kwargs):
+    # Whether the result is served without executing the query
+    executed = []
+    run_query = bq._run_query
+    bq._run_query = lambda *args: executed.append(args) or run_query(*args)
+    try:
+        result = bq.query_to_dataframe(query, **kwargs)
+    finally:
+        del bq._run_query
+    return not executed, result
+
+def test_bq_cache_hits_normalized_query(tmp_path):
+    backend, bq = make_bq(tmp_path)
+
+    assert not was_cached(bq, QUERY, params={"age": 50})[0]
+    cached, result = was_cached(bq, "-- same query\nSELECT name,  age\nFROM `fake-project.mydata.people`"
+                                    " WHERE age > @age", params={"age": 50})
+    assert cached and result["name"].tolist() == ["b", "c"]
+
+    # Other parameters
+    assert not was_cached(bq, QUERY, params={"age": 20})[0]
+
+def test_bq_cache_invalidated_by_table_modification(tmp_path):
+    backend, bq = make_bq(tmp_path)
+
+    bq.query_to_dataframe(QUERY, params={"age": 50})
+    bq.append(pd.DataFrame({"name": ["d"], "age": [80], "day": [datetime.date(2024, 1, 4)]}), "mydata.people")
+
+    cached, result = was_cached(bq, QUERY, params={"age": 50})
+    assert not cached and result["name"].tolist() == ["b", "c", "d"]
+
+def test_bq_cache_max_size(tmp_path):
+    backend, bq = make_bq(tmp_path, BQ_cache_max_size=1)
+    assert bq.cache.max_size == 1
+
+    bq.query_to_dataframe(QUERY, params={"age": 50})
+    bq.query_to_dataframe(QUERY, params={"age": 20})
+
+    # Evicted to fit in the maximum size
+    assert not was_cached(bq, QUERY, params={"age": 50})[0]
+
+def test_bq_max_bytes_scanned_guard(tmp_path):
+    backend, bq = make_bq(tmp_path, BQ_max_bytes_scanned=10)
+
+    scanned = bq.estimate_bytes(QUERY, params={"age": 50})
+    assert scanned > 10
+
+    backend.throttle.reset()
+    with pytest.raises(ValueError, match="max_bytes_scanned"):
+        bq.query_to_dataframe(QUERY, params={"age": 50})
+    with pytest.raises(ValueError, match="max_bytes_scanned"):
+        bq.query(QUERY, params={"age": 50})
+    # Refused after the dry runs only
+    assert backend.stats["bytes_read"] == 0
+
+    bq.max_bytes_scanned = scanned
+    assert len(bq.query_to_dataframe(QUERY, params={"age": 50})) == 2
+
+def test_bq_query_parameter_types(tmp_path):
+    backend, bq = make_bq(tmp_path)
+
+    query = ("SELECT name FROM mydata.people "
+             "WHERE name IN UNNEST(@names) AND age >= @age AND day <= @day AND @flag")
+    params = {"names": ["a", "b", "c"], "age": 10.5, "day": datetime.date(2024, 1, 2), "flag": True}
+
+    assert bq.query_to_dataframe(query, params=params)["name"].tolist() == ["b"]
+    assert was_cached(bq, query, params=params)[0]
+    assert not was_cached(bq, query, params={**params, "names": ["a"]})[0]
@@ -0,0 +1,180 @@
+import threading
+
+from concurrent.futures import Future
+from types import SimpleNamespace
+
+import pytest
+
+
+class FakeWriteClient:
+    """
+    Storage Write API client recording requests. Requests are acknowledged
+    immediately (with `error` if set), or left pending when `auto_ack` is False.
+    """
+
+    def __init__(self, auto_ack=True, error=None):
+        self.auto_ack = auto_ack
+        self.error = error
+        self.requests = []
+        self.pending = []
+        self.finalized = []
+        self.committed = []
+        self.streams = []
+        self.sent = threading.Condition()
+
+    def table_path(self, project, dataset, table):
+        return f"projects/{project}/datasets/{dataset}/tables/{table}"
+
+    def create_write_stream(self, parent, write_stream):
+        return SimpleNamespace(name=f"{parent}/streams/stream-{len(self.streams)}")
+
+    def finalize_write_stream(self, name):
+        self.finalized.append(name)
+
+    def batch_commit_write_streams(self, request):
+        self.committed.extend(request.write_streams)
+        return SimpleNamespace(stream_errors=[])
+
+    def append_rows_stream(self, template):
+        stream = FakeAppendRowsStream(self)
+        self.streams.append(stream)
+        return stream
+
+class FakeAppendRowsStream:
+
+    def __init__(self, client):
+        self.client = client
+        self.closed = False
+
+    def send(self, request):
+        future = Future()
+        with self.client.sent:
+            self.client.requests.append(request)
+            if not self.client.auto_ack:
+                self.client.pending.append(future)
+            elif self.client.error is not None:
+                future.set_exception(self.client.error)
+            else:
+                future.set_result(None)
+            self.client.sent.notify_all()
+        return future
+
+    def close(self):
+        self.closed = True
+
+@pytest.fixture(autouse=True)
+def fake_append_rows_stream(monkeypatch):
+    from google.cloud.bigquery_storage_v1 import writer
+
+    monkeypatch.setattr(writer, "AppendRowsStream", lambda client, template: client.append_rows_stream(template))
+
+def make_writer(client, **kwargs):
+    from easyenvi.envs.bq_writer import BQStreamWriter
+
+    kwargs.setdefault("max_latency", 3600)
+    return BQStreamWriter("project", "mydata.mytable", write_client=client, **kwargs)
+
+def rows(count):
+    return [{"i": i} for i in range(count)]
+
+def test_writer_max_rows_threshold():
+    client = FakeWriteClient()
+
+    with make_writer(client, max_rows=10) as writer:
+        writer.append(rows(4))
+        writer.append(rows(4))
+        assert client.requests == []
+        assert writer.metrics["buffered_rows"] == 8
+
+        writer.append(rows(4))
+        assert len(client.requests) == 1
+
+    metrics = writer.metrics
+    assert metrics["rows_appended"] == metrics["rows_written"] == 12
+    assert metrics["requests"] == 1 and metrics["buffered_rows"] == 0
+
+def test_writer_max_bytes_threshold_and_flush():
+    client = FakeWriteClient()
+    writer = make_writer(client, max_rows=10**6, max_bytes=1)
+
+    writer.append(rows(2))
+    writer.append(rows(3))
+    assert len(client.requests) == 2
+
+    writer.max_bytes = 10**9
+    writer.append(rows(1))
+    writer.flush()
+    writer.close()
+
+    assert len(client.requests) == 3
+    assert writer.metrics["rows_written"] == 6
+
+def test_writer_max_latency_flush():
+    client = FakeWriteClient()
+    writer = make_writer(client, max_latency=0.01)
+
+    writer.append(rows(1))
+    with client.sent:
+        assert client.sent.wait_for(lambda: client.requests, timeout=10)
+
+    writer.close()
+
+def test_writer_backpressure():
+    client = FakeWriteClient(auto_ack=False)
+    writer = make_writer(client, max_rows=1, max_inflight=2)
+
+    writer.append(rows(1))
+    writer.append(rows(1))
+    assert writer.metrics["inflight_requests"] == 2
+
+    third_sent = threading.Event()
+
+    def append_third():
+        writer.append(rows(1))
+        third_sent.set()
+
+    thread = threading.Thread(target=append_third)
+    thread.start()
+
+    # Blocked until a request is acknowledged
+    assert len(client.requests) == 2 and not third_sent.is_set()
+    client.pending[0].set_result(None)
+    assert third_sent.wait(timeout=10)
+    thread.join()
+
+    assert len(client.requests) == 3
+    for future in client.pending[1:]:
+        future.set_result(None)
+    writer.close()
+    assert writer.metrics["rows_written"] == 3
+
+def test_writer_error_propagation():
+    client = FakeWriteClient(error=RuntimeError("append failed"))
+    writer = make_writer(client, max_rows=1)
+
+    writer.append(rows(1))
+    with pytest.raises(RuntimeError, match="append failed"):
+        writer.append(rows(1))
+
+    client.error = None
+    writer.close()
+
+def test_writer_pending_commits_on_close():
+    client = FakeWriteClient()
+
+    with make_writer(client, mode="pending") as writer:
+        writer.append(rows(3))
+
+    assert client.finalized == client.committed == ["projects/project/datasets/mydata/tables/mytable/streams/stream-0"]
+
+def test_writer_pending_aborted_on_error():
+    client = FakeWriteClient()
+
+    with pytest.raises(ValueError):
+        with make_writer(client, mode="pending", max_rows=2) as writer:
+            writer.append(rows(3))
+            raise ValueError("failed batch")
+
+    assert len(client.requests) == 1
+    assert client.finalized == [] and client.committed == []
+    assert client.streams[0].closed
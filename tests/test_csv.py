@@ -0,0 +1,47 @@
+import pandas as pd
+import pytest
+
+
+@pytest.mark.parametrize("engine", [None, "pyarrow"])
+def test_csv_engine_dtype_usecols(engine):
+    from easyenvi import file
+
+    expected = file.load("tests/rsc/inputs/test.csv")
+    df = file.load("tests/rsc/inputs/test.csv", engine=engine, dtype={"Age": "float32"}, usecols=["Name", "Age"])
+
+    assert list(df.columns) == ["Name", "Age"]
+    assert df["Age"].dtype == "float32"
+    assert df["Name"].tolist() == expected["Name"].tolist()
+
+def test_csv_parallel_blocks():
+    from easyenvi import file
+
+    expected = file.load("tests/rsc/inputs/test.csv")
+    df = file.load("tests/rsc/inputs/test.csv", parallel=True, block_size=4096, max_workers=2)
+
+    pd.testing.assert_frame_equal(df, expected)
+
+def test_csv_parallel_blocks_infer_different_dtypes(tmp_path):
+    from easyenvi import file
+
+    path = str(tmp_path / "mixed.csv")
+    with open(path, "w") as f:
+        f.write("a,b,c\n")
+        for i in range(2000):
+            f.write(f"{i},{i},x\n")
+        f.write("oops,0.5,\n")
+
+    # The last block reads "a" as strings and "b" as floats, the other ones as integers
+    expected = file.load(path)
+    df = file.load(path, parallel=True, block_size=1024, max_workers=2)
+
+    assert expected["a"].tolist()[-1] == "oops" and expected["b"].dtype == "float64"
+    pd.testing.assert_frame_equal(df, expected)
+
+def test_csv_save_without_index(tmp_path):
+    from easyenvi import file
+
+    path = str(tmp_path / "data.csv")
+    file.save(pd.DataFrame({"a": [1, 2], "b": ["x", "y"]}), path, index=False)
+
+    assert list(file.load(path).columns) == ["a", "b"]
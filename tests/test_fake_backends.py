@@ -0,0 +1,211 @@
+import os
+import time
+
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def fake_gcs(tmp_path):
+    from easyenvi.envs.gcloud import GCS
+    from easyenvi.testing import FakeGCS
+
+    with FakeGCS(str(tmp_path / "gcs")) as backend:
+        gcs = backend.attach(GCS(project_id="fake-project", GCS_path="gs://bucket/", cache_dir=str(tmp_path / "cache")))
+        yield backend, gcs
+
+@pytest.fixture
+def fake_bq(tmp_path):
+    from easyenvi.envs.gcloud import BQ
+    from easyenvi.testing import FakeBigQuery
+
+    backend = FakeBigQuery(str(tmp_path / "bq"))
+    bq = backend.attach(BQ(project_id="fake-project", cache_dir=str(tmp_path / "cache")))
+    bq.write(pd.DataFrame({"name": ["a", "b", "c"], "age": [10, 60, 70]}), "mydata.people")
+    return backend, bq
+
+def test_fake_gcs_save_load_list_delete(fake_gcs):
+
+    backend, gcs = fake_gcs
+    df = pd.DataFrame({"a": range(5)})
+    gcs.save(df, "data/a.csv", index=False)
+    gcs.save(df, "data/sub/b.parquet")
+
+    assert gcs.load("data/a.csv").equals(df)
+    assert gcs.list_files("data/") == ["data/a.csv", "data/sub/b.parquet"]
+    assert gcs.list_files("data/", delimiter="/") == ["data/a.csv", "data/sub/"]
+    assert gcs.list_files("data/", pattern="**.parquet") == ["data/sub/b.parquet"]
+
+    gcs.delete("data/**", recursive=True)
+    assert gcs.list_files("data/") == []
+
+def test_fake_gcs_delete_literal_brackets(fake_gcs):
+
+    backend, gcs = fake_gcs
+    df = pd.DataFrame({"a": range(5)})
+    for name in ["data[1].csv", "data1.csv"]:
+        gcs.save(df, f"data/{name}", index=False)
+
+    gcs.delete("data/data[1].csv")
+    assert gcs.list_files("data/") == ["data/data1.csv"]
+
+    gcs.delete("data/data[0-9].csv")
+    assert gcs.list_files("data/") == []
+
+def test_fake_gcs_cache_generation(fake_gcs):
+
+    backend, gcs = fake_gcs
+    gcs.save(pd.DataFrame({"a": [1]}), "a.csv", index=False)
+    gcs.load("a.csv")
+
+    # Served from the cache: only the metadata request is sent
+    backend.throttle.reset()
+    gcs.load("a.csv")
+    assert backend.stats == {"requests": 1, "bytes_read": 0, "bytes_written": 0}
+
+    # A new generation is downloaded again
+    gcs.save(pd.DataFrame({"a": [2]}), "a.csv", index=False)
+    assert gcs.load("a.csv")["a"].tolist() == [2]
+
+def test_fake_bq_query(fake_bq):
+
+    backend, bq = fake_bq
+    bq.append(pd.DataFrame({"name": ["d"], "age": [80]}), "mydata.people")
+
+    assert len(bq.load("mydata.people")) == 4
+
+    query = "SELECT name FROM `fake-project.mydata.people` WHERE age > @age AND name IN UNNEST(@names)"
+    params = {"age": 50, "names": ["b", "d"]}
+    assert bq.query_to_dataframe(query, params=params)["name"].tolist() == ["b", "d"]
+    assert [len(page) for page in bq.iter_query("SELECT * FROM mydata.people", page_size=3)] == [3, 1]
+
+    # Cached result: dry run and table metadata only
+    backend.throttle.reset()
+    bq.query_to_dataframe(query, params=params)
+    assert backend.stats["requests"] == 2 and backend.stats["bytes_read"] == 0
+
+def test_fake_bq_max_bytes_scanned(fake_bq):
+
+    backend, bq = fake_bq
+    bq.max_bytes_scanned = 10
+
+    with pytest.raises(ValueError):
+        bq.query("SELECT * FROM mydata.people")
+
+def test_fake_bq_query_to_parquet(fake_bq, tmp_path, monkeypatch):
+
+    backend, bq = fake_bq
+    bq.write(pd.DataFrame({"i": range(10)}), "mydata.numbers")
+    query = "SELECT i FROM mydata.numbers WHERE i >= @start"
+    output_path = str(tmp_path / "numbers.parquet")
+
+    assert bq.query_to_parquet(query, output_path, params={"start": 0}, page_size=3) == 10
+    assert pd.read_parquet(output_path)["i"].tolist() == list(range(10))
+
+    # Empty result: the columns of the result are kept
+    assert bq.query_to_parquet(query, output_path, params={"start": 100}) == 0
+    assert list(pd.read_parquet(output_path).columns) == ["i"]
+
+    # Failure after the first page: no partial file is written
+    iter_rows = bq._iter_rows
+
+    def failing_iter_rows(*args, **kwargs):
+        for i, batch in enumerate(iter_rows(*args, **kwargs)):
+            if i == 1:
+                raise ConnectionError("page lost")
+            yield batch
+
+    monkeypatch.setattr(bq, "_iter_rows", failing_iter_rows)
+    os.remove(output_path)
+    with pytest.raises(ConnectionError):
+        bq.query_to_parquet(query, output_path, params={"start": 0}, page_size=3)
+    assert not any(name.endswith(".parquet") for name in os.listdir(tmp_path))
+
+def test_fake_sharepoint(tmp_path):
+    import os
+
+    from easyenvi.envs.sharepoint import sharepoint
+    from easyenvi.testing import FakeSharePoint
+
+    backend = FakeSharePoint(str(tmp_path / "site"))
+    os.makedirs(tmp_path / "site" / "Documents" / "folder")
+    sp = backend.attach(sharepoint("https://contoso.sharepoint.com/sites/test", client_id="id", client_secret="secret"))
+
+    for i in range(5):
+        sp.upload("tests/rsc/inputs/test.csv", f"/Documents/folder/test_{i}.csv")
+    sp.upload("tests/rsc/inputs/test.txt", "/Documents/folder/test.txt")
+    assert len(sp.list_files("/Documents/folder")) == 6
+
+    sp.download("/Documents/folder/test_0.csv", str(tmp_path / "test.csv"))
+    assert (tmp_path / "test.csv").read_bytes() == open("tests/rsc/inputs/test.csv", "rb").read()
+
+    # Listing, then a single batch request for the 5 deletions
+    backend.throttle.reset()
+    assert len(sp.delete("/Documents/folder/*.csv", batch_size=100)) == 5
+    assert backend.stats["requests"] == 3
+    assert sp.list_files("/Documents/folder") == ["test.txt"]
+
+def test_fake_sharepoint_delete_literal_brackets(tmp_path):
+    import os
+
+    from easyenvi.envs.sharepoint import sharepoint
+    from easyenvi.testing import FakeSharePoint
+
+    backend = FakeSharePoint(str(tmp_path / "site"))
+    os.makedirs(tmp_path / "site" / "Documents" / "folder")
+    sp = backend.attach(sharepoint("https://contoso.sharepoint.com/sites/test", client_id="id", client_secret="secret"))
+
+    for name in ["data[1].csv", "data1.csv"]:
+        sp.upload("tests/rsc/inputs/test.csv", f"/Documents/folder/{name}")
+
+    assert sp.delete("/Documents/folder/data[1].csv") == ["/Documents/folder/data[1].csv"]
+    assert sp.list_files("/Documents/folder") == ["data1.csv"]
+
+    assert len(sp.delete("/Documents/folder/data[0-9].csv")) == 1
+    assert sp.list_files("/Documents/folder") == []
+
+    # Also looked up as a file with recursive=True
+    for name in ["data[1].csv", "data1.csv"]:
+        sp.upload("tests/rsc/inputs/test.csv", f"/Documents/folder/{name}")
+    assert sp.delete("/Documents/folder/data[1].csv", recursive=True) == ["/Documents/folder/data[1].csv"]
+    assert sp.list_files("/Documents/folder") == ["data1.csv"]
+
+def test_fake_sharepoint_delete_pattern_segments(tmp_path):
+    import os
+
+    from easyenvi.envs.sharepoint import sharepoint
+    from easyenvi.testing import FakeSharePoint
+
+    backend = FakeSharePoint(str(tmp_path / "site"))
+    for folder in ["a", "a/b"]:
+        os.makedirs(tmp_path / "site" / "Docs" / folder)
+    sp = backend.attach(sharepoint("https://contoso.sharepoint.com/sites/test", client_id="id", client_secret="secret"))
+    for path in ["/Docs/a/deep.csv", "/Docs/a/b/deep.csv", "/Docs/a/b/other.txt"]:
+        sp.upload("tests/rsc/inputs/test.csv", path)
+
+    # "*" does not cross "/"
+    assert sp.delete("/Docs/*/deep.csv") == ["/Docs/a/deep.csv"]
+    assert sp.list_files("/Docs/a/b") == ["deep.csv", "other.txt"]
+
+    # Files of matching folders with recursive=True
+    assert sorted(sp.delete("/Docs/a/*", recursive=True)) == ["/Docs/a/b/deep.csv", "/Docs/a/b/other.txt"]
+
+def test_throttle_latency_bandwidth():
+    from concurrent.futures import ThreadPoolExecutor
+
+    from easyenvi.testing import Throttle
+
+    throttle = Throttle(latency=0.05, bandwidth=1_000_000)
+
+    start = time.perf_counter()
+    throttle.request()
+    throttle.transfer(50_000)
+    assert time.perf_counter() - start >= 0.1
+
+    # Concurrent requests overlap
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda _: throttle.request(), range(8)))
+    assert time.perf_counter() - start < 0.05 * 8
+
+    assert throttle.stats == {"requests": 9, "bytes_read": 50_000, "bytes_written": 0}
@@ -0,0 +1,77 @@
+import shutil
+
+import pytest
+
+
+@pytest.mark.parametrize("local_format, sniffed_format", [
+    ("docx", "docx"), ("jpg", "jpg"), ("json", "json"), ("parquet", "parquet"),
+    ("pdf", "pdf"), ("pickle", "pickle"), ("png", "png"), ("pptx", "pptx"),
+    ("txt", "txt"), ("xlsx", "xlsx"), ("xml", "xml")
+])
+def test_sniff_extensionless_file(tmp_path, local_format, sniffed_format):
+
+    from easyenvi import file
+
+    path = tmp_path / "no_extension"
+    shutil.copy(f"tests/rsc/inputs/test.{local_format}", path)
+
+    assert file.sniff_format(str(path)) == sniffed_format
+    file.load(str(path))
+
+def test_save_extensionless_requires_format(tmp_path):
+
+    from easyenvi import file
+
+    with pytest.raises(ValueError):
+        file.save("content", str(tmp_path / "no_extension"))
+
+    file.save("content", str(tmp_path / "no_extension"), format="txt")
+    assert file.load(str(tmp_path / "no_extension"), format="txt") == "content"
+
+def test_extra_config_is_scoped_to_environment(tmp_path):
+
+    from easyenvi import EasyEnvironment, file
+
+    def upper_loader(path, **kwargs):
+        return file.load(path, format="txt").upper()
+
+    envi = EasyEnvironment(local_path=str(tmp_path), extra_loader_config={"txt": upper_loader})
+    file.save("content", str(tmp_path / "test.txt"))
+
+    assert envi.local.load("test.txt") == "CONTENT"
+    assert file.load(str(tmp_path / "test.txt")) == "content"
+
+def test_register_format(tmp_path):
+
+    from easyenvi import file
+
+    file.register_format(
+        "upper",
+        loader=lambda path, **kwargs: file.load(path, format="txt"),
+        saver=lambda obj, path, **kwargs: file.save(obj.upper(), path, format="txt")
+        )
+
+    try:
+        file.save("content", str(tmp_path / "test.upper"))
+        assert file.load(str(tmp_path / "test.upper")) == "CONTENT"
+    finally:
+        file.loader_config.pop("upper")
+        file.saver_config.pop("upper")
+
+def test_sniff_utf8_cut_at_head_boundary(tmp_path):
+    from easyenvi import file
+    from easyenvi.file.registry import SNIFF_SIZE
+
+    # "é" (2 bytes) straddles the end of the sniffed head
+    text = '{"text": "' + "a" * (SNIFF_SIZE - 11) + "é" * 10 + '"}'
+    path = tmp_path / "no_extension"
+    path.write_text(text, encoding="utf-8")
+
+    assert file.sniff_format(str(path)) == "json"
+    assert file.load(str(path)) == {"text": "a" * (SNIFF_SIZE - 11) + "é" * 10}
+
+def test_error_handler_keeps_docstrings():
+    from easyenvi.envs.disk import disk
+
+    assert disk.load.__name__ == "load"
+    assert "Load a file" in disk.load.__doc__
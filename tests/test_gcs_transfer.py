@@ -0,0 +1,120 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def fake_gcs(tmp_path):
+    from easyenvi.envs.gcloud import GCS
+    from easyenvi.testing import FakeGCS
+
+    with FakeGCS(str(tmp_path / "gcs")) as backend:
+        gcs = backend.attach(GCS(project_id="fake-project", GCS_path="gs://bucket/",
+                                 parallel_threshold=1000, parallel_slices=4))
+        yield backend, gcs
+
+def test_slice_ranges():
+    from easyenvi.envs.gcs_transfer import slice_ranges
+
+    assert slice_ranges(10, 3) == [(0, 3), (3, 6), (6, 10)]
+    assert slice_ranges(2, 8) == [(0, 1), (1, 2)]
+
+def test_composite_upload(fake_gcs, tmp_path):
+    from easyenvi.envs.gcs_transfer import file_crc32c
+
+    backend, gcs = fake_gcs
+    source = tmp_path / "big.bin"
+    source.write_bytes(os.urandom(10_000))
+
+    gcs.upload(str(source), "data/big.bin")
+
+    # 4 parts uploaded, composed, then deleted
+    assert gcs.list_files("data/") == ["data/big.bin"]
+    assert backend.stats["bytes_written"] == 10_000
+    assert backend.object_info("bucket", "data/big.bin")["crc32c"] == file_crc32c(str(source))
+    with open(backend.local_path("bucket", "data/big.bin"), "rb") as f:
+        assert f.read() == source.read_bytes()
+
+def test_sliced_download(fake_gcs, tmp_path):
+
+    backend, gcs = fake_gcs
+    data = os.urandom(10_001)
+    (tmp_path / "source.bin").write_bytes(data)
+    gcs.upload(str(tmp_path / "source.bin"), "big.bin")
+
+    backend.throttle.reset()
+    gcs.download("big.bin", str(tmp_path / "copy.bin"))
+
+    assert (tmp_path / "copy.bin").read_bytes() == data
+    # Metadata request, then one request per range
+    assert backend.stats["requests"] == 5
+
+def test_small_files_single_stream(fake_gcs, tmp_path):
+
+    backend, gcs = fake_gcs
+    gcs.save(pd.DataFrame({"a": [1, 2]}), "small.csv", index=False)
+    gcs.download("small.csv", str(tmp_path / "small.csv"))
+
+    assert pd.read_csv(tmp_path / "small.csv")["a"].tolist() == [1, 2]
+    assert backend.iter_objects("bucket") == ["small.csv"]
+
+def test_large_save_and_cached_load(tmp_path):
+    from easyenvi.envs.gcloud import GCS
+    from easyenvi.testing import FakeGCS
+
+    df = pd.DataFrame({"a": np.arange(5000), "b": np.random.default_rng(0).random(5000)})
+    with FakeGCS(str(tmp_path / "gcs")) as backend:
+        gcs = backend.attach(GCS(project_id="fake-project", GCS_path="gs://bucket/",
+                                 cache_dir=str(tmp_path / "cache"), parallel_threshold=1000))
+        gcs.save(df, "data.parquet")
+
+        assert backend.iter_objects("bucket") == ["data.parquet"]
+        assert gcs.load("data.parquet").equals(df)
+
+def test_sliced_download_checksum_mismatch(fake_gcs, tmp_path, monkeypatch):
+    from easyenvi.testing.gcs import FakeBlob
+
+    backend, gcs = fake_gcs
+    (tmp_path / "source.bin").write_bytes(os.urandom(5000))
+    gcs.upload(str(tmp_path / "source.bin"), "big.bin")
+
+    download_to_file = FakeBlob.download_to_file
+
+    def corrupted_download(self, file_obj, start=None, end=None, **kwargs):
+        download_to_file(self, file_obj, start=start, end=end, **kwargs)
+        if start == 0:
+            file_obj.seek(0)
+            file_obj.write(b"\x00")
+
+    monkeypatch.setattr(FakeBlob, "download_to_file", corrupted_download)
+
+    with pytest.raises(ValueError, match="CRC32C"):
+        gcs.download("big.bin", str(tmp_path / "copy.bin"))
+    assert not (tmp_path / "copy.bin").exists()
+
+def test_small_download_checksum_mismatch(fake_gcs, tmp_path, monkeypatch):
+    from easyenvi.testing.gcs import FakeGCSFile
+
+    backend, gcs = fake_gcs
+    (tmp_path / "source.bin").write_bytes(os.urandom(500))
+    gcs.upload(str(tmp_path / "source.bin"), "small.bin")
+
+    fetch_range = FakeGCSFile._fetch_range
+
+    def corrupted_fetch(self, start, end):
+        data = fetch_range(self, start, end)
+        return bytes([data[0] ^ 0xff]) + data[1:] if start == 0 else data
+
+    monkeypatch.setattr(FakeGCSFile, "_fetch_range", corrupted_fetch)
+
+    with pytest.raises(ValueError, match="CRC32C"):
+        gcs.download("small.bin", str(tmp_path / "copy.bin"))
+    assert not (tmp_path / "copy.bin").exists()
+
+def test_parallel_slices_limit():
+    from easyenvi.envs.gcloud import GCS
+
+    with pytest.raises(ValueError):
+        GCS(project_id="fake-project", GCS_path="gs://bucket/", parallel_slices=33)
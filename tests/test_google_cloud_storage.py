@@ -1,7 +1,7 @@
 import pytest
 
 @pytest.mark.parametrize("gcs_format", [
-    "csv", "docx", "json", "md", "parquet", "pdf", "pptx",
+    "csv", "docx", "jpg", "json", "md", "parquet", "pdf", "png", "pptx",
     "sql", "toml", "txt", "xlsx", "xml", "yaml", "yml"
 ])
 def test_gcs_load_save(envi, gcs_format):
@@ -10,4 +10,9 @@ def test_gcs_load_save(envi, gcs_format):
 
     # Google Cloud Storage operations
     test = envi.gcloud.GCS.load(gcs_path)
-    envi.gcloud.GCS.save(test, gcs_path)
\ No newline at end of file
+    envi.gcloud.GCS.save(test, gcs_path)
+
+def test_gcs_load_images(envi):
+    images = envi.gcloud.GCS.load_images(["test.jpg", "test.png"], size=(64, 64))
+
+    assert images.shape == (2, 64, 64, 3)
@@ -0,0 +1,36 @@
+import pytest
+
+
+def test_load_images_resized(envi):
+    images = envi.local.load_images(
+        ["tests/rsc/inputs/test.jpg", "tests/rsc/inputs/test.png"],
+        size=(64, 32)
+        )
+
+    assert images.shape == (2, 32, 64, 3)
+    assert images.dtype == "uint8"
+
+def test_load_images_normalized(envi):
+    images = envi.local.load_images("tests/rsc/inputs/test.jpg", size=(16, 16), mode="L", normalize=True)
+
+    assert images.shape == (1, 16, 16, 1)
+    assert images.dtype == "float32"
+    assert 0 <= images.min() and images.max() <= 1
+
+def test_load_images_requires_size_for_different_shapes(envi):
+    with pytest.raises(ValueError):
+        envi.local.load_images(["tests/rsc/inputs/test.jpg", "tests/rsc/inputs/test.png"], size=None)
+
+def test_save_images(tmp_path):
+    from easyenvi import EasyEnvironment
+
+    import numpy as np
+
+    envi = EasyEnvironment(local_path=str(tmp_path))
+
+    images = np.random.default_rng(0).integers(0, 255, size=(3, 8, 8, 3), dtype="uint8")
+    envi.local.save_images(images, ["a.png", "b.png", "c.jpg"])
+
+    reloaded = envi.local.load_images(["a.png", "b.png"])
+    assert (reloaded == images[:2]).all()
+    assert envi.local.load("c.jpg").size == (8, 8)
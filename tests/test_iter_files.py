@@ -0,0 +1,84 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+
+def test_prefetch_map_order_and_overlap():
+    from easyenvi.utils import prefetch_map
+
+    # Each call waits for 8 calls to run concurrently
+    barrier = threading.Barrier(8, timeout=10)
+
+    def square(x):
+        barrier.wait()
+        return x * x
+
+    assert list(prefetch_map(square, range(16), depth=8, max_workers=8)) == [x * x for x in range(16)]
+
+def test_prefetch_map_max_bytes():
+    from easyenvi.utils import prefetch_map
+
+    started = []
+
+    def items():
+        for i in range(20):
+            started.append(i)
+            yield i
+
+    # Items are only started by the consumer, when the results held ahead allow it
+    iterator = prefetch_map(lambda i: np.zeros(1000, dtype=np.uint8), items(), depth=10, max_workers=1, max_bytes=2500)
+    next(iterator)
+
+    # Loading stops once 3 arrays of 1000 bytes are held ahead
+    assert len(started) <= 4
+    assert sum(1 for _ in iterator) == 19
+
+def test_select_shard():
+    from easyenvi.utils import select_shard
+
+    paths = [f"file_{i}" for i in range(10)]
+    shards = [select_shard(paths, shuffle=True, seed=0, shard_index=i, num_shards=3) for i in range(3)]
+
+    assert sorted(sum(shards, [])) == sorted(paths)
+    assert shards[0] == select_shard(paths, shuffle=True, seed=0, shard_index=0, num_shards=3)
+    assert select_shard(paths) == sorted(paths)
+
+def test_disk_iter_files(tmp_path):
+    from easyenvi.envs.disk import disk
+
+    local = disk(root_path=str(tmp_path))
+    for i in range(6):
+        local.save(pd.DataFrame({"i": [i]}), f"data/part_{i}.csv", index=False)
+    local.save("ignored", "data/notes.txt")
+
+    values = [df["i"][0] for df in local.iter_files("data/*.csv")]
+    assert values == list(range(6))
+
+    paths = [path for path, _ in local.iter_files("data", with_paths=True, shard_index=1, num_shards=2)]
+    assert paths == ["data/part_0.csv", "data/part_2.csv", "data/part_4.csv"]
+
+def test_gcs_iter_files(tmp_path, monkeypatch):
+    from easyenvi.envs.gcloud import GCS
+    from easyenvi.testing import FakeGCS
+
+    with FakeGCS(str(tmp_path / "gcs")) as backend:
+        gcs = backend.attach(GCS(project_id="fake-project", GCS_path="gs://bucket/base/"))
+        for i in range(8):
+            gcs.save(pd.DataFrame({"i": [i]}), f"data/part_{i}.csv", index=False)
+        gcs.save(pd.DataFrame({"i": [-1]}), "data/sub/other.parquet")
+
+        assert [df["i"][0] for df in gcs.iter_files("data/*.csv")] == list(range(8))
+        assert len(list(gcs.iter_files("data/"))) == 9
+
+        # Downloads overlap: each load waits for the 8 loads to run concurrently
+        barrier = threading.Barrier(8, timeout=10)
+        load = gcs.load
+
+        def concurrent_load(*args, **kwargs):
+            barrier.wait()
+            return load(*args, **kwargs)
+
+        monkeypatch.setattr(gcs, "load", concurrent_load)
+        items = list(gcs.iter_files("data/*.csv", prefetch=8, max_workers=8, with_paths=True))
+        assert items[0][0] == "data/part_0.csv"
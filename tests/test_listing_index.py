@@ -0,0 +1,90 @@
+import base64
+import json
+
+
+def entry(name, generation=1):
+    return {'name': name, 'size': 10, 'md5': 'md5', 'generation': generation, 'updated': '2024-01-01T00:00:00+00:00'}
+
+def test_listing_index_query(tmp_path):
+
+    from easyenvi.envs.listing_index import ListingIndex
+
+    index = ListingIndex(str(tmp_path / "index.db"))
+    index.replace("bucket", "data/", [entry("data/a.csv"), entry("data/b.txt"), entry("data/sub/c.csv")])
+
+    assert index.is_fresh("bucket", "data/")
+    assert index.is_fresh("bucket", "data/sub/")
+    assert not index.is_fresh("bucket", "other/")
+
+    names = [e['name'] for e in index.query("bucket", "data/")]
+    assert names == ["data/a.csv", "data/b.txt", "data/sub/c.csv"]
+
+    names = [e['name'] for e in index.query("bucket", "data/", delimiter="/")]
+    assert names == ["data/a.csv", "data/b.txt", "data/sub/"]
+
+    names = [e['name'] for e in index.query("bucket", "data/", pattern="data/*.csv")]
+    assert names == ["data/a.csv"]
+
+    names = [e['name'] for e in index.query("bucket", "data/", pattern="data/**.csv")]
+    assert names == ["data/a.csv", "data/sub/c.csv"]
+
+def test_listing_index_ttl(tmp_path):
+
+    from easyenvi.envs.listing_index import ListingIndex
+
+    index = ListingIndex(str(tmp_path / "index.db"), ttl=0)
+    index.replace("bucket", "data/", [entry("data/a.csv")])
+
+    assert not index.is_fresh("bucket", "data/")
+
+def test_listing_index_replay_notifications(tmp_path):
+
+    from easyenvi.envs.listing_index import ListingIndex
+
+    index = ListingIndex(str(tmp_path / "index.db"), ttl=None)
+    index.replace("bucket", "data/", [entry("data/a.csv"), entry("data/b.csv")])
+
+    def message(event_type, name, generation):
+        resource = {'bucket': 'bucket', 'name': name, 'size': '5', 'generation': str(generation)}
+        data = base64.b64encode(json.dumps(resource).encode()).decode()
+        return json.dumps({'attributes': {'eventType': event_type}, 'data': data}) + "\n"
+
+    notifications = tmp_path / "notifications.jsonl"
+    with open(notifications, "w") as f:
+        f.write(message("OBJECT_FINALIZE", "data/c.csv", 1))
+        f.write(message("OBJECT_DELETE", "data/a.csv", 1))
+
+    assert index.replay_notifications(str(notifications)) == 2
+    assert [e['name'] for e in index.query("bucket", "data/")] == ["data/b.csv", "data/c.csv"]
+
+    # Only new notifications are applied, and stale deletions are ignored
+    with open(notifications, "a") as f:
+        f.write(message("OBJECT_FINALIZE", "data/b.csv", 3))
+        f.write(message("OBJECT_DELETE", "data/b.csv", 2))
+
+    assert index.replay_notifications(str(notifications)) == 2
+    assert [(e['name'], e['generation']) for e in index.query("bucket", "data/")] == [("data/b.csv", 3), ("data/c.csv", 1)]
+
+def test_listing_index_follows_own_writes(tmp_path):
+    import pandas as pd
+
+    from easyenvi.envs.gcloud import GCS
+    from easyenvi.testing import FakeGCS
+
+    df = pd.DataFrame({"a": [1, 2]})
+    with FakeGCS(str(tmp_path / "gcs")) as backend:
+        gcs = backend.attach(GCS(project_id="fake-project", GCS_path="gs://bucket/",
+                                 listing_index_path=str(tmp_path / "index.db"), listing_ttl=None))
+
+        gcs.save(df, "data/a.csv", index=False)
+        assert gcs.list_files("data/") == ["data/a.csv"]
+
+        gcs.save(df, "data/b.csv", index=False)
+        gcs.upload(str(tmp_path / "gcs" / "bucket" / "data" / "b.csv"), "data/c.csv")
+        gcs.delete("data/a.csv")
+
+        # Served from the index, without listing again
+        backend.throttle.reset()
+        assert gcs.list_files("data/") == ["data/b.csv", "data/c.csv"]
+        assert backend.stats["requests"] == 0
+        assert [len(df) for df in gcs.iter_files("data/")] == [2, 2]
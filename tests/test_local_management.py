@@ -0,0 +1,66 @@
+import os
+
+import pytest
+
+
+def make_tree(root):
+    for relative_path in ["a.csv", "b.txt", "sub/c.csv", "sub/deeper/d.csv"]:
+        path = root / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("content")
+
+def test_clear_folder_with_subfolders(tmp_path):
+
+    from easyenvi import EasyEnvironment
+
+    make_tree(tmp_path)
+    envi = EasyEnvironment(local_path=str(tmp_path))
+
+    envi.local.clear_folder("")
+
+    assert os.listdir(tmp_path) == []
+
+def test_delete_glob(tmp_path):
+
+    from easyenvi import EasyEnvironment
+
+    make_tree(tmp_path)
+    envi = EasyEnvironment(local_path=str(tmp_path))
+
+    envi.local.delete("*.csv")
+    assert sorted(os.listdir(tmp_path)) == ["b.txt", "sub"]
+
+    envi.local.delete("**/*.csv")
+    assert not (tmp_path / "sub" / "c.csv").exists()
+    assert (tmp_path / "sub" / "deeper").is_dir()
+
+def test_delete_literal_path_with_brackets(tmp_path):
+
+    from easyenvi import EasyEnvironment
+
+    for name in ["data[1].csv", "data1.csv"]:
+        (tmp_path / name).write_text("content")
+    envi = EasyEnvironment(local_path=str(tmp_path))
+
+    # Existing path taken literally, not as a pattern matching "data1.csv"
+    assert envi.local.delete("data[1].csv") == [str(tmp_path / "data[1].csv")]
+    assert os.listdir(tmp_path) == ["data1.csv"]
+
+    envi.local.delete("data[0-9].csv")
+    assert os.listdir(tmp_path) == []
+
+def test_delete_folder_requires_recursive(tmp_path):
+
+    from easyenvi import EasyEnvironment
+
+    make_tree(tmp_path)
+    envi = EasyEnvironment(local_path=str(tmp_path))
+
+    with pytest.raises(IsADirectoryError):
+        envi.local.delete("sub")
+
+    envi.local.delete("sub", recursive=True)
+    assert sorted(os.listdir(tmp_path)) == ["a.csv", "b.txt"]
+
+    with pytest.raises(FileNotFoundError):
+        envi.local.delete("missing*")
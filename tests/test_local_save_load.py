@@ -2,7 +2,7 @@ import pytest
 
 
 @pytest.mark.parametrize("local_format", [
-    "csv", "docx", "jpg", "json", "md", "parquet", "pdf", "png", "pptx",
+    "csv", "docx", "jpg", "json", "jsonl", "md", "parquet", "pdf", "png", "pptx",
     "sql", "toml", "txt", "xlsx", "xml", "yaml", "yml"
 ])
 def test_local_load_save(envi, local_format):
@@ -15,7 +15,7 @@ def test_local_load_save(envi, local_format):
     envi.local.save(test, output_path)
 
 @pytest.mark.parametrize("local_format", [
-    "csv", "docx", "jpg", "json", "md", "parquet", "pdf", "png", "pptx",
+    "csv", "docx", "jpg", "json", "jsonl", "md", "parquet", "pdf", "png", "pptx",
     "sql", "toml", "txt", "xlsx", "xml", "yaml", "yml"
 ])
 def test_local_load_save_file_method(local_format):
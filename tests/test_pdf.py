@@ -0,0 +1,59 @@
+import pytest
+
+
+@pytest.fixture
+def multi_page_pdf(tmp_path):
+    from PyPDF2 import PdfReader, PdfWriter
+
+    reader = PdfReader("tests/rsc/inputs/test.pdf")
+    writer = PdfWriter()
+    for _ in range(5):
+        writer.add_page(reader.pages[0])
+
+    path = str(tmp_path / "multi_page.pdf")
+    with open(path, "wb") as f:
+        writer.write(f)
+
+    return path
+
+def test_pdf_lazy_page_range(multi_page_pdf, tmp_path):
+    from easyenvi import file
+
+    with file.load(multi_page_pdf, pages=range(1, 3)) as document:
+        assert len(document) == 2
+        assert "CARTE" in document.pages[0].extract_text()
+
+        file.save(document, str(tmp_path / "extract.pdf"))
+
+    assert len(file.load(str(tmp_path / "extract.pdf")).pages) == 2
+
+def test_pdf_parallel_text_extraction(multi_page_pdf):
+    from easyenvi import file
+
+    texts = file.extract_text([multi_page_pdf, "tests/rsc/inputs/test.pdf"], max_workers=2, pages_per_task=2)
+
+    assert [len(document) for document in texts] == [5, 1]
+    assert texts[0][4] == texts[1][0]
+
+def test_pdf_page_out_of_range():
+    from easyenvi import file
+
+    with pytest.raises(IndexError):
+        file.load("tests/rsc/inputs/test.pdf", pages=[3])
+
+def test_pdf_closed_on_invalid_pages(monkeypatch):
+    from easyenvi.file.pdf import PdfDocument
+
+    closed = []
+    close = PdfDocument.close
+
+    def recording_close(self):
+        closed.append(self._file)
+        close(self)
+
+    monkeypatch.setattr(PdfDocument, "close", recording_close)
+
+    with pytest.raises(IndexError):
+        PdfDocument("tests/rsc/inputs/test.pdf", pages=[3])
+
+    assert len(closed) == 1 and closed[0].closed
@@ -0,0 +1,37 @@
+import threading
+
+import pytest
+
+
+def test_prefetch_preserves_order():
+    from easyenvi.utils import prefetch
+
+    assert list(prefetch(range(100), depth=3)) == list(range(100))
+    assert list(prefetch(range(10), depth=0)) == list(range(10))
+
+def test_prefetch_overlaps_production():
+    from easyenvi.utils import prefetch
+
+    produced = [threading.Event() for _ in range(4)]
+
+    def pages():
+        for page in range(4):
+            produced[page].set()
+            yield page
+
+    for page in prefetch(pages(), depth=1):
+        # The next page is produced while the current one is processed
+        if page < 3:
+            assert produced[page + 1].wait(timeout=10)
+
+def test_prefetch_reraises_producer_errors():
+    from easyenvi.utils import prefetch
+
+    def failing_pages():
+        yield 1
+        raise RuntimeError("page error")
+
+    iterator = prefetch(failing_pages())
+    assert next(iterator) == 1
+    with pytest.raises(RuntimeError):
+        next(iterator)
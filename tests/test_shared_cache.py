@@ -0,0 +1,127 @@
+import multiprocessing
+import os
+import time
+
+
+def slow_fetch(counter_path, local_path):
+    with open(counter_path, "a") as f:
+        f.write("x")
+    time.sleep(0.2)
+    with open(local_path, "w") as f:
+        f.write("content")
+
+def read_through_cache(cache_dir, counter_path):
+    from functools import partial
+
+    from easyenvi.cache import SharedCache
+
+    cache = SharedCache(cache_dir)
+    with cache.open("gcs:gs://bucket/object.txt#1", partial(slow_fetch, counter_path), suffix=".txt") as path:
+        with open(path) as f:
+            return f.read()
+
+def test_shared_cache_fetches_once_across_processes(tmp_path):
+
+    counter_path = str(tmp_path / "counter")
+    cache_dir = str(tmp_path / "cache")
+
+    with multiprocessing.get_context("spawn").Pool(4) as pool:
+        results = pool.starmap(read_through_cache, [(cache_dir, counter_path)] * 8)
+
+    assert results == ["content"] * 8
+    with open(counter_path) as f:
+        assert f.read() == "x"
+
+def test_shared_cache_eviction_skips_active_readers(tmp_path):
+
+    from easyenvi.cache import SharedCache
+
+    def write(content):
+        def fetch(local_path):
+            with open(local_path, "w") as f:
+                f.write(content)
+        return fetch
+
+    cache = SharedCache(str(tmp_path / "cache"))
+
+    with cache.open("in-use", write("a" * 100)) as in_use_path:
+        with cache.open("idle", write("b" * 100)) as idle_path:
+            pass
+
+        cache.evict(max_size=0)
+
+        assert os.path.exists(in_use_path)
+        assert not os.path.exists(idle_path)
+
+    cache.clear()
+    assert not os.path.exists(in_use_path)
+
+def test_shared_cache_ttl(tmp_path):
+
+    from easyenvi.cache import SharedCache
+
+    calls = []
+
+    def fetch(local_path):
+        calls.append(local_path)
+        with open(local_path, "w") as f:
+            f.write("content")
+
+    cache = SharedCache(str(tmp_path / "cache"), ttl=0.1)
+
+    with cache.open("key", fetch):
+        pass
+    with cache.open("key", fetch):
+        pass
+    time.sleep(0.15)
+    with cache.open("key", fetch):
+        pass
+
+    assert len(calls) == 2
+
+def test_shared_cache_eviction_removes_lock_files(tmp_path):
+
+    from easyenvi.cache import SharedCache
+
+    def fetch(local_path):
+        with open(local_path, "w") as f:
+            f.write("content")
+
+    def failing_fetch(local_path):
+        raise OSError("unreachable")
+
+    cache = SharedCache(str(tmp_path / "cache"))
+    for key in ["a", "b", "c"]:
+        with cache.open(key, fetch):
+            pass
+    try:
+        with cache.open("d", failing_fetch):
+            pass
+    except OSError:
+        pass
+
+    assert len(os.listdir(cache.locks_dir)) == 4
+    cache.clear()
+    assert os.listdir(cache.locks_dir) == [] and os.listdir(cache.objects_dir) == []
+
+def test_file_lock_follows_removed_lock_file(tmp_path):
+    import threading
+
+    from easyenvi.cache.file_lock import FileLock
+
+    path = str(tmp_path / "entry.lock")
+    holder, waiter = FileLock(path), FileLock(path)
+    holder.acquire()
+
+    acquired = threading.Event()
+    thread = threading.Thread(target=lambda: waiter.acquire() and acquired.set())
+    thread.start()
+
+    # The waiter ends up holding the new lock file, not the removed one
+    holder.remove()
+    holder.release()
+    assert acquired.wait(timeout=10)
+    thread.join()
+
+    assert not FileLock(path).acquire(blocking=False)
+    waiter.release()
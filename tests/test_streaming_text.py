@@ -0,0 +1,58 @@
+import types
+
+
+def test_jsonl_stream(tmp_path):
+    from easyenvi import file
+
+    records = file.load("tests/rsc/inputs/test.jsonl", stream=True, buffer_size=8)
+
+    assert isinstance(records, types.GeneratorType)
+    assert [record["name"] for record in records] == ["Alice", "Bob", "Chloé"]
+
+def test_jsonl_save_iterable(tmp_path):
+    from easyenvi import file
+
+    path = str(tmp_path / "records.ndjson")
+    file.save(({"i": i} for i in range(1000)), path, buffer_size=64)
+
+    assert file.load(path) == [{"i": i} for i in range(1000)]
+
+def test_txt_stream_lines(tmp_path):
+    from easyenvi import file
+
+    path = str(tmp_path / "log.txt")
+    file.save((f"line {i}" for i in range(100)), path)
+
+    lines = file.load(path, stream=True, buffer_size=10)
+    assert list(lines) == [f"line {i}" for i in range(100)]
+    assert file.load(path) == "".join(f"line {i}\n" for i in range(100))
+
+def test_sniff_jsonl(tmp_path):
+    import shutil
+
+    from easyenvi import file
+
+    path = tmp_path / "no_extension"
+    shutil.copy("tests/rsc/inputs/test.jsonl", path)
+
+    assert file.sniff_format(str(path)) == "jsonl"
+
+def test_json_round_trip_beyond_orjson(tmp_path):
+    import math
+
+    from easyenvi import file
+
+    obj = {"a": float("nan"), "big": 2**70, 1: "one"}
+
+    file.save(obj, str(tmp_path / "data.json"))
+    loaded = file.load(str(tmp_path / "data.json"))
+    assert math.isnan(loaded["a"]) and loaded["big"] == 2**70 and loaded["1"] == "one"
+
+    # 19 digits, below the 64-bit range
+    file.save({"negative": -9999999999999999999}, str(tmp_path / "negative.json"))
+    assert file.load(str(tmp_path / "negative.json")) == {"negative": -9999999999999999999}
+
+    file.save([obj, {"i": 1}], str(tmp_path / "data.jsonl"))
+    records = file.load(str(tmp_path / "data.jsonl"))
+    assert math.isnan(records[0]["a"]) and records[0]["big"] == 2**70 and records[0]["1"] == "one"
+    assert records[1] == {"i": 1}
@@ -0,0 +1,166 @@
+import os
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+
+def test_write_behind_coalesce():
+    from easyenvi.utils import WriteBehindQueue
+
+    started, release = threading.Event(), threading.Event()
+    written = []
+
+    def blocking_write(value):
+        started.set()
+        release.wait()
+        written.append(value)
+
+    with WriteBehindQueue(max_workers=1) as queue:
+        queue.submit("a", blocking_write, 0)
+        started.wait()
+
+        # Waiting writes of a same key are replaced by the latest one
+        for value in range(1, 5):
+            queue.submit("a", written.append, value)
+        release.set()
+        queue.flush()
+
+        assert written == [0, 4]
+        assert queue.metrics["coalesced"] == 3
+
+def test_write_behind_backpressure():
+    from easyenvi.utils import WriteBehindQueue
+
+    release = threading.Event()
+    queue = WriteBehindQueue(max_workers=1, max_pending=1)
+    queue.submit("a", release.wait)
+    queue.submit("b", lambda: None)
+
+    submitted = threading.Event()
+    thread = threading.Thread(target=lambda: (queue.submit("c", lambda: None), submitted.set()))
+    thread.start()
+
+    assert not submitted.wait(0.2)
+    release.set()
+    assert submitted.wait(5)
+
+    queue.close()
+    assert queue.metrics["written"] == 3
+
+def test_write_behind_errors():
+    from easyenvi.utils import WriteBehindQueue
+
+    def fail():
+        raise OSError("upload failed")
+
+    queue = WriteBehindQueue()
+    queue.submit("a", fail)
+
+    with pytest.raises(OSError):
+        queue.flush()
+    queue.flush()
+
+def test_write_behind_local(tmp_path):
+    from easyenvi import EasyEnvironment
+
+    df = pd.DataFrame({"a": range(10)})
+    with EasyEnvironment(local_path=str(tmp_path), write_behind=True) as envi:
+        for i in range(20):
+            envi.local.save(df, f"data_{i}.csv", index=False)
+
+        # Pending writes of a path are awaited before reading it
+        assert envi.local.load("data_0.csv").equals(df)
+
+    assert len(list(tmp_path.glob("*.csv"))) == 20
+
+def test_write_behind_save_then_delete(tmp_path):
+    from easyenvi import EasyEnvironment
+
+    df = pd.DataFrame({"a": range(10)})
+    with EasyEnvironment(local_path=str(tmp_path), write_behind=True, write_behind_workers=1) as envi:
+        # The only worker is busy: "x.csv" stays queued until the release
+        release = threading.Event()
+        envi.write_queue.submit("blocker", release.wait)
+        envi.local.save(df, "x.csv", index=False)
+
+        errors = []
+        thread = threading.Thread(target=lambda: errors.extend(_raised(envi.local.delete, "x.csv")))
+        thread.start()
+        try:
+            # The deletion waits for the queued write instead of failing
+            thread.join(0.1)
+            assert thread.is_alive()
+        finally:
+            release.set()
+        thread.join()
+        assert errors == []
+
+        for i in range(5):
+            envi.local.save(df, f"out/data_{i}.csv", index=False)
+        assert len(envi.local.delete("out/*.csv")) == 5
+
+        envi.flush()
+        assert sorted(os.listdir(tmp_path)) == ["out"]
+        assert os.listdir(tmp_path / "out") == []
+
+def test_write_behind_gcs_save_then_list_and_delete(tmp_path):
+    from easyenvi.envs.gcloud import GCS
+    from easyenvi.testing import FakeGCS
+    from easyenvi.utils import WriteBehindQueue
+
+    df = pd.DataFrame({"a": range(10)})
+    with FakeGCS(str(tmp_path / "gcs")) as backend, WriteBehindQueue(max_workers=4) as queue:
+        gcs = backend.attach(GCS(project_id="fake-project", GCS_path="gs://bucket/", write_queue=queue))
+
+        for i in range(4):
+            gcs.save(df, f"data/data_{i}.csv", index=False)
+        assert len(gcs.list_files("data/")) == 4
+
+        gcs.save(df, "data/data_4.csv", index=False)
+        gcs.delete("data/*.csv")
+        gcs.flush()
+        assert gcs.list_files("data/") == []
+
+def test_write_behind_gcs_latency(tmp_path):
+    from easyenvi.envs.gcloud import GCS
+    from easyenvi.testing import FakeGCS
+    from easyenvi.utils import WriteBehindQueue
+
+    df = pd.DataFrame({"a": range(10)})
+    with FakeGCS(str(tmp_path / "gcs"), latency=0.05) as backend, WriteBehindQueue(max_workers=8) as queue:
+        gcs = backend.attach(GCS(project_id="fake-project", GCS_path="gs://bucket/", write_queue=queue))
+
+        start = time.perf_counter()
+        for i in range(16):
+            gcs.save(df, f"data_{i}.csv", index=False)
+        assert time.perf_counter() - start < 0.05 * 16
+
+        gcs.flush()
+        assert len(gcs.list_files("")) == 16
+
+def test_write_behind_sharepoint(tmp_path):
+    from easyenvi.envs.sharepoint import sharepoint
+    from easyenvi.testing import FakeSharePoint
+    from easyenvi.utils import WriteBehindQueue
+
+    (tmp_path / "site" / "Documents").mkdir(parents=True)
+    backend = FakeSharePoint(str(tmp_path / "site"), latency=0.01)
+
+    with WriteBehindQueue(max_workers=4) as queue:
+        sp = backend.attach(sharepoint("https://contoso.sharepoint.com/sites/test", client_id="id",
+                                       client_secret="secret", write_queue=queue))
+        for i in range(10):
+            sp.upload("tests/rsc/inputs/test.csv", f"/Documents/test_{i}.csv")
+
+        sp.download("/Documents/test_9.csv", str(tmp_path / "test.csv"))
+        sp.flush()
+        assert len(sp.list_files("/Documents")) == 10
+
+def _raised(func, *args):
+    try:
+        func(*args)
+    except Exception as error:
+        return [error]
+    return []
\ No newline at end of file
@@ -0,0 +1,103 @@
+import types
+
+import pandas as pd
+import pytest
+
+
+def test_xlsx_stream():
+    from easyenvi import file
+
+    expected = file.load("tests/rsc/inputs/test.xlsx")
+    chunks = file.load("tests/rsc/inputs/test.xlsx", stream=True, chunk_size=100)
+
+    assert isinstance(chunks, types.GeneratorType)
+    chunks = list(chunks)
+    assert all(len(chunk) <= 100 for chunk in chunks)
+    assert sum(len(chunk) for chunk in chunks) == len(expected)
+    assert list(chunks[0].columns) == list(expected.columns)
+    assert chunks[0]["Name"].tolist() == expected["Name"].tolist()[:100]
+
+@pytest.mark.parametrize("engine", ["openpyxl", "calamine"])
+def test_xlsx_cell_range(engine):
+    from easyenvi import file
+
+    df = file.load("tests/rsc/inputs/test.xlsx", cell_range="B1:C5", engine=engine)
+
+    assert df.shape == (4, 2)
+
+def test_xlsx_stream_options():
+    from easyenvi import file
+
+    path = "tests/rsc/inputs/test.xlsx"
+    expected = pd.read_excel(path, usecols=["Name", "Age"], skiprows=[1, 2], nrows=5)
+    chunks = list(file.load(path, stream=True, usecols=["Name", "Age"], skiprows=[1, 2], nrows=5))
+
+    assert len(chunks) == 1
+    pd.testing.assert_frame_equal(chunks[0], expected, check_dtype=False)
+
+    df = file.load(path, cell_range="A1:F10", usecols="B:C", skiprows=[1], engine="openpyxl")
+    pd.testing.assert_frame_equal(df, pd.read_excel(path, usecols="B:C", skiprows=[1], nrows=8), check_dtype=False)
+
+def test_xlsx_stream_requires_openpyxl():
+    from easyenvi import file
+
+    with pytest.raises(ValueError):
+        file.load("tests/rsc/inputs/test.xlsx", stream=True, engine="calamine")
+
+def test_xlsx_stream_closes_file(monkeypatch):
+    import gc
+
+    import fsspec
+
+    from easyenvi import file
+
+    opened = []
+    fsspec_open = fsspec.open
+
+    class RecordingOpenFile:
+        def __init__(self, *args, **kwargs):
+            self.open_file = fsspec_open(*args, **kwargs)
+
+        def __enter__(self):
+            return self.open_file.__enter__()
+
+        def __exit__(self, *exc):
+            return self.open_file.__exit__(*exc)
+
+        def open(self):
+            opened.append(self.open_file.open())
+            return opened[-1]
+
+    monkeypatch.setattr(fsspec, "open", RecordingOpenFile)
+
+    # Collected unstarted, then closed after the first chunk
+    chunks = file.load("tests/rsc/inputs/test.xlsx", stream=True)
+    del chunks
+    gc.collect()
+    chunks = file.load("tests/rsc/inputs/test.xlsx", stream=True, chunk_size=10)
+    next(chunks)
+    chunks.close()
+
+    assert len(opened) == 2 and all(f.closed for f in opened)
+
+def test_xlsx_save_sheets(tmp_path):
+    from easyenvi import file
+
+    path = str(tmp_path / "sheets.xlsx")
+    sheets = {"first": pd.DataFrame({"a": [1, 2]}), "second": pd.DataFrame({"b": [3, 4, 5]})}
+    file.save(sheets, path, index=False)
+
+    loaded = file.load(path, sheet_name=None)
+    assert list(loaded) == ["first", "second"]
+    assert loaded["second"]["b"].tolist() == [3, 4, 5]
+    assert file.load(path, sheet_name="first")["a"].tolist() == [1, 2]
+
+def test_xlsx_save_stream(tmp_path):
+    from easyenvi import file
+
+    path = str(tmp_path / "stream.xlsx")
+    chunks = (pd.DataFrame({"i": range(start, start + 1000)}) for start in range(0, 5000, 1000))
+    file.save(chunks, path, sheet_name="data")
+
+    df = file.load(path, sheet_name="data")
+    assert df["i"].tolist() == list(range(5000))